@@ -27,12 +27,21 @@ base_stack = BaseStack(
     env=env
 )
 
+# 파이프라인 산출물 버킷 (pipelines/pipeline_def.py 의 DataBucket). 드리프트 기준선과 특성 변환 위치는
+# 배포된 모델 패키지 메타데이터에서 찾음
+pipeline_bucket_name = base_stack.data_bucket.bucket_name
+
 # 모델 추론용 스택 (별도 VPC) - 작동하는 dev 엔드포인트 사용
 inference_stack = ModelInferenceStack(
     app, f"{cfg.project_name.capitalize()}-InferenceStack",
     sagemaker_endpoint_name=f"{cfg.project_name}-dev-endpoint",  # 작동하는 dev 엔드포인트 사용
     model_package_group_name=f"{cfg.project_name}-dev-pkg",      # 작동하는 dev 모델 패키지 그룹 사용
     user_interaction_fg_name=f"{cfg.project_name}-dev-user-interactions-v1",  # dev Feature Group 사용
+    user_behavior_fg_name=base_stack.user_behavior_fg_name,  # 행동 집계 체크포인트 전용 Feature Group
+    pipeline_bucket_name=pipeline_bucket_name,
+    # 섀도 변형: BaseStack 배포 스크립트(sagemaker_ci)와 같은 context 값으로 엔드포인트 변형 이름을 맞춤
+    shadow_variant_name=app.node.try_get_context("sm_shadow_variant_name") or "",
+    shadow_fraction=float(app.node.try_get_context("sm_shadow_fraction") or 0.0),
     env=env
 )
 
@@ -0,0 +1,118 @@
+"""추론 서비스 어드미션 컨트롤 (AIMD 기반 적응형 동시성 제한)
+
+워커당 동시 처리 수를 지연시간에 맞춰 자동으로 조절하고, 한도를 넘는 요청은
+우선순위 큐에서 대기시킨 뒤 대기 예산을 넘기면 즉시 429로 거절한다.
+"""
+import heapq
+import itertools
+import math
+import threading
+import time
+
+
+class AdmissionController:
+    """AIMD(가산 증가 / 승산 감소) 동시성 제한기
+
+    - 요청이 목표 지연시간 안에 성공하면 limit += 1/limit (RTT당 +1 과 동일)
+    - 목표 지연시간 초과 또는 5xx 발생 시 limit *= backoff
+    - 한도 초과 요청은 (priority, 도착순) 힙에서 대기하며 낮은 priority 값이 먼저 입장
+    """
+
+    def __init__(self, initial_limit=4, min_limit=1, max_limit=12,
+                 latency_target_ms=1000.0, backoff=0.9):
+        self._cond = threading.Condition()
+        self._limit = float(initial_limit)
+        self._min_limit = float(min_limit)
+        self._max_limit = float(max_limit)
+        self._latency_target = latency_target_ms / 1000.0
+        self._backoff = backoff
+        self._in_flight = 0
+        self._waiters = []
+        self._seq = itertools.count()
+        # 지연시간 지수이동평균 (Retry-After 추정용)
+        self._latency_ewma = self._latency_target / 2
+        self._admitted = 0
+        self._rejected = 0
+
+    @property
+    def limit(self):
+        return int(self._limit)
+
+    def acquire(self, priority, budget_s):
+        """입장 시도. 대기 예산 안에 슬롯을 얻으면 True, 아니면 False"""
+        deadline = time.monotonic() + budget_s
+        with self._cond:
+            if not self._waiters and self._in_flight < int(self._limit):
+                self._in_flight += 1
+                self._admitted += 1
+                return True
+
+            ticket = (priority, next(self._seq))
+            heapq.heappush(self._waiters, ticket)
+            while True:
+                if self._waiters[0] == ticket and self._in_flight < int(self._limit):
+                    heapq.heappop(self._waiters)
+                    self._in_flight += 1
+                    self._admitted += 1
+                    # 다음 대기자도 빈 슬롯이 있으면 바로 들어갈 수 있도록 깨움
+                    self._cond.notify_all()
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._waiters.remove(ticket)
+                    heapq.heapify(self._waiters)
+                    self._rejected += 1
+                    self._cond.notify_all()
+                    return False
+                self._cond.wait(remaining)
+
+    def release(self, latency_s, ok=True):
+        """처리 완료 통지 및 한도 조정"""
+        with self._cond:
+            self._in_flight -= 1
+            self._latency_ewma = 0.8 * self._latency_ewma + 0.2 * latency_s
+            if ok and latency_s <= self._latency_target:
+                self._limit = min(self._max_limit, self._limit + 1.0 / self._limit)
+            else:
+                self._limit = max(self._min_limit, self._limit * self._backoff)
+            self._cond.notify_all()
+
+    def retry_after(self):
+        """현재 큐 길이와 처리 속도로 추정한 재시도 대기 시간(초)"""
+        with self._cond:
+            throughput = max(self._limit, 1.0) / max(self._latency_ewma, 1e-3)
+            backlog = len(self._waiters) + self._in_flight
+        return int(min(30, max(1, math.ceil(backlog / throughput))))
+
+    def stats(self):
+        with self._cond:
+            return {
+                'limit': round(self._limit, 2),
+                'in_flight': self._in_flight,
+                'queued': len(self._waiters),
+                'admitted': self._admitted,
+                'rejected': self._rejected,
+                'latency_ewma_ms': round(self._latency_ewma * 1000, 2),
+            }
+
+
+# 라우트별 우선순위 (값이 낮을수록 먼저 입장) 와 대기 예산(초)
+ROUTE_PRIORITIES = {
+    '/api/predict': (0, 2.0),
+    '/api/track-click': (1, 1.0),
+    '/api/rank': (1, 1.5),
+}
+DEFAULT_PRIORITY = (2, 0.5)
+
+# 헬스체크/정적 페이지는 과부하 상황에서도 절대 거절하지 않음
+EXEMPT_PATHS = {'/', '/health', '/livez', '/readyz', '/metrics'}
+EXEMPT_PREFIXES = ('/static/',)
+
+
+def is_exempt(path):
+    return path in EXEMPT_PATHS or path.startswith(EXEMPT_PREFIXES)
+
+
+def route_priority(path):
+    """요청 경로 → (priority, 대기 예산)"""
+    return ROUTE_PRIORITIES.get(path, DEFAULT_PRIORITY)
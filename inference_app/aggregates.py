@@ -0,0 +1,139 @@
+"""실시간 스트리밍 집계 (사용자/세션 슬라이딩 윈도 카운터)
+
+사용자·세션별 노출/클릭 수를 고정 크기 링 버퍼(슬롯당 slot_seconds)에 누적하고
+최근성(recency)과 함께 서버측 행동 특성(user_behavior_score 등)을 이벤트당 O(1)로
+계산한다. 키 수는 LRU 상한으로 제한되어 메모리가 일정하게 유지된다.
+"""
+import math
+import threading
+import time
+from array import array
+from collections import OrderedDict
+
+
+class WindowCounter:
+    """슬라이딩 윈도 노출/클릭 카운터 (링 버퍼)"""
+
+    __slots__ = ('impressions', 'clicks', 'head_slot', 'imp_total', 'click_total',
+                 'last_event', 'last_click')
+
+    def __init__(self, n_slots):
+        self.impressions = array('I', [0]) * n_slots
+        self.clicks = array('I', [0]) * n_slots
+        self.head_slot = None
+        self.imp_total = 0
+        self.click_total = 0
+        self.last_event = None
+        self.last_click = None
+
+    def advance(self, slot):
+        """윈도를 slot 위치까지 전진시키며 만료된 슬롯을 비움 (분할상환 O(1))"""
+        if self.head_slot is None:
+            self.head_slot = slot
+            return
+        n_slots = len(self.impressions)
+        steps = min(slot - self.head_slot, n_slots)
+        for s in range(self.head_slot + 1, self.head_slot + 1 + steps):
+            i = s % n_slots
+            self.imp_total -= self.impressions[i]
+            self.click_total -= self.clicks[i]
+            self.impressions[i] = 0
+            self.clicks[i] = 0
+        self.head_slot = max(self.head_slot, slot)
+
+    def add(self, slot, ts, impressions=0, clicks=0):
+        self.advance(slot)
+        if slot <= self.head_slot - len(self.impressions):
+            return  # 윈도 밖의 늦게 도착한 이벤트
+        i = slot % len(self.impressions)
+        self.impressions[i] += impressions
+        self.clicks[i] += clicks
+        self.imp_total += impressions
+        self.click_total += clicks
+        self.last_event = ts if self.last_event is None else max(self.last_event, ts)
+        if clicks:
+            self.last_click = ts if self.last_click is None else max(self.last_click, ts)
+
+
+class StreamingAggregator:
+    """사용자/세션 키별 WindowCounter 관리 및 행동 특성 계산"""
+
+    def __init__(self, window_seconds=3600, slot_seconds=60, max_keys=50000,
+                 prior_ctr=0.1, prior_weight=10.0, recency_half_life_seconds=900.0):
+        self.slot_seconds = slot_seconds
+        self.n_slots = max(1, int(window_seconds // slot_seconds))
+        self.max_keys = max_keys
+        self.prior_ctr = prior_ctr
+        self.prior_weight = prior_weight
+        self._decay = math.log(2) / recency_half_life_seconds
+        self._counters = OrderedDict()
+        self._dirty = set()
+        self._lock = threading.Lock()
+
+    def _counter(self, key):
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = WindowCounter(self.n_slots)
+            self._counters[key] = counter
+            while len(self._counters) > self.max_keys:
+                evicted, _ = self._counters.popitem(last=False)
+                self._dirty.discard(evicted)
+        else:
+            self._counters.move_to_end(key)
+        return counter
+
+    def record(self, keys, impressions=0, clicks=0, ts=None):
+        """이벤트 반영. keys 예: [('user', 'u1'), ('session', 's1')]"""
+        ts = time.time() if ts is None else ts
+        slot = int(ts // self.slot_seconds)
+        with self._lock:
+            for key in keys:
+                self._counter(key).add(slot, ts, impressions, clicks)
+                self._dirty.add(key)
+
+    def features(self, user_key, session_key=None, ts=None):
+        """서버측 행동 특성 계산 (조회만, 상태 변경 없음)"""
+        ts = time.time() if ts is None else ts
+        slot = int(ts // self.slot_seconds)
+        with self._lock:
+            user = self._snapshot(('user', user_key), slot)
+            session = self._snapshot(('session', session_key), slot) if session_key else (0, 0, None, None)
+        imps, clicks, _, last_click = user
+        smoothed_ctr = (clicks + self.prior_ctr * self.prior_weight) / (imps + self.prior_weight)
+        since_click = None if last_click is None else max(0.0, ts - last_click)
+        recency = 0.0 if since_click is None else math.exp(-self._decay * since_click)
+        return {
+            'user_impressions': imps,
+            'user_clicks': clicks,
+            'user_ctr': round(smoothed_ctr, 6),
+            'session_impressions': session[0],
+            'session_clicks': session[1],
+            'seconds_since_last_click': None if since_click is None else round(since_click, 1),
+            'user_behavior_score': round(100.0 * min(1.0, 0.8 * smoothed_ctr + 0.2 * recency), 1),
+        }
+
+    def _snapshot(self, key, slot):
+        counter = self._counters.get(key)
+        if counter is None:
+            return 0, 0, None, None
+        counter.advance(slot)
+        return counter.imp_total, counter.click_total, counter.last_event, counter.last_click
+
+    def drain_dirty(self, kind='user'):
+        """마지막 체크포인트 이후 변경된 키 목록을 꺼냄"""
+        with self._lock:
+            keys = [k for k in self._dirty if k[0] == kind]
+            self._dirty.difference_update(keys)
+        return [k[1] for k in keys]
+
+    def checkpoint(self, writer, kind='user'):
+        """변경된 키의 집계를 writer(key, features)로 내보냄"""
+        written = 0
+        for key in self.drain_dirty(kind):
+            if writer(key, self.features(key)):
+                written += 1
+        return written
+
+    def stats(self):
+        with self._lock:
+            return {'keys': len(self._counters), 'dirty': len(self._dirty), 'max_keys': self.max_keys}
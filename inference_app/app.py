@@ -2,8 +2,10 @@ import os
 import json
 import logging
 import uuid
+import time
+import zlib
 from datetime import datetime
-from flask import Flask, request, jsonify, render_template_string
+from flask import Flask, request, jsonify, g, Response, abort
 import boto3
 import pandas as pd
 import numpy as np
@@ -13,11 +15,26 @@ from langchain.schema import BaseMessage, HumanMessage
 from langchain.chains import ConversationChain
 from langchain.memory import ConversationBufferMemory
 
+from admission import AdmissionController, route_priority, is_exempt
+from scoring import FEATURE_NAMES, expand_candidates, score_batch, top_k
+from feature_lookup import LookupUnavailable, OnlineFeatureLookup, TTLCache
+from aggregates import StreamingAggregator
+from background import PeriodicWorker
+from click_metrics import ClickMetrics, SnapshotExchange, summarize
+from drift import DriftBaselineResolver
+from shadow import ShadowScorer, load_local_challenger
+from registry import ModelRegistryIndex
+from static_assets import AssetBundle, PrecompressedAsset
+from fs_writer import AsyncRecordWriter
+from health import SERVING_ENDPOINT_STATUSES, DependencyMonitor
+from feature_transform import TransformResolver, TransformUnavailable
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = Flask(__name__)
+# 정적 자산은 static_assets 의 사전 압축/해시 URL 라우트로 직접 서빙
+app = Flask(__name__, static_folder=None)
 
 # AWS 클라이언트 초기화
 sagemaker_runtime = boto3.client('sagemaker-runtime')
@@ -42,544 +59,254 @@ MODEL_PACKAGE_GROUP = os.environ.get('MODEL_PACKAGE_GROUP', 'my-mlops-dev-dev-pk
 AWS_REGION = os.environ.get('AWS_DEFAULT_REGION', 'ap-northeast-2')
 USER_INTERACTION_FG_NAME = os.environ.get('USER_INTERACTION_FG_NAME', 'my-mlops-dev-user-interactions')
 
-# HTML 템플릿
-HTML_TEMPLATE = """
-<!DOCTYPE html>
-<html lang="ko">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>테크뉴스 포털 - 최신 기술 소식</title>
-    <style>
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            margin: 0;
-            padding: 0;
-            background-color: #f8f9fa;
-        }
-        
-        /* 상단 헤더 */
-        .header {
-            background: #1e3a8a;
-            color: white;
-            padding: 15px 0;
-            position: relative;
-        }
-        .header-content {
-            max-width: 1200px;
-            margin: 0 auto;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            padding: 0 20px;
-        }
-        .logo {
-            font-size: 24px;
-            font-weight: bold;
-        }
-        .nav {
-            display: flex;
-            gap: 30px;
-        }
-        .nav a {
-            color: white;
-            text-decoration: none;
-            font-weight: 500;
-        }
-        
-        /* 광고 버튼 스타일 */
-        .ad-btn {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            border: none;
-            padding: 12px 20px;
-            border-radius: 8px;
-            cursor: pointer;
-            font-size: 14px;
-            font-weight: bold;
-            transition: all 0.3s ease;
-            box-shadow: 0 4px 15px rgba(102, 126, 234, 0.3);
-        }
-        .ad-btn:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 6px 20px rgba(102, 126, 234, 0.4);
-        }
-        
-        /* 광고 위치별 스타일 */
-        .ad-header {
-            position: absolute;
-            right: 20px;
-            top: 50%;
-            transform: translateY(-50%);
-        }
-        
-        .container {
-            max-width: 1200px;
-            margin: 0 auto;
-            display: grid;
-            grid-template-columns: 1fr 300px;
-            gap: 20px;
-            padding: 20px;
-        }
-        
-        .main-content {
-            background: white;
-            border-radius: 10px;
-            padding: 30px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }
-        
-        .sidebar {
-            display: flex;
-            flex-direction: column;
-            gap: 20px;
-        }
-        
-        .ad-sidebar {
-            background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-            color: white;
-            padding: 20px;
-            border-radius: 10px;
-            text-align: center;
-        }
-        
-        .ad-content {
-            background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
-            color: white;
-            padding: 15px;
-            border-radius: 8px;
-            text-align: center;
-            margin: 20px 0;
-        }
-        
-        .ad-bottom {
-            background: linear-gradient(135deg, #43e97b 0%, #38f9d7 100%);
-            color: white;
-            padding: 20px;
-            border-radius: 10px;
-            text-align: center;
-            margin-top: 30px;
-        }
-        
-        .ad-popup {
-            position: fixed;
-            top: 20px;
-            right: 20px;
-            background: linear-gradient(135deg, #fa709a 0%, #fee140 100%);
-            color: white;
-            padding: 20px;
-            border-radius: 10px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.3);
-            z-index: 1000;
-            max-width: 300px;
-        }
-        
-        .user-info {
-            background: #e3f2fd;
-            padding: 20px;
-            border-radius: 10px;
-            margin-bottom: 20px;
-        }
-        
-        .form-group {
-            margin-bottom: 15px;
-        }
-        
-        label {
-            display: block;
-            margin-bottom: 5px;
-            font-weight: bold;
-            color: #333;
-        }
-        
-        input[type="number"] {
-            width: 100%;
-            padding: 8px;
-            border: 1px solid #ddd;
-            border-radius: 5px;
-            box-sizing: border-box;
-        }
-        
-        .article {
-            margin-bottom: 30px;
-            padding-bottom: 20px;
-            border-bottom: 1px solid #eee;
-        }
-        
-        .article h2 {
-            color: #1e3a8a;
-            margin-bottom: 10px;
-        }
-        
-        .article-meta {
-            color: #666;
-            font-size: 12px;
-            margin-bottom: 15px;
-        }
-        
-        .stats {
-            background: #f1f5f9;
-            padding: 15px;
-            border-radius: 8px;
-            margin-top: 20px;
-        }
-        
-        .click-count {
-            font-weight: bold;
-            color: #1e3a8a;
-        }
-    </style>
-</head>
-<body>
-    <!-- 상단 헤더 광고 -->
-    <div class="header">
-        <div class="header-content">
-            <div class="logo">📰 TechNews Portal</div>
-            <nav class="nav">
-                <a href="#tech">기술</a>
-                <a href="#business">비즈니스</a>
-                <a href="#startup">스타트업</a>
-                <a href="#ai">AI/ML</a>
-            </nav>
-            <!-- 위치 1: 상단 헤더 광고 -->
-            <button class="ad-btn ad-header" onclick="trackAdClick(1)">
-                💻 최신 노트북 50% 할인!
-            </button>
-        </div>
-    </div>
-
-    <!-- 사용자 정보 입력 -->
-    <div class="user-info" style="max-width: 1200px; margin: 20px auto; padding: 0 20px;">
-        <h3>🔧 사용자 정보 설정</h3>
-        <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px;">
-            <div class="form-group">
-                <label for="user_age">나이</label>
-                <input type="number" id="user_age" min="18" max="80" value="25">
-            </div>
-            <div class="form-group">
-                <label for="browsing_history">브라우징 활성도 (0-10)</label>
-                <input type="number" id="browsing_history" min="0" max="10" step="0.1" value="7.5">
-            </div>
-            <div class="form-group">
-                <label for="time_of_day">현재 시간 (0-23)</label>
-                <input type="number" id="time_of_day" min="0" max="23" value="14">
-            </div>
-            <div class="form-group">
-                <label for="user_behavior_score">클릭 성향 (0-100)</label>
-                <input type="number" id="user_behavior_score" min="0" max="100" step="0.1" value="65.5">
-            </div>
-        </div>
-    </div>
-
-    <div class="container">
-        <main class="main-content">
-            <h1>🚀 오늘의 주요 기술 뉴스</h1>
-            
-            <article class="article">
-                <h2>OpenAI, GPT-5 모델 공개 임박... 성능 대폭 향상 예고</h2>
-                <div class="article-meta">2025년 9월 20일 | 기자: 김테크</div>
-                <p>인공지능 업계의 선두주자 OpenAI가 차세대 언어모델 GPT-5의 공개를 앞두고 있다고 발표했습니다. 새로운 모델은 기존 GPT-4 대비 추론 능력과 창의성에서 큰 향상을 보일 것으로 예상됩니다...</p>
-                
-                <!-- 위치 3: 본문 중간 광고 -->
-                <div class="ad-content">
-                    <h4>📱 AI 학습에 최적화된 클라우드 서비스</h4>
-                    <p>GPU 성능 무제한! 첫 달 무료 체험</p>
-                    <button class="ad-btn" onclick="trackAdClick(3)">
-                        지금 시작하기 →
-                    </button>
-                </div>
-                
-                <p>업계 전문가들은 이번 발표가 AI 시장에 미칠 영향을 주목하고 있으며, 특히 자연어 처리와 코드 생성 분야에서의 혁신을 기대하고 있습니다...</p>
-            </article>
-            
-            <article class="article">
-                <h2>애플, 새로운 M4 칩셋으로 MacBook Pro 성능 혁신</h2>
-                <div class="article-meta">2025년 9월 19일 | 기자: 박하드웨어</div>
-                <p>애플이 차세대 M4 칩셋을 탑재한 MacBook Pro를 발표했습니다. 3나노 공정으로 제작된 새로운 칩은 이전 세대 대비 40% 향상된 성능을 제공합니다...</p>
-            </article>
-            
-            <article class="article">
-                <h2>메타, 메타버스 플랫폼에 AI 아바타 도입</h2>
-                <div class="article-meta">2025년 9월 18일 | 기자: 이가상</div>
-                <p>메타(구 페이스북)가 자사의 메타버스 플랫폼에 AI 기반 아바타 시스템을 도입한다고 발표했습니다. 사용자들은 이제 더욱 자연스럽고 지능적인 가상 캐릭터와 상호작용할 수 있게 됩니다...</p>
-            </article>
-            
-            <!-- 위치 4: 본문 하단 광고 -->
-            <div class="ad-bottom">
-                <h3>🎯 개발자를 위한 특별 혜택!</h3>
-                <p>코딩 부트캠프 등록 시 30% 할인 + 무료 멘토링</p>
-                <button class="ad-btn" onclick="trackAdClick(4)">
-                    할인 받기
-                </button>
-            </div>
-        </main>
-        
-        <aside class="sidebar">
-            <!-- 위치 2: 사이드바 광고 -->
-            <div class="ad-sidebar">
-                <h4>🔥 HOT DEAL</h4>
-                <p>개발자용 모니터<br>최대 70% 할인!</p>
-                <button class="ad-btn" onclick="trackAdClick(2)">
-                    쇼핑하기
-                </button>
-            </div>
-            
-            <div style="background: white; padding: 20px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1);">
-                <h3>📊 클릭 통계</h3>
-                <div class="stats">
-                    <div>총 광고 클릭: <span id="total-clicks" class="click-count">0</span></div>
-                    <div>상단 헤더: <span id="header-clicks" class="click-count">0</span></div>
-                    <div>사이드바: <span id="sidebar-clicks" class="click-count">0</span></div>
-                    <div>본문 중간: <span id="content-clicks" class="click-count">0</span></div>
-                    <div>본문 하단: <span id="bottom-clicks" class="click-count">0</span></div>
-                    <div>팝업: <span id="popup-clicks" class="click-count">0</span></div>
-                </div>
-            </div>
-        </aside>
-    </div>
-    
-    <!-- 위치 5: 팝업 광고 -->
-    <div class="ad-popup" id="popup-ad">
-        <h4>🎉 신규 가입 이벤트</h4>
-        <p>지금 가입하면 프리미엄 계정 1개월 무료!</p>
-        <button class="ad-btn" onclick="trackAdClick(5)">
-            가입하기
-        </button>
-        <button onclick="closePopup()" style="background: #666; margin-top: 10px;">
-            닫기
-        </button>
-    </div>
-                    <div class="field-description">
-                        광고가 노출되는 시간대 (24시간 형식)
-                    </div>
-                    <input type="number" id="time_of_day" min="0" max="23" value="14" required>
-                </div>
-                <div class="form-group">
-                    <label for="user_behavior_score">⭐ 클릭 성향 점수 (0-100점)</label>
-                    <div class="field-description">
-                        과거 광고 클릭 이력 기반 행동 패턴 점수<br>
-                        0-30: 클릭 기피형, 31-70: 보통, 71-100: 적극 클릭형
-                    </div>
-                    <input type="number" id="user_behavior_score" min="0" max="100" step="0.1" value="65.5" required>
-                </div>
-            </div>
-            <button type="submit">예측하기</button>
-        </form>
-
-        <div id="result" class="result">
-            <div class="prediction-value" id="prediction-value"></div>
-            <div id="prediction-details"></div>
-            <div class="model-info" id="model-info"></div>
-        </div>
-    </div>
-
-    <script>
-        // 클릭 카운터
-        let clickCounts = {
-            total: 0,
-            header: 0,
-            sidebar: 0,
-            content: 0,
-            bottom: 0,
-            popup: 0
-        };
-        
-        // 세션 ID 생성
-        function generateSessionId() {
-            return 'session_' + Math.random().toString(36).substr(2, 9) + '_' + Date.now();
-        }
-        
-        let sessionId = generateSessionId();
-        
-        // 광고 클릭 추적 함수
-        function trackAdClick(position) {
-            const userAge = parseInt(document.getElementById('user_age').value) || 25;
-            const browsingHistory = parseFloat(document.getElementById('browsing_history').value) || 7.5;
-            const timeOfDay = parseInt(document.getElementById('time_of_day').value) || 14;
-            const userBehaviorScore = parseFloat(document.getElementById('user_behavior_score').value) || 65.5;
-            
-            // 먼저 모델로 예측 수행
-            const features = [userAge, position, browsingHistory, timeOfDay, userBehaviorScore];
-            
-            // 실제 클릭 데이터 전송 (클릭됨 = 1)
-            const clickData = {
-                features: features,
-                actual_click: 1,  // 실제로 클릭했으므로 1
-                session_id: sessionId,
-                timestamp: new Date().toISOString()
-            };
-            
-            // 서버로 클릭 데이터 전송
-            fetch('/api/track-click', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify(clickData)
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.success) {
-                    console.log('클릭 데이터 전송 성공:', data);
-                    
-                    // 클릭 카운트 업데이트
-                    clickCounts.total++;
-                    switch(position) {
-                        case 1: clickCounts.header++; break;
-                        case 2: clickCounts.sidebar++; break;
-                        case 3: clickCounts.content++; break;
-                        case 4: clickCounts.bottom++; break;
-                        case 5: clickCounts.popup++; break;
-                    }
-                    updateClickDisplay();
-                    
-                    // 클릭 애니메이션 효과
-                    showClickFeedback(position, data.prediction_probability);
-                } else {
-                    console.error('클릭 데이터 전송 실패:', data.error);
-                }
-            })
-            .catch(error => {
-                console.error('네트워크 오류:', error);
-            });
-        }
-        
-        // 클릭 디스플레이 업데이트
-        function updateClickDisplay() {
-            document.getElementById('total-clicks').textContent = clickCounts.total;
-            document.getElementById('header-clicks').textContent = clickCounts.header;
-            document.getElementById('sidebar-clicks').textContent = clickCounts.sidebar;
-            document.getElementById('content-clicks').textContent = clickCounts.content;
-            document.getElementById('bottom-clicks').textContent = clickCounts.bottom;
-            document.getElementById('popup-clicks').textContent = clickCounts.popup;
-        }
-        
-        // 클릭 피드백 표시
-        function showClickFeedback(position, probability) {
-            const positionNames = {
-                1: '상단 헤더',
-                2: '사이드바', 
-                3: '본문 중간',
-                4: '본문 하단',
-                5: '팝업'
-            };
-            
-            const feedback = document.createElement('div');
-            feedback.style.cssText = `
-                position: fixed;
-                top: 50%;
-                left: 50%;
-                transform: translate(-50%, -50%);
-                background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
-                color: white;
-                padding: 20px;
-                border-radius: 10px;
-                box-shadow: 0 10px 30px rgba(0,0,0,0.3);
-                z-index: 10000;
-                text-align: center;
-                min-width: 300px;
-            `;
-            
-            feedback.innerHTML = `
-                <h3>🎯 광고 클릭 감지!</h3>
-                <p><strong>위치:</strong> ${positionNames[position]}</p>
-                <p><strong>예측 확률:</strong> ${(probability * 100).toFixed(1)}%</p>
-                <p><strong>실제 결과:</strong> 클릭됨 ✅</p>
-                <p style="font-size: 12px; margin-top: 15px; opacity: 0.8;">
-                    데이터가 Feature Store에 저장되었습니다
-                </p>
-            `;
-            
-            document.body.appendChild(feedback);
-            
-            // 3초 후 제거
-            setTimeout(() => {
-                document.body.removeChild(feedback);
-            }, 3000);
-        }
-        
-        // 팝업 닫기
-        function closePopup() {
-            document.getElementById('popup-ad').style.display = 'none';
-        }
-        
-        // 팝업 자동 표시 (10초 후)
-        setTimeout(() => {
-            const popup = document.getElementById('popup-ad');
-            popup.style.display = 'block';
-            
-            // 팝업 애니메이션
-            popup.style.transform = 'scale(0.8)';
-            popup.style.opacity = '0';
-            setTimeout(() => {
-                popup.style.transition = 'all 0.3s ease';
-                popup.style.transform = 'scale(1)';
-                popup.style.opacity = '1';
-            }, 100);
-        }, 10000);
-        
-        // 현재 시간 자동 설정
-        function updateCurrentTime() {
-            const now = new Date();
-            document.getElementById('time_of_day').value = now.getHours();
-        }
-        
-        // 페이지 로드 시 현재 시간 설정
-        window.addEventListener('load', function() {
-            updateCurrentTime();
-            
-            // 환영 메시지
-            setTimeout(() => {
-                console.log('🚀 실제 광고 클릭 추적 시스템이 활성화되었습니다!');
-                console.log('📊 사용자의 광고 클릭 행동이 실시간으로 Feature Store에 저장됩니다.');
-            }, 1000);
-        });
-        
-        // 1분마다 시간 업데이트
-        setInterval(updateCurrentTime, 60000);
-    </script>
-</body>
-</html>
-"""
+# 온라인 Feature Store 조회 캐시 (레코드 식별자만으로 예측)
+feature_lookup = OnlineFeatureLookup(
+    sagemaker_featurestore,
+    USER_INTERACTION_FG_NAME,
+    FEATURE_NAMES,
+    cache=TTLCache(
+        max_entries=int(os.environ.get('FEATURE_CACHE_MAX_ENTRIES', 10000)),
+        ttl_seconds=float(os.environ.get('FEATURE_CACHE_TTL_SECONDS', 300)),
+    ),
+)
+
+# 서버측 실시간 행동 집계 (user_behavior_score 등)
+behavior_aggregator = StreamingAggregator(
+    window_seconds=int(os.environ.get('BEHAVIOR_WINDOW_SECONDS', 3600)),
+    slot_seconds=int(os.environ.get('BEHAVIOR_SLOT_SECONDS', 60)),
+    max_keys=int(os.environ.get('BEHAVIOR_MAX_KEYS', 50000)),
+)
+
+# 실시간 CTR/캘리브레이션 집계 (워커 간 공유 디렉터리로 스냅샷 병합)
+click_metrics = ClickMetrics(bucket_seconds=int(os.environ.get('STATS_BUCKET_SECONDS', 300)))
+stats_exchange = SnapshotExchange(os.environ.get('STATS_SHARED_DIR', '/tmp/inference-stats'))
+stats_publisher = PeriodicWorker(
+    'stats-publish',
+    float(os.environ.get('STATS_PUBLISH_SECONDS', 15)),
+    lambda: stats_exchange.publish(click_metrics.snapshot()),
+)
+
+# 학습 기준선 대비 입력 드리프트 모니터 (Extract 단계의 baseline/profile.json). 배포된 모델
+# 패키지의 DriftBaselineUri 메타데이터에서 찾고, 없을 때만 DRIFT_BASELINE_URI 사용
+DRIFT_BASELINE_URI = os.environ.get('DRIFT_BASELINE_URI', '')
+# 기준선 특성 이름 → 요청 특성 벡터 인덱스
+DRIFT_FEATURE_INDEX = {'age': 0, 'hour': 3}
+drift_resolver = DriftBaselineResolver(
+    sagemaker,
+    boto3.client('s3'),
+    DRIFT_FEATURE_INDEX,
+    fallback_uri=DRIFT_BASELINE_URI,
+    min_samples=int(os.environ.get('DRIFT_MIN_SAMPLES', 200)),
+)
+
+
+def evaluate_drift():
+    """현재 기준선의 드리프트 윈도 평가 (기준선이 바뀌면 새 모니터의 윈도)"""
+    drift_monitor = drift_resolver.current
+    if drift_monitor is not None:
+        drift_monitor.evaluate()
+
+
+drift_worker = PeriodicWorker(
+    'drift-evaluate',
+    float(os.environ.get('DRIFT_EVAL_SECONDS', 300)),
+    evaluate_drift,
+)
+
+# 학습과 동일한 특성 변환 (Preprocess 단계의 transform.json). 배포된 모델 패키지의
+# FeatureTransformUri 메타데이터에서 찾고, 없을 때만 FEATURE_TRANSFORM_URI 사용.
+# 변환이 없으면 원본 특성을 보내지 않고 준비(ready) 실패 + 예측 503
+FEATURE_TRANSFORM_URI = os.environ.get('FEATURE_TRANSFORM_URI', '')
+transform_resolver = TransformResolver(sagemaker, boto3.client('s3'), fallback_uri=FEATURE_TRANSFORM_URI)
+
+
+def model_input(features, data=None):
+    """앱 특성 벡터(FEATURE_NAMES 순서) + 요청 attributes(gender, device 등) → 모델 입력 벡터"""
+    transform = transform_resolver.current
+    if transform is None:
+        raise TransformUnavailable('feature transform not loaded')
+    record = dict(zip(FEATURE_NAMES, features))
+    record.update((data or {}).get('attributes') or {})
+    return transform.transform_record(record)
+
+
+def model_rows(rows, data=None, resolver=None):
+    """앱 특성 행렬 → 모델 입력 행렬 (resolver 의 변환으로 벡터화 인코딩, 기본은 운영 모델)"""
+    transform = (resolver or transform_resolver).current
+    if transform is None:
+        raise TransformUnavailable('feature transform not loaded')
+    rows = np.atleast_2d(np.asarray(rows, dtype=np.float64))
+    n = rows.shape[0]
+    columns = {name: rows[:, i] for i, name in enumerate(FEATURE_NAMES)}
+    columns.update({name: [value] * n for name, value in ((data or {}).get('attributes') or {}).items()})
+    return transform.transform_columns(columns, n)
+
+
+# 섀도(챌린저) 스코어링: 응답 경로 밖에서 두 번째 변형/로컬 모델 점수 기록.
+# 챌린저 입력은 챌린저 변형의 모델 패키지 FeatureTransformUri 로 인코딩 (로컬 챌린저는
+# SHADOW_FEATURE_TRANSFORM_URI). 운영 모델과 학습 실행이 달라도 학습 때와 같은 입력을 받음
+SHADOW_VARIANT_NAME = os.environ.get('SHADOW_VARIANT_NAME', '')
+SHADOW_LOCAL_MODEL_PATH = os.environ.get('SHADOW_LOCAL_MODEL_PATH', '')
+shadow_transform_resolver = TransformResolver(
+    sagemaker, boto3.client('s3'), fallback_uri=os.environ.get('SHADOW_FEATURE_TRANSFORM_URI', '')
+)
+shadow_scorer = ShadowScorer(
+    sagemaker_runtime,
+    ENDPOINT_NAME,
+    variant_name=SHADOW_VARIANT_NAME,
+    local_predict=load_local_challenger(SHADOW_LOCAL_MODEL_PATH) if SHADOW_LOCAL_MODEL_PATH else None,
+    fraction=float(os.environ.get('SHADOW_FRACTION', 0)),
+    encode=lambda rows, data: model_rows(rows, data, shadow_transform_resolver),
+)
+
+# 모델 레지스트리 로컬 인덱스 (/api/models 는 컨트롤 플레인 호출 없이 메모리에서 응답)
+model_registry = ModelRegistryIndex(
+    sagemaker,
+    boto3.client('s3'),
+    MODEL_PACKAGE_GROUP,
+    full_resync_seconds=float(os.environ.get('REGISTRY_FULL_RESYNC_SECONDS', 600)),
+)
+registry_syncer = PeriodicWorker(
+    'registry-sync',
+    float(os.environ.get('REGISTRY_SYNC_SECONDS', 60)),
+    model_registry.sync,
+)
+
+# Feature Store 비동기 기록 (예측 응답 경로에서 put_record 왕복 제거)
+feature_store_writer = AsyncRecordWriter(
+    lambda item: save_to_feature_store(item),
+    max_queue=int(os.environ.get('FS_WRITE_QUEUE_SIZE', 1000)),
+)
+
+# liveness / readiness: 의존성 상태는 백그라운드에서만 갱신
+health_monitor = DependencyMonitor(
+    sagemaker,
+    ENDPOINT_NAME,
+    backlog_fn=lambda: feature_store_writer.backlog,
+    max_backlog=int(os.environ.get('READY_MAX_FS_BACKLOG', 500)),
+    warmup_fns=[model_registry.sync],
+    local_checks={'feature_transform_missing': lambda: transform_resolver.current is not None},
+)
+
+
+def refresh_dependencies():
+    """의존성 상태 갱신 후 배포된 모델 패키지의 특성 변환·드리프트 기준선 동기화 (패키지가 바뀔 때만 다시 로드)"""
+    health_monitor.refresh()
+    transform_resolver.refresh(health_monitor.model_package_arn)
+    drift_resolver.refresh(health_monitor.model_package_arn)
+    if shadow_scorer.enabled:
+        shadow_package = health_monitor.variant_package_arn(SHADOW_VARIANT_NAME) if SHADOW_VARIANT_NAME else None
+        shadow_transform_resolver.refresh(shadow_package)
+
+
+health_refresher = PeriodicWorker(
+    'health-refresh',
+    float(os.environ.get('HEALTH_REFRESH_SECONDS', 30)),
+    refresh_dependencies,
+    run_immediately=True,
+)
+
+# 어드미션 컨트롤 (과부하 시 긴 대기 대신 빠른 429 응답)
+ADMISSION_ENABLED = os.environ.get('ADMISSION_ENABLED', 'true').lower() == 'true'
+admission = AdmissionController(
+    initial_limit=int(os.environ.get('ADMISSION_INITIAL_LIMIT', 4)),
+    max_limit=int(os.environ.get('ADMISSION_MAX_LIMIT', 12)),
+    latency_target_ms=float(os.environ.get('ADMISSION_LATENCY_TARGET_MS', 1000)),
+)
+
+
+@app.before_request
+def admission_control():
+    """우선순위 기반 입장 제어: 대기 예산 초과 시 429 + Retry-After"""
+    if not ADMISSION_ENABLED or is_exempt(request.path):
+        return None
+    priority, budget = route_priority(request.path)
+    if not admission.acquire(priority, budget):
+        retry_after = admission.retry_after()
+        logger.warning(f"Request shed: path={request.path}, priority={priority}, retry_after={retry_after}s")
+        response = jsonify({
+            'success': False,
+            'error': '요청이 많아 잠시 후 다시 시도해주세요.',
+            'retry_after': retry_after
+        })
+        response.status_code = 429
+        response.headers['Retry-After'] = str(retry_after)
+        return response
+    g.admission_start = time.monotonic()
+    return None
+
+
+@app.after_request
+def record_admission_status(response):
+    g.admission_status = response.status_code
+    return response
+
+
+@app.teardown_request
+def admission_release(exc):
+    start = g.pop('admission_start', None)
+    if start is None:
+        return
+    ok = exc is None and g.pop('admission_status', 500) < 500
+    admission.release(time.monotonic() - start, ok=ok)
+
+
+# UI 페이지: 프로세스 시작 시 1회 렌더링 + gzip 사전 압축 (요청 시 템플릿 처리 없음)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ui_assets = AssetBundle(os.path.join(BASE_DIR, 'static'))
+with open(os.path.join(BASE_DIR, 'templates', 'index.html'), encoding='utf-8') as f:
+    index_page = PrecompressedAsset(
+        app.jinja_env.from_string(f.read()).render(
+            css_url=ui_assets.urls['app.css'],
+            js_url=ui_assets.urls['app.js'],
+            endpoint_name=ENDPOINT_NAME,
+            model_group=MODEL_PACKAGE_GROUP,
+            region=AWS_REGION
+        ),
+        'text/html; charset=utf-8',
+        # HTML 은 항상 재검증 (ETag 일치 시 304)
+        'no-cache',
+    )
+
 
 @app.route('/')
 def index():
     """메인 페이지"""
-    return render_template_string(
-        HTML_TEMPLATE,
-        endpoint_name=ENDPOINT_NAME,
-        model_group=MODEL_PACKAGE_GROUP,
-        region=AWS_REGION
-    )
+    return index_page.response(request)
+
+
+@app.route('/static/<name>')
+def static_asset(name):
+    """해시 버전 정적 자산 (CSS/JS)"""
+    asset = ui_assets.get(name)
+    if asset is None:
+        abort(404)
+    return asset.response(request)
+
+@app.route('/livez')
+def livez():
+    """liveness: 프로세스가 요청을 처리할 수 있는지만 확인 (외부 호출 없음)"""
+    return Response('ok', mimetype='text/plain')
+
+@app.route('/readyz')
+def readyz():
+    """readiness: 태스크 로컬 상태로 트래픽 수용 여부 판정 (공유 의존성 장애는 degraded 로만 보고)"""
+    health_refresher.ensure_started()
+    state = health_monitor.snapshot()
+    return jsonify(state), (200 if state['ready'] else 503)
 
 @app.route('/health')
 def health():
-    """헬스체크 엔드포인트"""
-    try:
-        # SageMaker 엔드포인트 상태 확인 (실패해도 OK)
-        endpoint_status = 'UNKNOWN'
-        try:
-            response = sagemaker.describe_endpoint(EndpointName=ENDPOINT_NAME)
-            endpoint_status = response['EndpointStatus']
-        except Exception as endpoint_error:
-            logger.warning(f"Endpoint not available yet: {str(endpoint_error)}")
-            endpoint_status = 'NOT_FOUND'
-        
-        return jsonify({
-            'status': 'healthy',
-            'endpoint_status': endpoint_status,
-            'timestamp': datetime.utcnow().isoformat(),
-            'app_status': 'running'
-        }), 200
-    except Exception as e:
-        logger.error(f"Health check failed: {str(e)}")
-        # 기본적인 헬스체크는 항상 성공
-        return jsonify({
-            'status': 'healthy',
-            'endpoint_status': 'UNKNOWN',
-            'timestamp': datetime.utcnow().isoformat(),
-            'note': 'basic_health_check'
-        }), 503
+    """헬스체크 엔드포인트 (하위 호환: 캐시된 상태만 보고, 항상 200)"""
+    health_refresher.ensure_started()
+    state = health_monitor.snapshot()
+    return jsonify({
+        'status': 'healthy',
+        'ready': state['ready'],
+        'endpoint_status': state['endpoint_status'],
+        'timestamp': state['timestamp'],
+        'app_status': 'running'
+    }), 200
 
 def save_to_feature_store(interaction_data):
     """사용자 상호작용 데이터를 Feature Store에 저장"""
@@ -633,6 +360,10 @@ def save_to_feature_store(interaction_data):
                 'FeatureName': 'session_id',
                 'ValueAsString': interaction_data.get('session_id', 'unknown')
             },
+            {
+                'FeatureName': 'user_key',
+                'ValueAsString': str(interaction_data.get('user_key') or interaction_data.get('session_id', 'unknown'))
+            },
             {
                 'FeatureName': 'request_type',
                 'ValueAsString': interaction_data.get('request_type', 'prediction')
@@ -735,6 +466,10 @@ def save_to_feature_store(interaction_data):
                 'FeatureName': 'session_id',
                 'ValueAsString': interaction_data.get('session_id', 'unknown')
             },
+            {
+                'FeatureName': 'user_key',
+                'ValueAsString': str(interaction_data.get('user_key') or interaction_data.get('session_id', 'unknown'))
+            },
             {
                 'FeatureName': 'request_type',
                 'ValueAsString': interaction_data.get('request_type', 'prediction')
@@ -758,6 +493,8 @@ def save_to_feature_store(interaction_data):
             FeatureGroupName=USER_INTERACTION_FG_NAME,
             Record=record
         )
+        # 앱이 직접 쓴 레코드는 캐시에서 무효화하여 다음 조회 시 최신값 사용
+        feature_lookup.invalidate(interaction_data['interaction_id'])
         
         logger.info(f"Successfully saved interaction data to Feature Store: {interaction_data['interaction_id']}")
         return True
@@ -796,15 +533,153 @@ def generate_session_id():
 SESSION_STORE = {}
 
 
+# 행동 집계 체크포인트 전용 Feature Group (상호작용 그룹과 분리). 없으면 체크포인트 비활성
+BEHAVIOR_FG_NAME = os.environ.get('BEHAVIOR_FG_NAME', '')
+
+
+def checkpoint_behavior(user_key, behavior):
+    """사용자 집계 스냅샷을 행동 Feature Group 에 기록 (레코드 식별자 = user_key)"""
+    try:
+        sagemaker_featurestore.put_record(
+            FeatureGroupName=BEHAVIOR_FG_NAME,
+            Record=[
+                {'FeatureName': 'user_key', 'ValueAsString': str(user_key)},
+                {'FeatureName': 'event_time', 'ValueAsString': datetime.utcnow().isoformat() + 'Z'},
+                {'FeatureName': 'user_behavior_score', 'ValueAsString': str(behavior['user_behavior_score'])},
+                {'FeatureName': 'user_impressions', 'ValueAsString': str(behavior['user_impressions'])},
+                {'FeatureName': 'user_clicks', 'ValueAsString': str(behavior['user_clicks'])},
+                {'FeatureName': 'user_ctr', 'ValueAsString': str(behavior['user_ctr'])},
+            ]
+        )
+        return True
+    except Exception as e:
+        logger.warning(f"Behavior checkpoint failed for {user_key}: {e}")
+        return False
+
+
+behavior_checkpointer = PeriodicWorker(
+    'behavior-checkpoint',
+    float(os.environ.get('BEHAVIOR_CHECKPOINT_SECONDS', 60)),
+    lambda: behavior_aggregator.checkpoint(checkpoint_behavior) if BEHAVIOR_FG_NAME else 0,
+)
+
+
+def behavior_keys(data, session_id):
+    """집계 키: user_id가 없으면 세션을 사용자로 간주"""
+    user_key = str(data.get('user_id') or session_id)
+    return user_key, [('user', user_key), ('session', str(session_id))]
+
+
+def request_device(data):
+    """디바이스 구분: 요청 본문의 device 우선, 없으면 User-Agent 로 판별"""
+    device = data.get('device')
+    if device:
+        return str(device).lower()
+    user_agent = (request.headers.get('User-Agent') or '').lower()
+    return 'mobile' if any(k in user_agent for k in ('mobile', 'android', 'iphone')) else 'desktop'
+
+
+def record_to_features(record):
+    """온라인 스토어 레코드 → FEATURE_NAMES 순서의 특성 벡터"""
+    return [float(record.get(name, 0) or 0) for name in FEATURE_NAMES]
+
+
+def feature_store_unavailable(error):
+    """온라인 스토어 스로틀링이 재시도 후에도 남은 경우: 404 가 아닌 503 + Retry-After"""
+    logger.warning(f"Feature Store lookup unavailable: {len(error.unprocessed)} identifier(s) unprocessed")
+    response = jsonify({
+        'success': False,
+        'error': 'Feature Store 조회가 일시적으로 불가합니다. 잠시 후 다시 시도해주세요.',
+        'retry_after': error.retry_after
+    })
+    response.status_code = 503
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+
+def transform_unavailable():
+    """배포된 모델의 특성 변환이 아직 없으면 원본 특성 대신 503 + Retry-After"""
+    health_refresher.ensure_started()
+    response = jsonify({
+        'success': False,
+        'error': '모델 특성 변환을 불러오는 중입니다. 잠시 후 다시 시도해주세요.',
+        'retry_after': 30
+    })
+    response.status_code = 503
+    response.headers['Retry-After'] = '30'
+    return response
+
+
+def predict_by_record_ids(record_ids, start_time):
+    """레코드 식별자 목록 일괄 예측 (BatchGetRecord + 1회 배치 스코어링)"""
+    try:
+        records, unavailable = feature_lookup.get_many(record_ids), []
+    except LookupUnavailable as e:
+        records, unavailable = e.result, e.unprocessed
+        if not any(v is not None for v in records.values()):
+            return feature_store_unavailable(e)
+    found = [r for r in records if records[r] is not None]
+    predictions = {r: {'record_id': r, 'success': False, 'error': 'record not found'} for r in records}
+    # 스로틀링으로 조회하지 못한 식별자는 "없음"과 구분해 재시도 가능 오류로 표시
+    for record_id in unavailable:
+        predictions[record_id] = {
+            'record_id': record_id, 'success': False,
+            'error': 'feature store temporarily unavailable', 'retryable': True
+        }
+    if found:
+        rows = np.array([record_to_features(records[r]) for r in found])
+        encoded = model_rows(rows)
+        scores, _ = score_batch(sagemaker_runtime, ENDPOINT_NAME, encoded)
+        shadow_scorer.maybe_submit(rows, scores.tolist(), {'route': 'predict_batch', 'record_ids': found})
+        for record_id, features, probability in zip(found, rows.tolist(), scores.tolist()):
+            predictions[record_id] = {
+                'record_id': record_id,
+                'success': True,
+                'prediction': 1 if probability > 0.5 else 0,
+                'probability': probability,
+                'features': features
+            }
+    response_time = (datetime.now() - start_time).total_seconds() * 1000
+    return jsonify({
+        'success': True,
+        'predictions': list(predictions.values()),
+        'response_time': round(response_time, 2),
+        'timestamp': datetime.utcnow().isoformat()
+    })
+
+
 @app.route('/api/predict', methods=['POST'])
 def predict():
-    """모델 예측 API"""
+    """모델 예측 API (features 직접 전달 또는 record_id / record_ids 조회)"""
     start_time = datetime.now()
     
     try:
         # 요청 데이터 파싱
         data = request.get_json()
+        if data.get('record_ids'):
+            return predict_by_record_ids(data['record_ids'], start_time)
+
         features = data.get('features', [])
+        if not features and data.get('record_id'):
+            try:
+                record = feature_lookup.get(data['record_id'])
+            except LookupUnavailable as e:
+                return feature_store_unavailable(e)
+            if record is None:
+                return jsonify({
+                    'success': False,
+                    'error': f"레코드를 찾을 수 없습니다: {data['record_id']}"
+                }), 404
+            features = record_to_features(record)
+
+        # 세션 ID 생성 또는 가져오기
+        session_id = data.get('session_id', generate_session_id())
+        user_key, agg_keys = behavior_keys(data, session_id)
+        behavior = behavior_aggregator.features(user_key, str(session_id))
+
+        # user_behavior_score를 생략하면 서버측 실시간 집계값 사용
+        if len(features) == 4:
+            features = list(features) + [behavior['user_behavior_score']]
         
         if len(features) != 5:
             return jsonify({
@@ -812,8 +687,9 @@ def predict():
                 'error': '정확히 5개의 특성값이 필요합니다.'
             }), 400
         
-        # CSV 형태로 변환 (XGBoost 모델 입력 형식)
-        input_data = ','.join(map(str, features))
+        # 학습과 같은 변환 후 CSV 형태로 변환 (XGBoost 모델 입력 형식)
+        encoded = model_input(features, data)
+        input_data = ','.join(map(str, encoded))
         
         logger.info(f"Sending prediction request: {input_data}")
         
@@ -834,18 +710,22 @@ def predict():
         
         response_time = (datetime.now() - start_time).total_seconds() * 1000
         
-        # 모델 정보 가져오기 (옵션)
-        model_name = None
-        try:
-            endpoint_config = sagemaker.describe_endpoint_config(
-                EndpointConfigName=sagemaker.describe_endpoint(EndpointName=ENDPOINT_NAME)['EndpointConfigName']
-            )
-            model_name = endpoint_config['ProductionVariants'][0]['ModelName']
-        except:
-            pass
+        # 모델 정보 (백그라운드 상태 갱신에서 캐시된 값)
+        health_refresher.ensure_started()
+        model_name = health_monitor.model_name
         
-        # 세션 ID 생성 또는 가져오기
-        session_id = data.get('session_id', generate_session_id())
+        shadow_scorer.maybe_submit(
+            [features], [probability],
+            {'route': 'predict', 'session_id': session_id}, data
+        )
+        behavior_aggregator.record(agg_keys, impressions=1)
+        behavior_checkpointer.ensure_started()
+        click_metrics.record_impression(features[1], features[3], request_device(data), probability)
+        stats_publisher.ensure_started()
+        drift_monitor = drift_resolver.current
+        if drift_monitor is not None:
+            drift_monitor.observe(features)
+            drift_worker.ensure_started()
         
         # Feature Store에 저장할 데이터 준비
         interaction_data = {
@@ -858,6 +738,7 @@ def predict():
             'predicted_probability': probability,
             'predicted_class': prediction,
             'session_id': session_id,
+            'user_key': user_key,
             'request_type': 'prediction',
             'chat_query_length': 0,
             'chat_category': 'prediction_request',
@@ -865,7 +746,7 @@ def predict():
         }
         
         # Feature Store에 비동기적으로 저장 (실패해도 응답에는 영향 없음)
-        save_to_feature_store(interaction_data)
+        feature_store_writer.submit(interaction_data)
         
         return jsonify({
             'success': True,
@@ -875,9 +756,12 @@ def predict():
             'response_time': round(response_time, 2),
             'model_name': model_name,
             'session_id': session_id,
+            'behavior_features': behavior,
             'timestamp': datetime.utcnow().isoformat()
         })
         
+    except TransformUnavailable:
+        return transform_unavailable()
     except Exception as e:
         logger.error(f"Prediction failed: {str(e)}")
         response_time = (datetime.now() - start_time).total_seconds() * 1000
@@ -907,10 +791,9 @@ def track_click():
                 'error': '정확히 5개의 특성값이 필요합니다.'
             }), 400
         
-        # 모델 예측도 함께 수행하여 예측 vs 실제 비교
-        input_data = ','.join(map(str, features))
-        
+        # 모델 예측도 함께 수행하여 예측 vs 실제 비교 (변환 미로드 시에도 클릭 라벨은 기록)
         try:
+            input_data = ','.join(map(str, model_input(features, data)))
             # SageMaker 엔드포인트 호출
             response = sagemaker_runtime.invoke_endpoint(
                 EndpointName=ENDPOINT_NAME,
@@ -928,6 +811,13 @@ def track_click():
             prediction = 0
         
         response_time = (datetime.now() - start_time).total_seconds() * 1000
+
+        user_key, agg_keys = behavior_keys(data, session_id)
+        behavior_aggregator.record(agg_keys, clicks=int(actual_click))
+        behavior_checkpointer.ensure_started()
+        # 예측 vs 실제 결과를 버리지 않고 CTR/캘리브레이션 집계에 반영
+        click_metrics.record_outcome(features[1], features[3], request_device(data), probability, actual_click)
+        stats_publisher.ensure_started()
         
         # Feature Store에 저장할 실제 클릭 데이터 준비
         interaction_data = {
@@ -941,6 +831,7 @@ def track_click():
             'predicted_class': prediction,
             'actual_click': actual_click,  # 실제 클릭 결과
             'session_id': session_id,
+            'user_key': user_key,  # 행동 집계 체크포인트 키 (as-of 조인 키)
             'request_type': 'actual_click',
             'chat_query_length': 0,
             'chat_category': 'ad_click',
@@ -976,31 +867,204 @@ def track_click():
             'timestamp': datetime.utcnow().isoformat()
         }), 500
 
+# 한 번의 랭킹 요청에서 허용하는 최대 후보 수
+MAX_RANK_CANDIDATES = int(os.environ.get('MAX_RANK_CANDIDATES', 10000))
+
+
+@app.route('/api/rank', methods=['POST'])
+def rank():
+    """후보 광고 위치/시간대 일괄 랭킹 API (후보 전체를 1회 호출로 점수화)"""
+    start_time = datetime.now()
+
+    try:
+        data = request.get_json()
+        base = data.get('features', [])
+        candidates = data.get('candidates', {})
+        k = int(data.get('top_k', 5))
+
+        if isinstance(base, dict):
+            base = [base.get(name, 0) for name in FEATURE_NAMES]
+        if len(base) != 5:
+            return jsonify({
+                'success': False,
+                'error': '정확히 5개의 특성값이 필요합니다.'
+            }), 400
+
+        unknown = set(candidates) - set(FEATURE_NAMES)
+        if not candidates or unknown:
+            return jsonify({
+                'success': False,
+                'error': f'후보 차원은 {FEATURE_NAMES} 중에서 지정해야 합니다.'
+            }), 400
+
+        n_candidates = int(np.prod([len(v) for v in candidates.values()]))
+        if n_candidates == 0 or n_candidates > MAX_RANK_CANDIDATES:
+            return jsonify({
+                'success': False,
+                'error': f'후보 조합 수는 1~{MAX_RANK_CANDIDATES}개여야 합니다.'
+            }), 400
+
+        rows, dims = expand_candidates(base, candidates)
+        encoded = model_rows(rows, data)
+        scores, invocations = score_batch(sagemaker_runtime, ENDPOINT_NAME, encoded)
+        if scores.size != rows.shape[0]:
+            raise ValueError(f'응답 점수 개수 불일치: {scores.size} != {rows.shape[0]}')
+
+        shadow_scorer.maybe_submit(rows, scores.tolist(), {'route': 'rank'}, data)
+
+        best = top_k(scores, k)
+        dim_idx = [FEATURE_NAMES.index(name) for name in dims]
+        ranked = [
+            dict(
+                {name: float(rows[i, j]) for name, j in zip(dims, dim_idx)},
+                rank=r + 1,
+                probability=float(scores[i])
+            )
+            for r, i in enumerate(best)
+        ]
+
+        response_time = (datetime.now() - start_time).total_seconds() * 1000
+        logger.info(f"Ranked {rows.shape[0]} candidates in {invocations} invocation(s), {response_time:.1f}ms")
+
+        return jsonify({
+            'success': True,
+            'ranked': ranked,
+            'candidate_count': int(rows.shape[0]),
+            'invocations': invocations,
+            'response_time': round(response_time, 2),
+            'timestamp': datetime.utcnow().isoformat()
+        })
+
+    except TransformUnavailable:
+        return transform_unavailable()
+    except Exception as e:
+        logger.error(f"Ranking failed: {str(e)}")
+        response_time = (datetime.now() - start_time).total_seconds() * 1000
+
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'response_time': round(response_time, 2),
+            'timestamp': datetime.utcnow().isoformat()
+        }), 500
+
+@app.route('/api/stats')
+def api_stats():
+    """실시간 CTR/캘리브레이션 통계 API (Athena 조회 없이 증분 카운터에서 계산)"""
+    try:
+        minutes = request.args.get('minutes', type=float)
+        since = time.time() - minutes * 60 if minutes else None
+        merged = stats_exchange.collect(click_metrics.snapshot())
+        return jsonify({
+            'success': True,
+            'stats': summarize(merged, since=since),
+            'admission': admission.stats(),
+            'feature_cache': dict(feature_lookup.cache.stats(), unprocessed_retries=feature_lookup.unprocessed_retries),
+            'behavior_aggregates': behavior_aggregator.stats(),
+            'drift': drift_resolver.current.last_result if drift_resolver.current is not None else None,
+            'drift_baseline_uri': drift_resolver.uri,
+            'shadow': shadow_scorer.stats(),
+            'feature_store_writer': feature_store_writer.stats(),
+            'dependencies': health_monitor.snapshot(),
+            'feature_transform_uri': transform_resolver.uri,
+            'shadow_feature_transform_uri': shadow_transform_resolver.uri,
+            'timestamp': datetime.utcnow().isoformat()
+        })
+    except Exception as e:
+        logger.error(f"Failed to build stats: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus 텍스트 형식 지표 (어드미션, CTR, 드리프트)"""
+    lines = []
+
+    def gauge(name, value, labels=None, help_text=None):
+        if value is None:
+            return
+        if help_text:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+        label_str = ''
+        if labels:
+            label_str = '{' + ','.join(f'{k}="{v}"' for k, v in labels.items()) + '}'
+        lines.append(f"{name}{label_str} {value}")
+
+    for key, value in admission.stats().items():
+        gauge(f"inference_admission_{key}", value, help_text=f"admission controller {key}")
+
+    health = health_monitor.snapshot()
+    gauge('inference_ready', int(health['ready']), help_text='task-local readiness (1 = accepting traffic)')
+    gauge('inference_endpoint_serving', int(health['endpoint_status'] in SERVING_ENDPOINT_STATUSES),
+          {'endpoint': ENDPOINT_NAME, 'status': health['endpoint_status']}, help_text='shared SageMaker endpoint can serve')
+    gauge('inference_model_loaded', int(bool(health['model_loaded'])), help_text='endpoint has an instance with the model loaded')
+    gauge('inference_feature_store_backlog', health['feature_store_backlog'], help_text='queued Feature Store writes')
+
+    totals = summarize(click_metrics.snapshot())
+    gauge('inference_ctr', totals['totals']['ctr'], help_text='clicks / impressions (this worker)')
+    gauge('inference_calibration_ece', totals['ece'], help_text='expected calibration error (this worker)')
+    gauge('inference_rolling_auc', totals['auc'], help_text='histogram AUC of labeled clicks (this worker)')
+
+    drift_monitor = drift_resolver.current
+    result = drift_monitor.last_result if drift_monitor is not None else None
+    if result:
+        lines.append('# HELP inference_feature_drift_psi PSI of live inputs vs training baseline')
+        lines.append('# TYPE inference_feature_drift_psi gauge')
+        for name, f in result['features'].items():
+            gauge('inference_feature_drift_psi', f['psi'], {'feature': name})
+        lines.append('# HELP inference_feature_drift_ks KS statistic of live inputs vs training baseline')
+        lines.append('# TYPE inference_feature_drift_ks gauge')
+        for name, f in result['features'].items():
+            gauge('inference_feature_drift_ks', f['ks'], {'feature': name})
+
+    return Response('\n'.join(lines) + '\n', mimetype='text/plain; version=0.0.4')
+
 @app.route('/api/models')
 def list_models():
-    """모델 패키지 목록 API"""
+    """모델 패키지 목록 API (로컬 레지스트리 인덱스, ETag/304 지원)"""
     try:
-        response = sagemaker.list_model_packages(
-            ModelPackageGroupName=MODEL_PACKAGE_GROUP,
-            ModelApprovalStatus='Approved',
-            SortBy='CreationTime',
-            SortOrder='Descending',
-            MaxResults=10
+        if model_registry.synced_at is None:
+            model_registry.sync()
+        registry_syncer.ensure_started()
+
+        status = request.args.get('status', 'Approved')
+        if status.lower() == 'all':
+            status = None
+        limit = min(request.args.get('limit', 10, type=int), 1000)
+        offset = request.args.get('offset', 0, type=int)
+        packages, total = model_registry.query(
+            status=status,
+            sort_by=request.args.get('sort', 'creation_time'),
+            descending=request.args.get('order', 'desc').lower() != 'asc',
+            limit=limit,
+            offset=offset,
+            metric=request.args.get('metric'),
+            min_value=request.args.get('min_value', type=float),
         )
-        
-        models = []
-        for package in response.get('ModelPackageSummaryList', []):
-            models.append({
-                'name': package['ModelPackageArn'].split('/')[-1],
-                'status': package['ModelApprovalStatus'],
-                'creation_time': package['CreationTime'].isoformat()
-            })
-        
-        return jsonify({
+
+        models = [{
+            'name': p['name'],
+            'status': p['status'],
+            'creation_time': p['creation_time'],
+            'version': p.get('version'),
+            'metrics': p.get('metrics', {})
+        } for p in packages]
+
+        response = jsonify({
             'success': True,
             'models': models,
-            'total_count': len(models)
+            'total_count': total,
+            'offset': offset,
+            'limit': limit,
+            'synced_at': model_registry.synced_at
         })
+        # 인덱스 버전 + 쿼리 문자열로 ETag 구성 → 변경 없으면 304
+        response.set_etag(f"{model_registry.etag}-{zlib.crc32(request.query_string):08x}")
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
         
     except Exception as e:
         logger.error(f"Failed to list models: {str(e)}")
@@ -1020,6 +1084,7 @@ if __name__ == '__main__':
     
     # Production에서는 Gunicorn 사용 권장
     if debug:
+        health_refresher.ensure_started()
         app.run(host='0.0.0.0', port=port, debug=True)
     else:
         from gunicorn.app.wsgiapp import WSGIApplication
@@ -1040,11 +1105,15 @@ if __name__ == '__main__':
         options = {
             'bind': f'0.0.0.0:{port}',
             'workers': 2,
-            'worker_class': 'sync',
+            # 어드미션 컨트롤이 워커 내부 대기열을 관리할 수 있도록 스레드 워커 사용
+            'worker_class': 'gthread',
+            'threads': int(os.environ.get('GUNICORN_THREADS', 16)),
             'timeout': 120,
             'keepalive': 5,
             'max_requests': 1000,
             'preload_app': True,
+            # 워커 기동 즉시 의존성 갱신(워밍업, 모델 변환 로드) 시작 → 첫 요청 전에 /readyz 가 준비 상태로 전환
+            'post_fork': lambda server, worker: health_refresher.ensure_started(),
         }
         
         StandaloneApplication(app, options).run()
@@ -0,0 +1,50 @@
+"""주기 실행 백그라운드 작업 (gunicorn preload_app fork 대응)
+
+preload_app=True 환경에서는 마스터에서 import 시 띄운 스레드가 워커로 복제되지
+않으므로, 요청 처리 중 ensure_started()를 호출해 워커 프로세스별로 지연 시작한다.
+"""
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicWorker:
+    """interval 초마다 fn()을 실행하는 데몬 스레드"""
+
+    def __init__(self, name, interval_seconds, fn, run_immediately=False):
+        self.name = name
+        self.run_immediately = run_immediately
+        self.interval = interval_seconds
+        self._fn = fn
+        self._lock = threading.Lock()
+        self._pid = None
+        self._stop = threading.Event()
+
+    def ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._stop = threading.Event()
+            thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            thread.start()
+            self._pid = os.getpid()
+            logger.info(f"Background worker started: {self.name} (pid={self._pid}, every {self.interval}s)")
+
+    def stop(self):
+        self._stop.set()
+
+    def run_once(self):
+        try:
+            self._fn()
+        except Exception as e:
+            logger.warning(f"Background worker {self.name} failed: {e}")
+
+    def _run(self):
+        if self.run_immediately:
+            self.run_once()
+        while not self._stop.wait(self.interval):
+            self.run_once()
@@ -0,0 +1,255 @@
+"""실시간 CTR / 캘리브레이션 증분 집계
+
+예측(노출)과 실제 클릭 결과를 시간 버킷 × (ad_position, hour, device) 단위 카운터에
+누적한다. 스레드별 샤드에 기록해 락 경합을 줄이고, 스냅샷은 단순 합으로 병합되므로
+워커 간(프로세스 간) 집계도 같은 방식으로 합칠 수 있다. 조회 비용은 O(버킷 수).
+"""
+import copy
+import itertools
+import json
+import os
+import tempfile
+import threading
+import time
+
+# dims 카운터 레이아웃: [노출 수, 노출 예측확률 합, 라벨 수, 클릭 수, 라벨 예측확률 합]
+IMPRESSIONS, SUM_PRED, LABELED, CLICKS, SUM_PRED_LABELED = range(5)
+
+
+def _new_bucket(n_calib_bins, n_auc_bins):
+    return {
+        'dims': {},
+        'calib': [[0, 0.0, 0] for _ in range(n_calib_bins)],  # [개수, 예측확률 합, 클릭 수]
+        'auc_pos': [0] * n_auc_bins,
+        'auc_neg': [0] * n_auc_bins,
+    }
+
+
+class _Shard:
+    __slots__ = ('lock', 'buckets')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets = {}
+
+
+class ClickMetrics:
+    """시간 버킷 기반 CTR/캘리브레이션/AUC 카운터 (스레드 샤딩)"""
+
+    def __init__(self, bucket_seconds=300, retention_buckets=288, n_shards=8,
+                 n_calib_bins=10, n_auc_bins=100):
+        self.bucket_seconds = bucket_seconds
+        self.retention_buckets = retention_buckets
+        self.n_calib_bins = n_calib_bins
+        self.n_auc_bins = n_auc_bins
+        self._shards = [_Shard() for _ in range(n_shards)]
+        # 스레드별 샤드는 처음 기록할 때 순번으로 배정 (get_ident 는 정렬된 주소라 나머지가 한쪽에 몰림)
+        self._local = threading.local()
+        self._next_shard = itertools.count()
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = self._shards[next(self._next_shard) % len(self._shards)]
+        return shard
+
+    def _bucket(self, shard, ts):
+        """shard.lock 을 잡은 상태에서 호출"""
+        tb = int(ts // self.bucket_seconds)
+        bucket = shard.buckets.get(tb)
+        if bucket is None:
+            bucket = shard.buckets[tb] = _new_bucket(self.n_calib_bins, self.n_auc_bins)
+            oldest = tb - self.retention_buckets
+            for old in [k for k in shard.buckets if k <= oldest]:
+                del shard.buckets[old]
+        return bucket
+
+    @staticmethod
+    def _dim_key(ad_position, hour, device):
+        return f"{int(ad_position)}|{int(hour)}|{device}"
+
+    def record_impression(self, ad_position, hour, device, predicted, ts=None):
+        ts = time.time() if ts is None else ts
+        key = self._dim_key(ad_position, hour, device)
+        shard = self._shard()
+        with shard.lock:
+            bucket = self._bucket(shard, ts)
+            c = bucket['dims'].setdefault(key, [0, 0.0, 0, 0, 0.0])
+            c[IMPRESSIONS] += 1
+            c[SUM_PRED] += predicted
+
+    def record_outcome(self, ad_position, hour, device, predicted, clicked, ts=None):
+        ts = time.time() if ts is None else ts
+        key = self._dim_key(ad_position, hour, device)
+        clicked = 1 if clicked else 0
+        p = min(max(float(predicted), 0.0), 1.0)
+        shard = self._shard()
+        with shard.lock:
+            bucket = self._bucket(shard, ts)
+            c = bucket['dims'].setdefault(key, [0, 0.0, 0, 0, 0.0])
+            c[LABELED] += 1
+            c[CLICKS] += clicked
+            c[SUM_PRED_LABELED] += p
+            calib = bucket['calib'][min(int(p * self.n_calib_bins), self.n_calib_bins - 1)]
+            calib[0] += 1
+            calib[1] += p
+            calib[2] += clicked
+            auc_bin = min(int(p * self.n_auc_bins), self.n_auc_bins - 1)
+            bucket['auc_pos' if clicked else 'auc_neg'][auc_bin] += 1
+
+    def snapshot(self):
+        """JSON 직렬화 가능한 병합용 스냅샷"""
+        parts = []
+        for shard in self._shards:
+            with shard.lock:
+                parts.append({'buckets': {str(tb): copy.deepcopy(b) for tb, b in shard.buckets.items()}})
+        merged = merge_snapshots(parts)
+        merged['bucket_seconds'] = self.bucket_seconds
+        return merged
+
+
+def merge_snapshots(snapshots):
+    """스냅샷들을 원소별 합으로 병합 (교환/결합 법칙 성립)"""
+    out = {}
+    bucket_seconds = None
+    for snap in snapshots:
+        bucket_seconds = snap.get('bucket_seconds', bucket_seconds)
+        for tb, b in snap.get('buckets', {}).items():
+            dst = out.get(tb)
+            if dst is None:
+                out[tb] = copy.deepcopy(b)
+                continue
+            for key, c in b['dims'].items():
+                d = dst['dims'].setdefault(key, [0, 0.0, 0, 0, 0.0])
+                for i, v in enumerate(c):
+                    d[i] += v
+            for d, c in zip(dst['calib'], b['calib']):
+                for i, v in enumerate(c):
+                    d[i] += v
+            for name in ('auc_pos', 'auc_neg'):
+                dst[name] = [x + y for x, y in zip(dst[name], b[name])]
+    merged = {'buckets': out}
+    if bucket_seconds is not None:
+        merged['bucket_seconds'] = bucket_seconds
+    return merged
+
+
+def _rate(num, den):
+    return round(num / den, 6) if den else None
+
+
+def histogram_auc(pos, neg):
+    """점수 히스토그램 기반 근사 AUC (동일 bin 내 동점은 0.5로 처리)"""
+    total_pos, total_neg = sum(pos), sum(neg)
+    if not total_pos or not total_neg:
+        return None
+    neg_below = 0
+    area = 0.0
+    for p, n in zip(pos, neg):
+        area += p * (neg_below + 0.5 * n)
+        neg_below += n
+    return round(area / (total_pos * total_neg), 6)
+
+
+def summarize(snapshot, since=None):
+    """스냅샷 → /api/stats 응답 (차원별 CTR, 캘리브레이션, ECE, AUC)"""
+    bucket_seconds = snapshot.get('bucket_seconds', 300)
+    dims = {'ad_position': {}, 'hour': {}, 'device': {}}
+    totals = [0, 0.0, 0, 0, 0.0]
+    calib = None
+    auc_pos = auc_neg = None
+    buckets = sorted(snapshot.get('buckets', {}).items(), key=lambda kv: int(kv[0]))
+    for tb, b in buckets:
+        if since is not None and (int(tb) + 1) * bucket_seconds <= since:
+            continue
+        for key, c in b['dims'].items():
+            pos, hour, device = key.split('|')
+            for name, value in (('ad_position', pos), ('hour', hour), ('device', device)):
+                acc = dims[name].setdefault(value, [0, 0.0, 0, 0, 0.0])
+                for i, v in enumerate(c):
+                    acc[i] += v
+            for i, v in enumerate(c):
+                totals[i] += v
+        if calib is None:
+            calib = [list(x) for x in b['calib']]
+            auc_pos, auc_neg = list(b['auc_pos']), list(b['auc_neg'])
+        else:
+            for d, c in zip(calib, b['calib']):
+                for i, v in enumerate(c):
+                    d[i] += v
+            auc_pos = [x + y for x, y in zip(auc_pos, b['auc_pos'])]
+            auc_neg = [x + y for x, y in zip(auc_neg, b['auc_neg'])]
+
+    def view(c):
+        return {
+            'impressions': c[IMPRESSIONS],
+            'clicks': c[CLICKS],
+            'labeled': c[LABELED],
+            'ctr': _rate(c[CLICKS], c[IMPRESSIONS]),
+            'mean_predicted': _rate(c[SUM_PRED], c[IMPRESSIONS]),
+            'observed_click_rate': _rate(c[CLICKS], c[LABELED]),
+            'mean_predicted_labeled': _rate(c[SUM_PRED_LABELED], c[LABELED]),
+        }
+
+    calibration = []
+    ece = 0.0
+    n_labeled = totals[LABELED]
+    for i, (count, sum_pred, clicks) in enumerate(calib or []):
+        n_bins = len(calib)
+        calibration.append({
+            'bin': [round(i / n_bins, 4), round((i + 1) / n_bins, 4)],
+            'count': count,
+            'mean_predicted': _rate(sum_pred, count),
+            'observed_rate': _rate(clicks, count),
+        })
+        if count and n_labeled:
+            ece += abs(sum_pred / count - clicks / count) * count / n_labeled
+
+    return {
+        'bucket_seconds': bucket_seconds,
+        'buckets': len(buckets),
+        'totals': view(totals),
+        'by_ad_position': {k: view(v) for k, v in sorted(dims['ad_position'].items())},
+        'by_hour': {k: view(v) for k, v in sorted(dims['hour'].items(), key=lambda kv: int(kv[0]))},
+        'by_device': {k: view(v) for k, v in sorted(dims['device'].items())},
+        'calibration': calibration,
+        'ece': round(ece, 6) if n_labeled else None,
+        'auc': histogram_auc(auc_pos, auc_neg) if auc_pos else None,
+    }
+
+
+class SnapshotExchange:
+    """워커 간 스냅샷 공유 (공유 디렉터리에 워커별 JSON 파일을 원자적으로 기록)"""
+
+    def __init__(self, directory, max_age_seconds=120):
+        self.directory = directory
+        self.max_age_seconds = max_age_seconds
+
+    def publish(self, snapshot):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(snapshot, f)
+        os.replace(tmp, os.path.join(self.directory, f"{os.getpid()}.json"))
+
+    def collect(self, local_snapshot):
+        """현재 워커의 실시간 스냅샷 + 다른 워커가 최근 공개한 스냅샷 병합"""
+        snapshots = [local_snapshot]
+        own = f"{os.getpid()}.json"
+        now = time.time()
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            names = []
+        for name in names:
+            if not name.endswith('.json') or name == own:
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                if now - os.path.getmtime(path) > self.max_age_seconds:
+                    continue
+                with open(path) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return merge_snapshots(snapshots)
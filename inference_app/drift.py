@@ -0,0 +1,147 @@
+"""온라인 특성 드리프트 모니터 (학습 기준선 대비 PSI / KS)
+
+파이프라인 Extract 단계가 남긴 학습 분할 프로파일(profile.json)의 bin 경계를 그대로
+사용해 실시간 입력을 히스토그램으로만 누적한다. 원본 요청은 저장하지 않으며,
+히스토그램은 원소별 합으로 병합할 수 있다.
+
+기준선 위치는 배포된 모델 패키지의 CustomerMetadataProperties.DriftBaselineUri 에서
+찾는다(DriftBaselineResolver). 최신 추출 실행이 아니라 서빙 중인 모델의 학습 분할과 비교한다.
+"""
+import bisect
+import json
+import math
+import threading
+import time
+from urllib.parse import urlparse
+
+from package_artifacts import PackageArtifactResolver
+
+EPSILON = 1e-4
+
+
+def load_profile(uri, s3_client=None):
+    """s3://... 또는 로컬 경로에서 기준선 프로파일 로드"""
+    if uri.startswith('s3://'):
+        parsed = urlparse(uri)
+        body = s3_client.get_object(Bucket=parsed.netloc, Key=parsed.path.lstrip('/'))['Body'].read()
+        return json.loads(body)
+    with open(uri) as f:
+        return json.load(f)
+
+
+def psi(expected, actual):
+    """Population Stability Index (bin 비율 기준, 빈 bin 은 EPSILON 으로 보정)"""
+    e_total, a_total = sum(expected), sum(actual)
+    score = 0.0
+    for e, a in zip(expected, actual):
+        pe = max(e / e_total, EPSILON)
+        pa = max(a / a_total, EPSILON)
+        score += (pa - pe) * math.log(pa / pe)
+    return score
+
+
+def ks_statistic(expected, actual):
+    """bin 단위 누적분포 차이의 최댓값 (KS 통계량 근사)"""
+    e_total, a_total = sum(expected), sum(actual)
+    e_cum = a_cum = 0.0
+    best = 0.0
+    for e, a in zip(expected, actual):
+        e_cum += e / e_total
+        a_cum += a / a_total
+        best = max(best, abs(e_cum - a_cum))
+    return best
+
+
+class StreamingHistogram:
+    """고정 경계 히스토그램 (O(log bins) 갱신, 병합 가능)"""
+
+    __slots__ = ('edges', 'counts')
+
+    def __init__(self, edges):
+        self.edges = list(edges)
+        self.counts = [0] * (len(self.edges) + 1)
+
+    def add(self, value):
+        self.counts[bisect.bisect_right(self.edges, value)] += 1
+
+    def merge(self, other):
+        self.counts = [x + y for x, y in zip(self.counts, other.counts)]
+
+    @property
+    def total(self):
+        return sum(self.counts)
+
+
+class DriftMonitor:
+    """기준선 대비 특성별 드리프트 점수를 주기적으로 계산
+
+    feature_index: {기준선 특성 이름: 요청 특성 벡터 인덱스}
+    """
+
+    def __init__(self, profile, feature_index, min_samples=200):
+        self.feature_index = {
+            name: idx for name, idx in feature_index.items() if name in profile.get('features', {})
+        }
+        self._baseline = {name: profile['features'][name] for name in self.feature_index}
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._current = self._new_window()
+        self._window_start = time.time()
+        self.last_result = None
+
+    def _new_window(self):
+        return {name: StreamingHistogram(p['edges']) for name, p in self._baseline.items()}
+
+    def observe(self, features):
+        with self._lock:
+            for name, idx in self.feature_index.items():
+                value = features[idx]
+                if value is None:
+                    continue
+                self._current[name].add(float(value))
+
+    def evaluate(self):
+        """현재 윈도가 min_samples 이상이면 점수를 계산하고 새 윈도로 교체"""
+        with self._lock:
+            window = self._current
+            samples = min((h.total for h in window.values()), default=0)
+            if samples < self.min_samples:
+                return self.last_result
+            self._current = self._new_window()
+            started, self._window_start = self._window_start, time.time()
+
+        features = {}
+        for name, hist in window.items():
+            expected = self._baseline[name]['counts']
+            features[name] = {
+                'psi': round(psi(expected, hist.counts), 6),
+                'ks': round(ks_statistic(expected, hist.counts), 6),
+                'samples': hist.total,
+            }
+        self.last_result = {
+            'window_start': started,
+            'window_end': time.time(),
+            'samples': samples,
+            'max_psi': max((f['psi'] for f in features.values()), default=0.0),
+            'features': features,
+        }
+        return self.last_result
+
+
+class DriftBaselineResolver(PackageArtifactResolver):
+    """배포된 모델 패키지 → 그 학습 분할 기준선의 DriftMonitor (패키지가 바뀌면 새 윈도로 교체)
+
+    패키지에 DriftBaselineUri 가 없으면 fallback_uri(DRIFT_BASELINE_URI)를 쓰고, 둘 다 없으면
+    current 는 None (드리프트 모니터링 비활성).
+    """
+
+    metadata_key = 'DriftBaselineUri'
+    label = 'Drift baseline'
+
+    def __init__(self, sm_client, s3_client, feature_index, fallback_uri='', min_samples=200):
+        super().__init__(sm_client, s3_client, fallback_uri)
+        self.feature_index = feature_index
+        self.min_samples = min_samples
+
+    def load(self, uri):
+        return DriftMonitor(load_profile(uri, self._s3), self.feature_index, min_samples=self.min_samples)
@@ -0,0 +1,154 @@
+"""온라인 Feature Store 조회 (read-through TTL 캐시 + BatchGetRecord)
+
+클라이언트가 레코드 식별자만 보내도 예측할 수 있도록 온라인 스토어에서 특성값을
+조회한다. 반복 조회는 프로세스 내 캐시에서 처리하고, 앱이 직접 레코드를 쓰면
+해당 키를 무효화한다.
+"""
+import random
+import threading
+import time
+from collections import OrderedDict
+
+# BatchGetRecord 1회 호출당 최대 레코드 식별자 수
+BATCH_GET_LIMIT = 100
+
+
+class LookupUnavailable(Exception):
+    """재시도 후에도 처리되지 않은(스로틀링 등) 식별자가 남은 경우
+
+    result 에는 조회에 성공한 항목(없는 레코드는 None)만, unprocessed 에는 남은 식별자가 들어 있다.
+    레코드가 없는 것과 구분해 호출자가 재시도 가능한 오류(503 + Retry-After)로 응답하게 한다.
+    """
+
+    def __init__(self, unprocessed, result, retry_after):
+        super().__init__(f"{len(unprocessed)} record identifier(s) unprocessed")
+        self.unprocessed = unprocessed
+        self.result = result
+        self.retry_after = retry_after
+
+
+class TTLCache:
+    """스레드 안전 LRU + TTL 캐시 (항목 수 상한으로 메모리 제한)"""
+
+    def __init__(self, max_entries=10000, ttl_seconds=300.0, negative_ttl_seconds=30.0):
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._negative_ttl = negative_ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, keys):
+        """캐시에 있는 항목만 반환 {key: value}. 없는 레코드는 value=None 으로 캐시됨"""
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._data.get(key)
+                if entry is None or entry[0] < now:
+                    if entry is not None:
+                        del self._data[key]
+                    self.misses += 1
+                    continue
+                self._data.move_to_end(key)
+                found[key] = entry[1]
+                self.hits += 1
+        return found
+
+    def put(self, key, value):
+        ttl = self._ttl if value is not None else self._negative_ttl
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self._max_entries:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._data), 'hits': self.hits, 'misses': self.misses}
+
+
+class OnlineFeatureLookup:
+    """Feature Group 온라인 스토어 read-through 조회기"""
+
+    def __init__(self, client, feature_group_name, feature_names, cache=None,
+                 max_attempts=3, base_delay=0.05, max_delay=1.0):
+        self._client = client
+        self._feature_group_name = feature_group_name
+        self._feature_names = list(feature_names)
+        self.cache = cache or TTLCache()
+        # UnprocessedIdentifiers 재시도: 지수 백오프 + full jitter
+        self._max_attempts = max_attempts
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self.unprocessed_retries = 0
+
+    def get(self, record_id):
+        return self.get_many([record_id]).get(record_id)
+
+    def get_many(self, record_ids):
+        """{record_id: {feature_name: value} 또는 None(레코드 없음)}
+
+        재시도 후에도 처리되지 않은 식별자가 있으면 LookupUnavailable 을 던진다.
+        """
+        record_ids = list(dict.fromkeys(str(r) for r in record_ids))
+        result = self.cache.get_many(record_ids)
+        missing = [r for r in record_ids if r not in result]
+        pending = []
+        for i in range(0, len(missing), BATCH_GET_LIMIT):
+            pending.extend(self._fetch(missing[i:i + BATCH_GET_LIMIT], result))
+        for attempt in range(1, self._max_attempts):
+            if not pending:
+                break
+            time.sleep(self._backoff(attempt))
+            self.unprocessed_retries += len(pending)
+            retry, pending = pending, []
+            for i in range(0, len(retry), BATCH_GET_LIMIT):
+                pending.extend(self._fetch(retry[i:i + BATCH_GET_LIMIT], result))
+        if pending:
+            raise LookupUnavailable(pending, result, retry_after=max(1, int(round(self._max_delay))))
+        return result
+
+    def _backoff(self, attempt):
+        return random.uniform(0, min(self._max_delay, self._base_delay * (2 ** attempt)))
+
+    def _fetch(self, batch, result):
+        """batch 조회 결과를 result 에 채우고 처리되지 않은 식별자 목록을 반환"""
+        fetched, unprocessed = self._batch_get(batch)
+        for record_id in batch:
+            # 스로틀링 등으로 처리되지 않은 식별자는 캐시하지 않음 (없는 레코드로 취급하지 않음)
+            if record_id in unprocessed:
+                continue
+            value = fetched.get(record_id)
+            self.cache.put(record_id, value)
+            result[record_id] = value
+        return [r for r in batch if r in unprocessed]
+
+    def invalidate(self, record_id):
+        self.cache.invalidate(str(record_id))
+
+    def _batch_get(self, record_ids):
+        response = self._client.batch_get_record(
+            Identifiers=[{
+                'FeatureGroupName': self._feature_group_name,
+                'RecordIdentifiersValueAsString': record_ids,
+                'FeatureNames': self._feature_names,
+            }]
+        )
+        fetched = {
+            item['RecordIdentifierValueAsString']: {
+                f['FeatureName']: f['ValueAsString'] for f in item.get('Record', [])
+            }
+            for item in response.get('Records', [])
+        }
+        unprocessed = {
+            record_id
+            for ident in response.get('UnprocessedIdentifiers', [])
+            for record_id in ident.get('RecordIdentifiersValueAsString', [])
+        }
+        return fetched, unprocessed
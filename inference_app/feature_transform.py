@@ -0,0 +1,31 @@
+"""학습 파이프라인과 동일한 특성 변환 (Preprocess 단계의 transform.json 적용)
+
+파이프라인 03_preprocess 가 학습 분할에서 적합해 모델 산출물 옆에 저장한 아티팩트를
+그대로 읽어, 온라인 요청을 학습 때와 같은 규칙으로 인코딩한다. 변환 자체(FeatureTransform,
+load_transform)는 SDK 와 공유하는 mlops_client/transform.py 에 있다.
+
+아티팩트 위치는 배포된 모델 패키지의 CustomerMetadataProperties.FeatureTransformUri 에서
+찾는다(TransformResolver). 모델과 변환이 항상 같은 학습 실행에서 나오도록 하기 위함이다.
+"""
+import logging
+
+from mlops_client.transform import load_transform
+from package_artifacts import PackageArtifactResolver
+
+logger = logging.getLogger(__name__)
+
+
+class TransformUnavailable(Exception):
+    """배포된 모델의 특성 변환을 아직 로드하지 못함 (원본 특성을 그대로 보내지 않음)"""
+
+
+class TransformResolver(PackageArtifactResolver):
+    """배포된 모델 패키지 → 특성 변환 (패키지에 FeatureTransformUri 가 없으면 FEATURE_TRANSFORM_URI)"""
+
+    metadata_key = 'FeatureTransformUri'
+    label = 'Feature transform'
+
+    def load(self, uri):
+        transform = load_transform(uri, self._s3)
+        logger.info(f"Feature transform columns: {transform.columns}")
+        return transform
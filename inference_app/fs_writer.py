@@ -0,0 +1,68 @@
+"""Feature Store 비동기 레코드 기록기
+
+예측 응답 경로에서 put_record 왕복을 제거하기 위해 상한이 있는 큐에 적재하고
+워커 스레드가 순차 기록한다. 큐가 가득 차면 응답 지연 대신 기록을 버리고 집계한다.
+"""
+import logging
+import os
+import queue
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRecordWriter:
+    """write_fn(item) 을 백그라운드 스레드에서 호출"""
+
+    def __init__(self, write_fn, max_queue=1000):
+        self._write_fn = write_fn
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._pid = None
+        self.written = 0
+        self.failed = 0
+        self.dropped = 0
+
+    def _ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                threading.Thread(target=self._run, name='fs-writer', daemon=True).start()
+                self._pid = os.getpid()
+
+    def submit(self, item):
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            logger.warning("Feature Store write queue full; dropping record")
+            return False
+
+    @property
+    def backlog(self):
+        return self._queue.qsize()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if self._write_fn(item):
+                    self.written += 1
+                else:
+                    self.failed += 1
+            except Exception as e:
+                self.failed += 1
+                logger.warning(f"Async Feature Store write failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def stats(self):
+        return {
+            'backlog': self.backlog,
+            'written': self.written,
+            'failed': self.failed,
+            'dropped': self.dropped,
+        }
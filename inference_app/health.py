@@ -0,0 +1,132 @@
+"""liveness / readiness 상태 모델
+
+의존성 상태(엔드포인트, Feature Store 기록 대기열, 모델 로드 여부)는 백그라운드에서만
+갱신하고, /livez · /readyz 는 캐시된 상태를 읽기만 한다. 따라서 헬스체크 빈도와
+무관하게 컨트롤 플레인 호출 수가 일정하다.
+
+준비(ready) 판정은 태스크 자신의 상태(워밍업, 기록 대기열, 로컬 검사)만 본다. 모든
+태스크가 공유하는 의존성(엔드포인트, 모델 로드)이 나빠져도 태스크를 교체해 해결되지
+않으므로 degraded 로만 보고한다(/api/stats, /metrics).
+"""
+import logging
+import threading
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# 트래픽을 처리할 수 있는 엔드포인트 상태 (업데이트 중에도 기존 변형이 응답함)
+SERVING_ENDPOINT_STATUSES = {'InService', 'Updating', 'SystemUpdating'}
+
+
+class DependencyMonitor:
+    """백그라운드 갱신되는 의존성 상태와 준비(ready) 판정"""
+
+    def __init__(self, sm_client, endpoint_name, backlog_fn=None, max_backlog=500,
+                 warmup_fns=None, local_checks=None):
+        self._sm = sm_client
+        self._endpoint_name = endpoint_name
+        self._backlog_fn = backlog_fn or (lambda: 0)
+        self.max_backlog = max_backlog
+        self._warmup_fns = list(warmup_fns or [])
+        # {reason: fn} 태스크 로컬 검사 (fn() 이 거짓이면 not ready)
+        self._local_checks = dict(local_checks or {})
+        self._lock = threading.Lock()
+        self._warm = False
+        self._state = {
+            'endpoint_status': 'UNKNOWN',
+            'model_name': None,
+            'model_package_arn': None,
+            'variant_packages': {},
+            'model_loaded': False,
+            'checked_at': None,
+        }
+
+    def refresh(self):
+        """엔드포인트 상태 조회 및 최초 1회 워밍업 (백그라운드 스레드에서만 호출)"""
+        state = {'checked_at': datetime.utcnow().isoformat()}
+        try:
+            endpoint = self._sm.describe_endpoint(EndpointName=self._endpoint_name)
+            state['endpoint_status'] = endpoint['EndpointStatus']
+            variants = endpoint.get('ProductionVariants', [])
+            state['model_loaded'] = any(v.get('CurrentInstanceCount', 0) > 0 for v in variants)
+            with self._lock:
+                known_config = self._state.get('endpoint_config')
+            if endpoint.get('EndpointConfigName') != known_config:
+                config = self._sm.describe_endpoint_config(EndpointConfigName=endpoint['EndpointConfigName'])
+                state['endpoint_config'] = endpoint['EndpointConfigName']
+                state['model_name'] = config['ProductionVariants'][0]['ModelName']
+                # 변형별 패키지 (첫 변형이 운영 모델, 나머지는 섀도 챌린저 등)
+                state['variant_packages'] = {
+                    v['VariantName']: self._model_package(v['ModelName']) for v in config['ProductionVariants']
+                }
+                state['model_package_arn'] = state['variant_packages'][config['ProductionVariants'][0]['VariantName']]
+        except Exception as e:
+            logger.warning(f"Endpoint not available yet: {str(e)}")
+            state['endpoint_status'] = 'NOT_FOUND'
+            state['model_loaded'] = False
+
+        if not self._warm:
+            for fn in self._warmup_fns:
+                try:
+                    fn()
+                except Exception as e:
+                    logger.warning(f"Warm-up step failed: {e}")
+            self._warm = True
+            logger.info("Dependency warm-up complete")
+
+        with self._lock:
+            self._state.update(state)
+
+    def _model_package(self, model_name):
+        """레지스트리 패키지로 만든 모델이면 그 패키지 ARN (변환 아티팩트 위치 조회용)"""
+        try:
+            model = self._sm.describe_model(ModelName=model_name)
+        except Exception as e:
+            logger.warning(f"Failed to describe model {model_name}: {e}")
+            return None
+        containers = model.get('Containers') or [model.get('PrimaryContainer') or {}]
+        return containers[0].get('ModelPackageName')
+
+    def snapshot(self):
+        """캐시된 상태 + 준비 여부 판정 (AWS 호출 없음)"""
+        with self._lock:
+            state = dict(self._state)
+        backlog = self._backlog_fn()
+        reasons = []
+        if not self._warm:
+            reasons.append('warming_up')
+        if backlog > self.max_backlog:
+            reasons.append('feature_store_backlog')
+        for reason, check in self._local_checks.items():
+            if not check():
+                reasons.append(reason)
+        # 공유 의존성: 준비 판정에는 넣지 않고 보고만 함
+        degraded = []
+        if state['endpoint_status'] not in SERVING_ENDPOINT_STATUSES:
+            degraded.append(f"endpoint_{state['endpoint_status'].lower()}")
+        if state['checked_at'] and not state['model_loaded']:
+            degraded.append('model_not_loaded')
+        state.update({
+            'ready': not reasons,
+            'reasons': reasons,
+            'degraded': degraded,
+            'warm': self._warm,
+            'feature_store_backlog': backlog,
+            'timestamp': datetime.utcnow().isoformat(),
+        })
+        return state
+
+    @property
+    def model_name(self):
+        with self._lock:
+            return self._state.get('model_name')
+
+    @property
+    def model_package_arn(self):
+        with self._lock:
+            return self._state.get('model_package_arn')
+
+    def variant_package_arn(self, variant_name):
+        """엔드포인트 변형을 만든 모델 패키지 ARN (모르면 None)"""
+        with self._lock:
+            return self._state.get('variant_packages', {}).get(variant_name)
@@ -0,0 +1,57 @@
+"""배포된 모델 패키지 메타데이터가 가리키는 학습 산출물 로드
+
+학습 파이프라인은 모델과 같은 실행에서 만든 산출물(특성 변환, 드리프트 기준선 등)의
+위치를 모델 패키지의 CustomerMetadataProperties 로 공개한다. 앱은 배포된 패키지가 바뀔
+때만 메타데이터를 다시 조회해, 서빙 중인 모델과 항상 짝이 맞는 산출물을 사용한다.
+"""
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class PackageArtifactResolver:
+    """배포된 모델 패키지 → 메타데이터 키(metadata_key)의 산출물 (패키지가 바뀔 때만 조회·다시 로드)
+
+    패키지에 metadata_key 가 없으면 fallback_uri 를 쓴다. 로드에 실패하면 current 는
+    None 이 되고 다음 refresh 에서 다시 시도한다. 하위 클래스는 load(uri) 를 구현한다.
+    """
+
+    metadata_key = None
+    label = 'artifact'
+
+    def __init__(self, sm_client, s3_client, fallback_uri=''):
+        self._sm = sm_client
+        self._s3 = s3_client
+        self.fallback_uri = fallback_uri
+        self._lock = threading.Lock()
+        self._package_arn = None
+        self._resolved = False
+        self.uri = None
+        self.current = None
+
+    def load(self, uri):
+        raise NotImplementedError
+
+    def refresh(self, model_package_arn):
+        """백그라운드 스레드에서 호출. 반환: 현재 산출물 (없으면 None)"""
+        with self._lock:
+            if self._resolved and model_package_arn == self._package_arn:
+                return self.current
+            uri = self.fallback_uri
+            try:
+                if model_package_arn:
+                    desc = self._sm.describe_model_package(ModelPackageName=model_package_arn)
+                    uri = (desc.get('CustomerMetadataProperties') or {}).get(self.metadata_key) or uri
+                if not uri:
+                    raise ValueError(f"no {self.metadata_key} for model package {model_package_arn}")
+                artifact = self.current if uri == self.uri else self.load(uri)
+            except Exception as e:
+                logger.warning(f"{self.label} not available: {e}")
+                self.current, self.uri, self._resolved = None, None, False
+                return None
+            if uri != self.uri:
+                logger.info(f"{self.label} loaded: {uri}")
+            self.current, self.uri = artifact, uri
+            self._package_arn, self._resolved = model_package_arn, True
+            return artifact
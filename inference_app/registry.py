@@ -0,0 +1,201 @@
+"""모델 레지스트리 로컬 인덱스 (CreationTime 워터마크 기반 증분 동기화)
+
+Model Package Group 의 패키지 메타데이터와 품질 지표(metrics.json)를 메모리에
+유지하고, 필터/정렬/페이지네이션을 로컬에서 처리한다. 내용이 바뀔 때만 ETag 가
+바뀌므로 조건부 요청(If-None-Match)에 304 로 응답할 수 있다.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class ModelRegistryIndex:
+    """list_model_packages 결과의 로컬 미러"""
+
+    def __init__(self, sm_client, s3_client, group_name, full_resync_seconds=600):
+        self._sm = sm_client
+        self._s3 = s3_client
+        self.group_name = group_name
+        self.full_resync_seconds = full_resync_seconds
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._packages = {}
+        self._watermark = None
+        self._last_full_sync = 0.0
+        self.etag = self._compute_etag({})
+        self.synced_at = None
+
+    # ----- 동기화 -----
+
+    def sync(self, full=None):
+        """증분 동기화. full_resync_seconds 마다 승인 상태 변경 반영을 위해 전체 목록 재조회"""
+        with self._sync_lock:
+            now = time.time()
+            if full is None:
+                full = self._watermark is None or now - self._last_full_sync >= self.full_resync_seconds
+            kwargs = {}
+            if not full and self._watermark is not None:
+                # CreationTimeAfter 는 초과 조건이므로 같은 시각 패키지를 놓치지 않도록 1초 여유
+                kwargs['CreationTimeAfter'] = self._watermark - timedelta(seconds=1)
+
+            summaries = []
+            paginator = self._sm.get_paginator('list_model_packages')
+            for page in paginator.paginate(
+                ModelPackageGroupName=self.group_name,
+                SortBy='CreationTime',
+                SortOrder='Ascending',
+                **kwargs
+            ):
+                summaries.extend(page.get('ModelPackageSummaryList', []))
+
+            with self._lock:
+                packages = dict(self._packages)
+            seen = set()
+            for summary in summaries:
+                arn = summary['ModelPackageArn']
+                seen.add(arn)
+                existing = packages.get(arn)
+                if existing is None:
+                    packages[arn] = self._describe(summary)
+                elif existing['status'] != summary.get('ModelApprovalStatus'):
+                    packages[arn] = dict(existing, status=summary.get('ModelApprovalStatus'))
+            if full:
+                # 전체 재조회 시 삭제된 패키지 제거
+                packages = {arn: p for arn, p in packages.items() if arn in seen}
+                self._last_full_sync = now
+
+            creation_times = [s['CreationTime'] for s in summaries]
+            if creation_times:
+                latest = max(creation_times)
+                self._watermark = latest if self._watermark is None else max(self._watermark, latest)
+            elif full:
+                self._watermark = self._watermark or datetime.fromtimestamp(0).astimezone()
+
+            etag = self._compute_etag(packages)
+            with self._lock:
+                self._packages = packages
+                self.etag = etag
+                self.synced_at = datetime.utcnow().isoformat()
+            return len(summaries)
+
+    def _describe(self, summary):
+        arn = summary['ModelPackageArn']
+        entry = {
+            'arn': arn,
+            'name': arn.split('/')[-1],
+            'version': summary.get('ModelPackageVersion'),
+            'status': summary.get('ModelApprovalStatus'),
+            'creation_time': summary['CreationTime'].isoformat(),
+            'description': summary.get('ModelPackageDescription'),
+            'metrics': {},
+        }
+        try:
+            desc = self._sm.describe_model_package(ModelPackageName=arn)
+            stats = ((desc.get('ModelMetrics') or {}).get('ModelQuality') or {}).get('Statistics') or {}
+            if stats.get('S3Uri'):
+                entry['metrics_uri'] = stats['S3Uri']
+                entry['metrics'] = self._load_metrics(stats['S3Uri'])
+            containers = (desc.get('InferenceSpecification') or {}).get('Containers') or []
+            if containers:
+                entry['model_data_url'] = containers[0].get('ModelDataUrl')
+                entry['image'] = containers[0].get('Image')
+        except Exception as e:
+            logger.warning(f"Failed to describe model package {arn}: {e}")
+        return entry
+
+    def _load_metrics(self, uri):
+        parsed = urlparse(uri)
+        body = self._s3.get_object(Bucket=parsed.netloc, Key=parsed.path.lstrip('/'))['Body'].read()
+        return flatten_metrics(json.loads(body))
+
+    @staticmethod
+    def _compute_etag(packages):
+        digest = hashlib.sha1()
+        for arn in sorted(packages):
+            p = packages[arn]
+            digest.update(f"{arn}|{p['status']}|{json.dumps(p.get('metrics', {}), sort_keys=True)}\n".encode())
+        return digest.hexdigest()
+
+    # ----- 조회 -----
+
+    def query(self, status=None, sort_by='creation_time', descending=True, limit=None, offset=0,
+              metric=None, min_value=None):
+        """메모리 내 필터/정렬/페이지네이션. 반환: (페이지 목록, 필터 후 전체 개수)"""
+        with self._lock:
+            items = list(self._packages.values())
+        if status:
+            items = [p for p in items if p['status'] == status]
+        if metric and min_value is not None:
+            items = [p for p in items if p['metrics'].get(metric, float('-inf')) >= min_value]
+
+        if sort_by in ('creation_time', 'version', 'name', 'status'):
+            key = lambda p: (p.get(sort_by) is None, p.get(sort_by) or 0)
+        else:
+            # 지표 이름으로 정렬 (지표가 없는 패키지는 항상 뒤로)
+            key = lambda p: (sort_by not in p['metrics'], p['metrics'].get(sort_by, 0))
+        present = [p for p in items if not key(p)[0]]
+        missing = [p for p in items if key(p)[0]]
+        present.sort(key=lambda p: key(p)[1], reverse=descending)
+        items = present + missing
+
+        total = len(items)
+        end = None if limit is None else offset + limit
+        return items[offset:end], total
+
+    def save(self, path):
+        """인덱스 스냅샷 저장 (배포 스크립트 등 다른 프로세스에서 재사용)"""
+        with self._lock:
+            data = {
+                'group_name': self.group_name,
+                'watermark': self._watermark.isoformat() if self._watermark else None,
+                'packages': list(self._packages.values()),
+            }
+        with open(path, 'w') as f:
+            json.dump(data, f)
+
+    def load(self, path):
+        with open(path) as f:
+            data = json.load(f)
+        packages = {p['arn']: p for p in data.get('packages', [])}
+        with self._lock:
+            self._packages = packages
+            self._watermark = datetime.fromisoformat(data['watermark']) if data.get('watermark') else None
+            self.etag = self._compute_etag(packages)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'packages': len(self._packages),
+                'watermark': self._watermark.isoformat() if self._watermark else None,
+                'synced_at': self.synced_at,
+                'etag': self.etag,
+            }
+
+
+def flatten_metrics(report, prefix=''):
+    """metrics.json / evaluation.json → {'auc': 0.81, ...} 형태의 평면 숫자 지표
+
+    - {'dummy:auc': 0.75}                       → {'dummy:auc': 0.75}
+    - {'metrics': {'auc': {'value': 0.81}}}      → {'auc': 0.81}
+    """
+    flat = {}
+    if isinstance(report, dict) and 'metrics' in report and not prefix:
+        report = report['metrics']
+    for key, value in (report or {}).items():
+        name = f"{prefix}{key}"
+        if isinstance(value, bool):
+            continue
+        if isinstance(value, (int, float)):
+            flat[name] = float(value)
+        elif isinstance(value, dict):
+            if isinstance(value.get('value'), (int, float)):
+                flat[name] = float(value['value'])
+            else:
+                flat.update(flatten_metrics(value, prefix=f"{name}."))
+    return flat
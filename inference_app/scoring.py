@@ -0,0 +1,72 @@
+"""배치 스코어링 유틸리티
+
+여러 후보 행을 한 번의 엔드포인트 호출로 점수화하기 위한 CSV 직렬화/파싱과
+후보 조합(카테시안 곱) 생성을 NumPy 벡터 연산으로 처리한다.
+"""
+import io
+
+import numpy as np
+
+# 추론 앱이 모델에 보내는 특성 순서
+FEATURE_NAMES = ['user_age', 'ad_position', 'browsing_history', 'time_of_day', 'user_behavior_score']
+
+# SageMaker 실시간 엔드포인트 페이로드 한도(6MB)보다 여유 있게 분할
+MAX_PAYLOAD_BYTES = 5 * 1024 * 1024
+
+
+def to_csv_payload(rows):
+    """2차원 배열 → 헤더 없는 CSV 문자열 (XGBoost text/csv 입력 형식)"""
+    buf = io.StringIO()
+    np.savetxt(buf, np.atleast_2d(rows), delimiter=',', fmt='%.10g')
+    return buf.getvalue()
+
+
+def parse_scores(body):
+    """엔드포인트 응답(줄바꿈 또는 콤마 구분) → float 배열"""
+    text = body.decode('utf-8') if isinstance(body, bytes) else body
+    return np.array(text.replace(',', '\n').split(), dtype=np.float64)
+
+
+def expand_candidates(base, candidates):
+    """기본 특성 벡터와 후보 차원 값들의 카테시안 곱을 행렬로 생성
+
+    base: FEATURE_NAMES 순서의 길이 5 벡터
+    candidates: {특성 이름: 후보 값 리스트}
+    반환: (행렬[n_candidates, 5], 후보 차원 이름 리스트)
+    """
+    dims = [name for name in FEATURE_NAMES if name in candidates]
+    grids = np.meshgrid(*[np.asarray(candidates[name], dtype=np.float64) for name in dims], indexing='ij')
+    n = grids[0].size if grids else 1
+    rows = np.tile(np.asarray(base, dtype=np.float64), (n, 1))
+    for name, grid in zip(dims, grids):
+        rows[:, FEATURE_NAMES.index(name)] = grid.ravel()
+    return rows, dims
+
+
+def score_batch(runtime, endpoint_name, rows, **invoke_kwargs):
+    """행렬 전체를 점수화. 페이로드 한도 내에서는 단 1회 호출
+
+    반환: (점수 배열, 호출 횟수)
+    """
+    rows = np.atleast_2d(rows)
+    payload = to_csv_payload(rows)
+    n_chunks = max(1, -(-len(payload.encode('utf-8')) // MAX_PAYLOAD_BYTES))
+    scores = []
+    for chunk in np.array_split(rows, n_chunks):
+        response = runtime.invoke_endpoint(
+            EndpointName=endpoint_name,
+            ContentType='text/csv',
+            Body=payload if n_chunks == 1 else to_csv_payload(chunk),
+            **invoke_kwargs
+        )
+        scores.append(parse_scores(response['Body'].read()))
+    return np.concatenate(scores), n_chunks
+
+
+def top_k(scores, k):
+    """상위 k개 인덱스 (점수 내림차순). argpartition으로 O(n)"""
+    k = min(k, scores.size)
+    if k <= 0:
+        return np.array([], dtype=np.intp)
+    idx = np.argpartition(-scores, k - 1)[:k]
+    return idx[np.argsort(-scores[idx], kind='stable')]
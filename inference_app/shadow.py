@@ -0,0 +1,121 @@
+"""섀도(챌린저) 모델 스코어링
+
+설정된 비율의 요청에 대해 같은 입력을 두 번째 엔드포인트 변형(TargetVariant) 또는
+로컬 챌린저 모델로 응답 경로 밖에서 점수화하고, 운영 점수와 함께 로그로 남긴다.
+사용자 응답은 섀도 호출을 기다리지 않는다.
+
+챌린저는 다른 학습 실행의 모델 패키지일 수 있으므로 원본 특성을 받아 챌린저 자신의
+특성 변환(encode)으로 인코딩한다. 운영 모델의 인코딩 결과를 재사용하지 않는다.
+"""
+import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from scoring import parse_scores, to_csv_payload
+
+logger = logging.getLogger(__name__)
+shadow_logger = logging.getLogger('shadow')
+
+
+def load_local_challenger(path):
+    """XGBoost 모델 파일 로드 (xgboost 미설치 시 None)"""
+    try:
+        import xgboost as xgb
+    except ImportError:
+        logger.warning("xgboost not installed; local shadow challenger disabled")
+        return None
+    booster = xgb.Booster()
+    booster.load_model(path)
+
+    def predict(rows):
+        return booster.predict(xgb.DMatrix(rows))
+
+    return predict
+
+
+class ShadowScorer:
+    """운영 응답과 분리된 스레드 풀에서 챌린저 점수 계산"""
+
+    def __init__(self, runtime, endpoint_name, variant_name='', local_predict=None,
+                 fraction=0.0, max_workers=2, max_pending=64, encode=None):
+        self._runtime = runtime
+        # encode(rows, data) → 챌린저 입력 행렬 (없으면 rows 를 그대로 보냄)
+        self._encode = encode
+        self._endpoint_name = endpoint_name
+        self._variant_name = variant_name
+        self._local_predict = local_predict
+        self.fraction = fraction
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='shadow')
+        # 대기 작업 수 상한: 섀도가 밀리면 운영 경로에 메모리/스레드 부담을 주지 않고 버림
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self.submitted = 0
+        self.dropped = 0
+        self.failed = 0
+
+    @property
+    def enabled(self):
+        return self.fraction > 0 and bool(self._variant_name or self._local_predict)
+
+    def maybe_submit(self, rows, primary_scores, context=None, data=None):
+        """fraction 확률로 섀도 스코어링 예약. 즉시 반환
+
+        rows: 원본 특성 행렬, data: 요청 본문(attributes 등, 인코딩에 사용)
+        """
+        if not self.enabled or random.random() >= self.fraction:
+            return False
+        if not self._slots.acquire(blocking=False):
+            self.dropped += 1
+            return False
+        self.submitted += 1
+        try:
+            self._executor.submit(self._score, rows, list(primary_scores), context or {}, data)
+        except RuntimeError:
+            self._slots.release()
+            return False
+        return True
+
+    def _score(self, rows, primary_scores, context, data):
+        start = time.monotonic()
+        try:
+            if self._encode is not None:
+                rows = self._encode(rows, data)
+            if self._variant_name:
+                response = self._runtime.invoke_endpoint(
+                    EndpointName=self._endpoint_name,
+                    TargetVariant=self._variant_name,
+                    ContentType='text/csv',
+                    Body=to_csv_payload(rows)
+                )
+                shadow_scores = parse_scores(response['Body'].read()).tolist()
+                source = f"variant:{self._variant_name}"
+            else:
+                shadow_scores = [float(x) for x in self._local_predict(rows)]
+                source = 'local'
+            # 오프라인 비교용 구조화 로그 (CloudWatch Logs Insights 에서 필터링)
+            shadow_logger.info(json.dumps({
+                'event': 'shadow_score',
+                'source': source,
+                'primary': primary_scores,
+                'shadow': shadow_scores,
+                'shadow_latency_ms': round((time.monotonic() - start) * 1000, 2),
+                **context,
+            }))
+        except Exception as e:
+            self.failed += 1
+            logger.warning(f"Shadow scoring failed: {e}")
+        finally:
+            self._slots.release()
+
+    def stats(self):
+        return {
+            'enabled': self.enabled,
+            'fraction': self.fraction,
+            'variant': self._variant_name or None,
+            'local_challenger': self._local_predict is not None,
+            'submitted': self.submitted,
+            'dropped': self.dropped,
+            'failed': self.failed,
+        }
@@ -0,0 +1,170 @@
+// 클릭 카운터
+let clickCounts = {
+    total: 0,
+    header: 0,
+    sidebar: 0,
+    content: 0,
+    bottom: 0,
+    popup: 0
+};
+
+// 세션 ID 생성
+function generateSessionId() {
+    return 'session_' + Math.random().toString(36).substr(2, 9) + '_' + Date.now();
+}
+
+let sessionId = generateSessionId();
+
+// 광고 클릭 추적 함수
+function trackAdClick(position) {
+    const userAge = parseInt(document.getElementById('user_age').value) || 25;
+    // 관심 분야 코드 1~5 (학습 어휘 매핑은 변환 아티팩트의 value_maps)
+    const browsingHistory = parseInt(document.getElementById('browsing_history').value) || 1;
+    const timeOfDay = parseInt(document.getElementById('time_of_day').value) || 14;
+    const userBehaviorScore = parseFloat(document.getElementById('user_behavior_score').value) || 65.5;
+
+    // 먼저 모델로 예측 수행
+    const features = [userAge, position, browsingHistory, timeOfDay, userBehaviorScore];
+    // 특성 벡터에 없는 학습 특성: 성별(남성 1), 디바이스(모바일 1)
+    const attributes = {
+        gender: parseInt(document.getElementById('gender').value),
+        device: /mobile|android|iphone/i.test(navigator.userAgent) ? 1 : 0
+    };
+
+    // 실제 클릭 데이터 전송 (클릭됨 = 1)
+    const clickData = {
+        features: features,
+        attributes: attributes,
+        actual_click: 1,  // 실제로 클릭했으므로 1
+        session_id: sessionId,
+        timestamp: new Date().toISOString()
+    };
+
+    // 서버로 클릭 데이터 전송
+    fetch('/api/track-click', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify(clickData)
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            console.log('클릭 데이터 전송 성공:', data);
+
+            // 클릭 카운트 업데이트
+            clickCounts.total++;
+            switch(position) {
+                case 1: clickCounts.header++; break;
+                case 2: clickCounts.sidebar++; break;
+                case 3: clickCounts.content++; break;
+                case 4: clickCounts.bottom++; break;
+                case 5: clickCounts.popup++; break;
+            }
+            updateClickDisplay();
+
+            // 클릭 애니메이션 효과
+            showClickFeedback(position, data.prediction_probability);
+        } else {
+            console.error('클릭 데이터 전송 실패:', data.error);
+        }
+    })
+    .catch(error => {
+        console.error('네트워크 오류:', error);
+    });
+}
+
+// 클릭 디스플레이 업데이트
+function updateClickDisplay() {
+    document.getElementById('total-clicks').textContent = clickCounts.total;
+    document.getElementById('header-clicks').textContent = clickCounts.header;
+    document.getElementById('sidebar-clicks').textContent = clickCounts.sidebar;
+    document.getElementById('content-clicks').textContent = clickCounts.content;
+    document.getElementById('bottom-clicks').textContent = clickCounts.bottom;
+    document.getElementById('popup-clicks').textContent = clickCounts.popup;
+}
+
+// 클릭 피드백 표시
+function showClickFeedback(position, probability) {
+    const positionNames = {
+        1: '상단 헤더',
+        2: '사이드바', 
+        3: '본문 중간',
+        4: '본문 하단',
+        5: '팝업'
+    };
+
+    const feedback = document.createElement('div');
+    feedback.style.cssText = `
+        position: fixed;
+        top: 50%;
+        left: 50%;
+        transform: translate(-50%, -50%);
+        background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
+        color: white;
+        padding: 20px;
+        border-radius: 10px;
+        box-shadow: 0 10px 30px rgba(0,0,0,0.3);
+        z-index: 10000;
+        text-align: center;
+        min-width: 300px;
+    `;
+
+    feedback.innerHTML = `
+        <h3>🎯 광고 클릭 감지!</h3>
+        <p><strong>위치:</strong> ${positionNames[position]}</p>
+        <p><strong>예측 확률:</strong> ${(probability * 100).toFixed(1)}%</p>
+        <p><strong>실제 결과:</strong> 클릭됨 ✅</p>
+        <p style="font-size: 12px; margin-top: 15px; opacity: 0.8;">
+            데이터가 Feature Store에 저장되었습니다
+        </p>
+    `;
+
+    document.body.appendChild(feedback);
+
+    // 3초 후 제거
+    setTimeout(() => {
+        document.body.removeChild(feedback);
+    }, 3000);
+}
+
+// 팝업 닫기
+function closePopup() {
+    document.getElementById('popup-ad').style.display = 'none';
+}
+
+// 팝업 자동 표시 (10초 후)
+setTimeout(() => {
+    const popup = document.getElementById('popup-ad');
+    popup.style.display = 'block';
+
+    // 팝업 애니메이션
+    popup.style.transform = 'scale(0.8)';
+    popup.style.opacity = '0';
+    setTimeout(() => {
+        popup.style.transition = 'all 0.3s ease';
+        popup.style.transform = 'scale(1)';
+        popup.style.opacity = '1';
+    }, 100);
+}, 10000);
+
+// 현재 시간 자동 설정
+function updateCurrentTime() {
+    const now = new Date();
+    document.getElementById('time_of_day').value = now.getHours();
+}
+
+// 페이지 로드 시 현재 시간 설정
+window.addEventListener('load', function() {
+    updateCurrentTime();
+
+    // 환영 메시지
+    setTimeout(() => {
+        console.log('🚀 실제 광고 클릭 추적 시스템이 활성화되었습니다!');
+        console.log('📊 사용자의 광고 클릭 행동이 실시간으로 Feature Store에 저장됩니다.');
+    }, 1000);
+});
+
+// 1분마다 시간 업데이트
+setInterval(updateCurrentTime, 60000);
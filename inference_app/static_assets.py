@@ -0,0 +1,65 @@
+"""사전 렌더링/사전 압축 정적 자산
+
+프로세스 시작 시 한 번만 페이지를 렌더링하고 gzip 으로 압축해 둔 바이트와
+강한 ETag(sha256)를 메모리에 보관한다. 요청 시에는 헤더 비교와 바이트 전송만 한다.
+"""
+import gzip
+import hashlib
+import os
+
+from flask import Response
+
+
+class PrecompressedAsset:
+    """본문 바이트 + gzip 사본 + 강한 ETag"""
+
+    def __init__(self, body, content_type, cache_control):
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        self.body = body
+        self.gzipped = gzip.compress(body, compresslevel=9, mtime=0)
+        self.content_type = content_type
+        self.cache_control = cache_control
+        self.digest = hashlib.sha256(body).hexdigest()
+        self.etag = f'"{self.digest[:32]}"'
+
+    def response(self, request):
+        headers = {
+            'ETag': self.etag,
+            'Cache-Control': self.cache_control,
+            'Vary': 'Accept-Encoding',
+        }
+        if self.etag in request.headers.get('If-None-Match', ''):
+            return Response(status=304, headers=headers)
+        if 'gzip' in request.headers.get('Accept-Encoding', ''):
+            headers['Content-Encoding'] = 'gzip'
+            body = self.gzipped
+        else:
+            body = self.body
+        return Response(body, status=200, headers=headers, content_type=self.content_type)
+
+
+class AssetBundle:
+    """static/ 파일을 해시 버전 URL(/static/<name>.<hash>.<ext>)로 노출"""
+
+    def __init__(self, static_dir, url_prefix='/static'):
+        self.url_prefix = url_prefix
+        self._by_url_name = {}
+        self.urls = {}
+        types = {'.css': 'text/css; charset=utf-8', '.js': 'application/javascript; charset=utf-8'}
+        for filename in sorted(os.listdir(static_dir)):
+            stem, ext = os.path.splitext(filename)
+            if ext not in types:
+                continue
+            with open(os.path.join(static_dir, filename), 'rb') as f:
+                asset = PrecompressedAsset(
+                    f.read(), types[ext],
+                    # 내용 해시가 URL 에 포함되므로 브라우저가 영구 캐시해도 안전
+                    'public, max-age=31536000, immutable',
+                )
+            versioned = f"{stem}.{asset.digest[:12]}{ext}"
+            self._by_url_name[versioned] = asset
+            self.urls[filename] = f"{url_prefix}/{versioned}"
+
+    def get(self, versioned_name):
+        return self._by_url_name.get(versioned_name)
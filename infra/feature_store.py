@@ -134,10 +134,18 @@ class UserInteractionFeatureGroup(Construct):
             sagemaker.CfnFeatureGroup.FeatureDefinitionProperty(
                 feature_name="predicted_class", feature_type="Integral"
             ),
+            # 실제 클릭 라벨 (request_type='actual_click' 행)
+            sagemaker.CfnFeatureGroup.FeatureDefinitionProperty(
+                feature_name="actual_click", feature_type="Integral"
+            ),
             # 세션 정보
             sagemaker.CfnFeatureGroup.FeatureDefinitionProperty(
                 feature_name="session_id", feature_type="String"
             ),
+            # 행동 집계 키 (user_id, 없으면 session_id). 행동 집계 Feature Group 의 레코드 식별자와 같음
+            sagemaker.CfnFeatureGroup.FeatureDefinitionProperty(
+                feature_name="user_key", feature_type="String"
+            ),
             sagemaker.CfnFeatureGroup.FeatureDefinitionProperty(
                 feature_name="request_type", feature_type="String"  # 'prediction' 또는 'chat'
             ),
@@ -192,3 +200,85 @@ class UserInteractionFeatureGroup(Construct):
             resource="feature-group",
             resource_name=feature_group_name,
         )
+
+
+class UserBehaviorFeatureGroup(Construct):
+    """사용자 행동 집계 체크포인트 전용 Feature Group
+
+    추론 앱이 주기적으로 기록하는 사용자별 윈도 집계(user_behavior_score 등)를 상호작용
+    Feature Group 과 분리해 저장한다. 상호작용 오프라인 스토어를 읽는 소비자(재생, 추출,
+    드리프트)는 실제 요청/라벨 행만 보게 되고, 추출 단계는 이 그룹의 이력으로 as-of 조인한다.
+    """
+    def __init__(
+        self,
+        scope: Construct,
+        id: str,
+        *,
+        feature_group_name: str,
+        s3_uri: str,
+        role: iam.IRole,
+        kms_key_arn: str | None = None,
+        record_identifier_name: str = "user_key",
+        event_time_name: str = "event_time",
+    ):
+        super().__init__(scope, id)
+
+        feature_definitions = [
+            sagemaker.CfnFeatureGroup.FeatureDefinitionProperty(
+                feature_name=record_identifier_name, feature_type="String"
+            ),
+            sagemaker.CfnFeatureGroup.FeatureDefinitionProperty(
+                feature_name=event_time_name, feature_type="String"
+            ),
+            sagemaker.CfnFeatureGroup.FeatureDefinitionProperty(
+                feature_name="user_behavior_score", feature_type="Fractional"
+            ),
+            sagemaker.CfnFeatureGroup.FeatureDefinitionProperty(
+                feature_name="user_impressions", feature_type="Integral"
+            ),
+            sagemaker.CfnFeatureGroup.FeatureDefinitionProperty(
+                feature_name="user_clicks", feature_type="Integral"
+            ),
+            sagemaker.CfnFeatureGroup.FeatureDefinitionProperty(
+                feature_name="user_ctr", feature_type="Fractional"
+            ),
+        ]
+
+        offline_cfg = {
+            "S3StorageConfig": {"S3Uri": s3_uri},
+        }
+        if kms_key_arn:
+            offline_cfg["S3StorageConfig"]["KmsKeyId"] = kms_key_arn
+
+        online_cfg = {
+            "EnableOnlineStore": True,
+        }
+        if kms_key_arn:
+            online_cfg["SecurityConfig"] = {"KmsKeyId": kms_key_arn}
+
+        self.feature_group = sagemaker.CfnFeatureGroup(
+            self,
+            "UserBehaviorFeatureGroup",
+            feature_group_name=feature_group_name,
+            record_identifier_feature_name=record_identifier_name,
+            event_time_feature_name=event_time_name,
+            feature_definitions=feature_definitions,
+            offline_store_config=offline_cfg,
+            online_store_config=online_cfg,
+            role_arn=role.role_arn,
+        )
+
+        self.feature_group.node.add_dependency(role)
+        try:
+            default_policy = role.node.try_find_child("DefaultPolicy")
+            if default_policy is not None:
+                self.feature_group.node.add_dependency(default_policy)
+        except Exception:
+            pass
+
+        self.feature_group_name = feature_group_name
+        self.feature_group_arn = Stack.of(self).format_arn(
+            service="sagemaker",
+            resource="feature-group",
+            resource_name=feature_group_name,
+        )
@@ -79,6 +79,7 @@ class SageMakerCiCd(Construct):
         use_sm_pipeline: bool = False,
         use_feature_store: bool = False,
         feature_group_name: str = "",
+        shadow_variant_name: str = "",
     ):
         super().__init__(scope, id)
 
@@ -270,6 +271,7 @@ class SageMakerCiCd(Construct):
                 "ENDPOINT_NAME": codebuild.BuildEnvironmentVariable(value=endpoint_name),
                 "SM_EXEC_ROLE_ARN": codebuild.BuildEnvironmentVariable(value=sm_exec_role_arn),
                 "SM_INSTANCE_TYPE": codebuild.BuildEnvironmentVariable(value=sm_instance_type),
+                "SHADOW_VARIANT_NAME": codebuild.BuildEnvironmentVariable(value=shadow_variant_name),
             },
             build_spec=codebuild.BuildSpec.from_object(
                 {
@@ -351,12 +353,28 @@ class SageMakerCiCd(Construct):
                                 "mname=f'{GROUP}-model-'+ts\n"
                                 "cfg=f'{GROUP}-cfg-'+ts\n"
                                 "sm.create_model(ModelName=mname, ExecutionRoleArn=ROLE, Containers=[{'ModelPackageName': mp}])\n"
+                                "variants=[{'ModelName': mname,'VariantName':'AllTraffic','InitialInstanceCount':1,'InstanceType':ITYPE,'InitialVariantWeight':1.0}]\n"
+                                "# Optional shadow variant: newest non-rejected package registered after the deployed one.\n"
+                                "# Weight 0 keeps it out of normal routing; the app reaches it only via TargetVariant.\n"
+                                "SHADOW=os.environ.get('SHADOW_VARIANT_NAME','')\n"
+                                "if SHADOW:\n"
+                                "  deployed_at=sm.describe_model_package(ModelPackageName=mp)['CreationTime']\n"
+                                "  recent=sm.list_model_packages(ModelPackageGroupName=GROUP, SortBy='CreationTime', SortOrder='Descending', MaxResults=10)['ModelPackageSummaryList']\n"
+                                "  challengers=[p for p in recent if p['CreationTime']>deployed_at and p['ModelApprovalStatus']!='Rejected']\n"
+                                "  if challengers:\n"
+                                "    cmp=challengers[0]['ModelPackageArn']\n"
+                                "    cname=f'{GROUP}-shadow-'+ts\n"
+                                "    sm.create_model(ModelName=cname, ExecutionRoleArn=ROLE, Containers=[{'ModelPackageName': cmp}])\n"
+                                "    variants.append({'ModelName': cname,'VariantName':SHADOW,'InitialInstanceCount':1,'InstanceType':ITYPE,'InitialVariantWeight':0.0})\n"
+                                "    print('Shadow variant', SHADOW, 'uses', cmp)\n"
+                                "  else:\n"
+                                "    print('No challenger package newer than', mp, '- deploying without shadow variant')\n"
                                 "try:\n"
                                 "  sm.describe_endpoint(EndpointName=EP)\n"
-                                "  sm.create_endpoint_config(EndpointConfigName=cfg, ProductionVariants=[{'ModelName': mname,'VariantName':'AllTraffic','InitialInstanceCount':1,'InstanceType':ITYPE,'InitialVariantWeight':1.0}])\n"
+                                "  sm.create_endpoint_config(EndpointConfigName=cfg, ProductionVariants=variants)\n"
                                 "  sm.update_endpoint(EndpointName=EP, EndpointConfigName=cfg)\n"
                                 "except sm.exceptions.ClientError:\n"
-                                "  sm.create_endpoint_config(EndpointConfigName=cfg, ProductionVariants=[{'ModelName': mname,'VariantName':'AllTraffic','InitialInstanceCount':1,'InstanceType':ITYPE,'InitialVariantWeight':1.0}])\n"
+                                "  sm.create_endpoint_config(EndpointConfigName=cfg, ProductionVariants=variants)\n"
                                 "  sm.create_endpoint(EndpointName=EP, EndpointConfigName=cfg)\n"
                                 "print('DEPLOYED to', EP)\n"
                                 "PY"
@@ -0,0 +1,37 @@
+"""광고 클릭 예측 클라이언트 SDK
+
+SageMaker 엔드포인트 직접 호출(EndpointClient)과 Flask 추론 서비스 호출(ServiceClient)을
+동기/asyncio 양쪽으로 제공한다. 연결 풀 재사용, 자동 배치 분할과 병렬 전송,
+지터가 있는 재시도, NumPy/pandas 기반 CSV 직렬화를 공통으로 처리한다.
+
+엔드포인트 모델은 학습 때 Preprocess 단계가 적합한 변환(transform.json)으로 인코딩된
+특성을 받는다. 등록된 모델 패키지의 FeatureTransformUri 아티팩트를 transform 으로 넘기면
+원본 특성 DataFrame 을 그대로 보낼 수 있다 (없으면 호출자가 인코딩한 행렬을 전달).
+
+    from mlops_client import EndpointClient, load_transform
+    transform = load_transform(transform_uri, boto3.client("s3"))
+    client = EndpointClient("my-mlops-dev-endpoint", transform=transform)
+    scores = client.predict(df[["gender", "age", "device", "hour", "ad_position", "browsing_history"]])
+"""
+from .aio import AsyncEndpointClient, AsyncServiceClient
+from .endpoint import EndpointClient
+from .payload import chunk_rows, parse_scores, to_csv_payload
+from .retry import RetryPolicy
+from .service import ServiceClient, ServiceError
+from .transform import FeatureTransform, load_transform, package_transform_uri, variant_model_package
+
+__all__ = [
+    'AsyncEndpointClient',
+    'AsyncServiceClient',
+    'EndpointClient',
+    'FeatureTransform',
+    'RetryPolicy',
+    'ServiceClient',
+    'ServiceError',
+    'chunk_rows',
+    'load_transform',
+    'package_transform_uri',
+    'parse_scores',
+    'to_csv_payload',
+    'variant_model_package',
+]
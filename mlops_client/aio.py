@@ -0,0 +1,72 @@
+"""asyncio 인터페이스
+
+boto3/requests 는 블로킹 I/O 이므로 동기 클라이언트의 연결 풀을 그대로 공유하면서
+asyncio.to_thread 로 오프로드한다. 동시 요청 수는 세마포어로 제한한다.
+"""
+import asyncio
+
+import numpy as np
+
+from .endpoint import EndpointClient
+from .payload import as_matrix, chunk_rows
+from .service import ServiceClient
+
+
+class AsyncEndpointClient:
+    def __init__(self, endpoint_name, max_concurrency=8, **kwargs):
+        self._client = EndpointClient(endpoint_name, max_workers=max_concurrency, **kwargs)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def invoke(self, rows, **invoke_kwargs):
+        async with self._semaphore:
+            return await asyncio.to_thread(self._client.invoke, rows, **invoke_kwargs)
+
+    async def predict(self, rows, **invoke_kwargs):
+        chunks = chunk_rows(self._client.encode(rows), max_rows=self._client.batch_size)
+        if not chunks:
+            return np.array([], dtype=np.float64)
+        scores = await asyncio.gather(*(self.invoke(c, **invoke_kwargs) for c in chunks))
+        return np.concatenate(scores)
+
+    async def close(self):
+        await asyncio.to_thread(self._client.close)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+class AsyncServiceClient:
+    def __init__(self, base_url, max_concurrency=8, **kwargs):
+        self._client = ServiceClient(base_url, max_workers=max_concurrency, **kwargs)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _call(self, fn, *args, **kwargs):
+        async with self._semaphore:
+            return await asyncio.to_thread(fn, *args, **kwargs)
+
+    async def predict(self, features, **kwargs):
+        return await self._call(self._client.predict, features, **kwargs)
+
+    async def track_click(self, features, actual_click=1, session_id=None):
+        return await self._call(self._client.track_click, features, actual_click, session_id)
+
+    async def rank(self, features, candidates, top_k=5):
+        return await self._call(self._client.rank, features, candidates, top_k)
+
+    async def predict_many(self, rows):
+        return await asyncio.gather(*(self.predict(row) for row in as_matrix(rows).tolist()))
+
+    async def predict_records(self, record_ids, batch_size=100):
+        return await self._call(self._client.predict_records, record_ids, batch_size)
+
+    async def close(self):
+        await asyncio.to_thread(self._client.close)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
@@ -0,0 +1,122 @@
+"""SageMaker 엔드포인트 직접 호출 클라이언트"""
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+import numpy as np
+from botocore.config import Config
+from botocore.exceptions import ClientError, ConnectionError as BotoConnectionError, ReadTimeoutError
+
+from .payload import chunk_rows, parse_scores, to_csv_payload
+from .retry import RetryPolicy
+
+RETRYABLE_ERROR_CODES = {
+    'ThrottlingException',
+    'ServiceUnavailable',
+    'InternalFailure',
+    'ModelNotReadyException',
+}
+
+
+def is_retryable(exc):
+    if isinstance(exc, (BotoConnectionError, ReadTimeoutError)):
+        return True
+    if isinstance(exc, ClientError):
+        error = exc.response.get('Error', {})
+        status = exc.response.get('ResponseMetadata', {}).get('HTTPStatusCode', 0)
+        return error.get('Code') in RETRYABLE_ERROR_CODES or status in (429, 502, 503, 504)
+    return False
+
+
+class EndpointClient:
+    """invoke_endpoint 배치 스코어링
+
+    큰 입력은 chunk_rows 로 분할해 max_workers 개의 요청을 동시에 보낸다(파이프라이닝).
+    boto3 클라이언트는 스레드 안전하므로 하나를 공유하고, 연결 풀 크기를 동시 요청 수에
+    맞춰 keep-alive 연결을 재사용한다.
+
+    엔드포인트 모델은 Preprocess 단계의 변환 아티팩트로 인코딩된 특성을 입력받는다.
+    transform(mlops_client.transform.load_transform 결과처럼
+    transform_columns(columns, n) 를 가진 객체)을 주면 predict 가 원본 특성(컬럼 이름이 있는
+    DataFrame, {이름: 시퀀스}, dict 리스트)을 먼저 인코딩한다. 없으면 호출자가 인코딩한 행렬을 보내야 한다.
+    """
+
+    def __init__(self, endpoint_name, region_name='ap-northeast-2', batch_size=1000, max_workers=8,
+                 retry=None, runtime_client=None, timeout=60, transform=None):
+        self.endpoint_name = endpoint_name
+        self.transform = transform
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.retry = retry or RetryPolicy()
+        self._runtime = runtime_client or boto3.client(
+            'sagemaker-runtime',
+            region_name=region_name,
+            config=Config(
+                max_pool_connections=max(10, max_workers),
+                read_timeout=timeout,
+                tcp_keepalive=True,
+                # 재시도는 RetryPolicy 가 담당 (중복 재시도 방지)
+                retries={'total_max_attempts': 1, 'mode': 'standard'},
+            ),
+        )
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='endpoint-client')
+
+    def encode(self, rows):
+        """원본 특성 → 모델 입력 행렬 (transform 이 없으면 그대로 반환)"""
+        if self.transform is None:
+            return rows
+        if hasattr(rows, 'to_dict') and hasattr(rows, 'columns'):
+            columns, n = {name: rows[name].tolist() for name in rows.columns}, len(rows)
+        elif isinstance(rows, dict):
+            columns = {name: list(values) for name, values in rows.items()}
+            n = len(next(iter(columns.values()), []))
+        elif isinstance(rows, (list, tuple)) and all(isinstance(r, dict) for r in rows):
+            names = list(dict.fromkeys(name for r in rows for name in r))
+            columns, n = {name: [r.get(name) for r in rows] for name in names}, len(rows)
+        else:
+            raise ValueError('transform 사용 시 rows 는 컬럼 이름이 있는 원본 특성(DataFrame/dict/dict 리스트)이어야 합니다')
+        return self.transform.transform_columns(columns, n)
+
+    def invoke(self, rows, **invoke_kwargs):
+        """한 번의 invoke_endpoint (분할 없음, 인코딩된 행렬) → 점수 배열"""
+        payload = to_csv_payload(rows)
+
+        def call():
+            response = self._runtime.invoke_endpoint(
+                EndpointName=self.endpoint_name,
+                ContentType='text/csv',
+                Accept='text/csv',
+                Body=payload,
+                **invoke_kwargs
+            )
+            return parse_scores(response['Body'].read())
+
+        return self.retry.call(call, is_retryable)
+
+    def predict(self, rows, **invoke_kwargs):
+        """임의 크기 입력 → 입력 순서대로 정렬된 점수 배열
+
+        invoke_kwargs 는 그대로 전달된다 (예: TargetVariant='challenger').
+        """
+        chunks = chunk_rows(self.encode(rows), max_rows=self.batch_size)
+        if not chunks:
+            return np.array([], dtype=np.float64)
+        if len(chunks) == 1:
+            scores = [self.invoke(chunks[0], **invoke_kwargs)]
+        else:
+            scores = list(self._executor.map(lambda c: self.invoke(c, **invoke_kwargs), chunks))
+        for chunk, chunk_scores in zip(chunks, scores):
+            if chunk_scores.size != chunk.shape[0]:
+                raise ValueError(f'응답 점수 개수 불일치: {chunk_scores.size} != {chunk.shape[0]}')
+        return np.concatenate(scores)
+
+    def predict_classes(self, rows, threshold=0.5, **invoke_kwargs):
+        return (self.predict(rows, **invoke_kwargs) >= threshold).astype(np.int64)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
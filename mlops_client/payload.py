@@ -0,0 +1,43 @@
+"""text/csv 페이로드 직렬화/파싱 (NumPy 벡터 연산)"""
+import io
+
+import numpy as np
+
+# SageMaker 실시간 엔드포인트 페이로드 한도(6MB)보다 여유 있게 분할
+MAX_PAYLOAD_BYTES = 5 * 1024 * 1024
+
+
+def as_matrix(rows):
+    """DataFrame / ndarray / 리스트 → float64 2차원 배열"""
+    if hasattr(rows, 'to_numpy'):
+        rows = rows.to_numpy(dtype=np.float64)
+    return np.atleast_2d(np.asarray(rows, dtype=np.float64))
+
+
+def to_csv_payload(rows):
+    """2차원 배열 → 헤더 없는 CSV 문자열 (XGBoost text/csv 입력 형식)"""
+    buf = io.StringIO()
+    np.savetxt(buf, as_matrix(rows), delimiter=',', fmt='%.10g')
+    return buf.getvalue()
+
+
+def parse_scores(body):
+    """엔드포인트 응답(줄바꿈 또는 콤마 구분) → float 배열"""
+    text = body.decode('utf-8') if isinstance(body, bytes) else body
+    return np.array(text.replace(',', '\n').split(), dtype=np.float64)
+
+
+def chunk_rows(rows, max_rows=1000, max_bytes=MAX_PAYLOAD_BYTES):
+    """행렬을 행 수/페이로드 크기 한도 안의 조각으로 분할 (순서 유지)
+
+    페이로드 크기는 앞쪽 표본 행의 평균 직렬화 길이로 추정한다.
+    """
+    matrix = as_matrix(rows)
+    n = matrix.shape[0]
+    if n == 0:
+        return []
+    sample = matrix[:min(n, 100)]
+    bytes_per_row = max(1, len(to_csv_payload(sample)) / sample.shape[0])
+    # 추정 오차를 감안해 한도의 80%만 사용
+    rows_per_chunk = max(1, min(max_rows, int(max_bytes * 0.8 / bytes_per_row)))
+    return [matrix[i:i + rows_per_chunk] for i in range(0, n, rows_per_chunk)]
@@ -0,0 +1,32 @@
+"""지수 백오프 + full jitter 재시도"""
+import random
+import time
+
+
+class RetryPolicy:
+    """retryable(exc) 가 참인 예외에 대해 최대 max_attempts 회까지 재시도
+
+    대기 시간은 [0, min(max_delay, base_delay * 2^attempt)] 구간의 균등 난수(full jitter)로,
+    여러 배치 작업이 동시에 실패해도 재시도가 한 시점에 몰리지 않는다.
+    예외에 retry_after 속성(초)이 있으면 그 값을 하한으로 사용한다.
+    """
+
+    def __init__(self, max_attempts=4, base_delay=0.1, max_delay=5.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt, retry_after=None):
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after:
+            backoff = max(backoff, min(float(retry_after), self.max_delay))
+        return backoff
+
+    def call(self, fn, retryable):
+        for attempt in range(self.max_attempts):
+            try:
+                return fn()
+            except Exception as e:
+                if attempt == self.max_attempts - 1 or not retryable(e):
+                    raise
+                time.sleep(self.delay(attempt, getattr(e, 'retry_after', None)))
@@ -0,0 +1,131 @@
+"""Flask 추론 서비스(inference_app) 클라이언트"""
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .payload import as_matrix
+from .retry import RetryPolicy
+
+RETRYABLE_STATUS = {429, 502, 503, 504}
+
+
+class ServiceError(Exception):
+    """서비스가 오류 상태 코드를 반환한 경우 (429 는 retry_after 포함)"""
+
+    def __init__(self, status_code, message, retry_after=None):
+        super().__init__(f"HTTP {status_code}: {message}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def is_retryable(exc):
+    if isinstance(exc, ServiceError):
+        return exc.status_code in RETRYABLE_STATUS
+    return isinstance(exc, (requests.ConnectionError, requests.Timeout))
+
+
+class ServiceClient:
+    """keep-alive 연결 풀을 공유하는 requests.Session 기반 클라이언트
+
+    다건 요청(predict_many / predict_records)은 max_workers 개까지 동시에 보내고
+    입력 순서대로 결과를 돌려준다. 429 응답의 Retry-After 는 재시도 대기 하한으로 쓴다.
+    """
+
+    def __init__(self, base_url, max_workers=8, timeout=30, retry=None, session=None):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.retry = retry or RetryPolicy()
+        self._session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='service-client')
+
+    def _request(self, method, path, **kwargs):
+        def call():
+            response = self._session.request(method, self.base_url + path, timeout=self.timeout, **kwargs)
+            if response.status_code >= 400:
+                try:
+                    message = response.json().get('error', response.text)
+                except ValueError:
+                    message = response.text
+                retry_after = response.headers.get('Retry-After')
+                raise ServiceError(response.status_code, message, float(retry_after) if retry_after else None)
+            return response.json()
+
+        return self.retry.call(call, is_retryable)
+
+    # ----- 단건 API -----
+
+    def predict(self, features, session_id=None, user_id=None, device=None):
+        """/api/predict. features 는 4개(행동 점수 서버 계산) 또는 5개 값"""
+        body = {'features': [float(x) for x in features]}
+        for key, value in (('session_id', session_id), ('user_id', user_id), ('device', device)):
+            if value is not None:
+                body[key] = value
+        return self._request('POST', '/api/predict', json=body)
+
+    def track_click(self, features, actual_click=1, session_id=None):
+        body = {'features': [float(x) for x in features], 'actual_click': int(actual_click)}
+        if session_id is not None:
+            body['session_id'] = session_id
+        return self._request('POST', '/api/track-click', json=body)
+
+    def rank(self, features, candidates, top_k=5):
+        """/api/rank. candidates = {특성 이름: 후보 값 리스트}"""
+        return self._request('POST', '/api/rank', json={
+            'features': [float(x) for x in features],
+            'candidates': {k: list(v) for k, v in candidates.items()},
+            'top_k': top_k,
+        })
+
+    def models(self, **params):
+        return self._request('GET', '/api/models', params=params)
+
+    def stats(self):
+        return self._request('GET', '/api/stats')
+
+    def ready(self):
+        try:
+            self._request('GET', '/readyz')
+            return True
+        except ServiceError:
+            return False
+
+    # ----- 다건 API -----
+
+    def predict_many(self, rows, session_ids=None):
+        """특성 행렬(DataFrame/ndarray) 각 행을 동시 요청으로 예측 → 응답 리스트 (입력 순서)"""
+        matrix = as_matrix(rows)
+        session_ids = session_ids if session_ids is not None else [None] * matrix.shape[0]
+        return list(self._executor.map(
+            lambda args: self.predict(args[0], session_id=args[1]),
+            zip(matrix.tolist(), session_ids),
+        ))
+
+    def predict_records(self, record_ids, batch_size=100):
+        """온라인 스토어 레코드 ID 일괄 예측. batch_size 단위로 나눠 동시 요청 → 예측 리스트"""
+        record_ids = [str(r) for r in record_ids]
+        batches = [record_ids[i:i + batch_size] for i in range(0, len(record_ids), batch_size)]
+        results = self._executor.map(
+            lambda batch: self._request('POST', '/api/predict', json={'record_ids': batch}),
+            batches,
+        )
+        by_id = {}
+        for result in results:
+            for prediction in result.get('predictions', []):
+                by_id[prediction['record_id']] = prediction
+        return [by_id.get(r, {'record_id': r, 'success': False, 'error': 'missing from response'})
+                for r in record_ids]
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
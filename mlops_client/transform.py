@@ -0,0 +1,143 @@
+"""학습 파이프라인과 동일한 특성 변환 (Preprocess 단계의 transform.json 적용)
+
+파이프라인 03_preprocess 가 학습 분할에서 적합해 모델 산출물 옆에 저장한 아티팩트를
+그대로 읽어, 원본 특성을 학습 때와 같은 규칙(결측 대체, 구간화, 범주 코드, 교차)으로
+인코딩한다. 단건은 순수 파이썬 dict/bisect 조회, 배치는 NumPy 벡터 연산으로 처리한다.
+SDK(EndpointClient)와 추론 앱(inference_app/feature_transform.py)이 함께 사용한다.
+"""
+import bisect
+import json
+import math
+from urllib.parse import urlparse
+
+import numpy as np
+
+
+def load_transform(uri, s3_client=None):
+    """s3://... 또는 로컬 경로의 변환 아티팩트 → FeatureTransform"""
+    if uri.startswith('s3://'):
+        parsed = urlparse(uri)
+        body = s3_client.get_object(Bucket=parsed.netloc, Key=parsed.path.lstrip('/'))['Body'].read()
+        return FeatureTransform(json.loads(body))
+    with open(uri) as f:
+        return FeatureTransform(json.load(f))
+
+
+def variant_model_package(sm_client, endpoint_name, variant_name=None):
+    """엔드포인트 변형(없으면 첫 변형)의 모델을 만든 레지스트리 패키지 ARN (패키지 모델이 아니면 None)"""
+    endpoint = sm_client.describe_endpoint(EndpointName=endpoint_name)
+    config = sm_client.describe_endpoint_config(EndpointConfigName=endpoint['EndpointConfigName'])
+    variants = config['ProductionVariants']
+    if variant_name:
+        variants = [v for v in variants if v['VariantName'] == variant_name]
+        if not variants:
+            raise ValueError(f"endpoint {endpoint_name} has no variant {variant_name}")
+    model = sm_client.describe_model(ModelName=variants[0]['ModelName'])
+    containers = model.get('Containers') or [model.get('PrimaryContainer') or {}]
+    return containers[0].get('ModelPackageName')
+
+
+def package_transform_uri(sm_client, model_package_arn):
+    """모델 패키지의 CustomerMetadataProperties.FeatureTransformUri (없으면 None)"""
+    desc = sm_client.describe_model_package(ModelPackageName=model_package_arn)
+    return (desc.get('CustomerMetadataProperties') or {}).get('FeatureTransformUri')
+
+
+def category_key(value):
+    """범주형 값 → 비교 키 (숫자 코드는 %g 형식, 빈 문자열은 결측). Preprocess 단계와 같은 규칙"""
+    if value is None:
+        return None
+    if isinstance(value, (bool, int, float, np.integer, np.floating)):
+        return None if math.isnan(value) else '%g' % value
+    text = str(value).strip()
+    return text or None
+
+
+def _to_float(value, fill):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return fill
+    return fill if math.isnan(value) else value
+
+
+
+class FeatureTransform:
+    """적합된 변환 아티팩트 (인코더를 순서대로 적용, 교차는 앞선 출력 사용)"""
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.encoders = spec['encoders']
+        self.columns = [e['output'] for e in self.encoders]
+        self.aliases = spec.get('aliases', {})
+        # 앱 입력 코드 → 학습 어휘 (예: ad_position 1 → "Top"). 학습 데이터에도 같은 규칙 적용
+        self.value_maps = spec.get('value_maps', {})
+        # 범주 → 코드 (0 은 결측/미지)
+        self._codes = {
+            e['output']: {v: i + 1 for i, v in enumerate(e['vocabulary'])}
+            for e in self.encoders if e['kind'] == 'category'
+        }
+
+    def _lookup(self, record, name):
+        if name in record:
+            return record[name]
+        for alias in self.aliases.get(name, ()):
+            if alias in record:
+                return record[alias]
+        return None
+
+    def _category(self, name, value):
+        key = category_key(value)
+        return self.value_maps.get(name, {}).get(key, key)
+
+    def transform_record(self, record):
+        """요청 1건(dict) → 모델 입력 벡터 (columns 순서)"""
+        encoded = {}
+        for e in self.encoders:
+            kind = e['kind']
+            if kind == 'cross':
+                (left, right), (size_left, size_right) = e['inputs'], e['sizes']
+                a = min(max(encoded[left], 0), size_left - 1)
+                b = min(max(encoded[right], 0), size_right - 1)
+                encoded[e['output']] = float(a * size_right + b)
+            elif kind == 'category':
+                code = self._codes[e['output']].get(self._category(e['input'], self._lookup(record, e['input'])), 0)
+                encoded[e['output']] = float(code)
+            else:
+                value = _to_float(self._lookup(record, e['input']), e['fill'])
+                if kind == 'bucket':
+                    value = float(bisect.bisect_right(e['edges'], value))
+                encoded[e['output']] = value
+        return [encoded[name] for name in self.columns]
+
+    def transform_columns(self, columns, n):
+        """{입력 이름: 길이 n 시퀀스} → 모델 입력 행렬[n, len(columns)]"""
+        def lookup(name):
+            values = self._lookup(columns, name)
+            return [None] * n if values is None else values
+
+        encoded = {}
+        for e in self.encoders:
+            kind = e['kind']
+            if kind == 'cross':
+                (left, right), (size_left, size_right) = e['inputs'], e['sizes']
+                encoded[e['output']] = (
+                    np.clip(encoded[left], 0, size_left - 1) * size_right
+                    + np.clip(encoded[right], 0, size_right - 1)
+                )
+            elif kind == 'category':
+                codes = self._codes[e['output']]
+                encoded[e['output']] = np.fromiter(
+                    (codes.get(self._category(e['input'], v), 0) for v in lookup(e['input'])), dtype=np.float64, count=n
+                )
+            else:
+                raw = lookup(e['input'])
+                try:
+                    values = np.asarray(raw, dtype=np.float64)
+                except (TypeError, ValueError):
+                    values = np.array([_to_float(v, np.nan) for v in raw], dtype=np.float64)
+                values = np.where(np.isnan(values), e['fill'], values)
+                if kind == 'bucket':
+                    values = np.searchsorted(np.asarray(e['edges'], dtype=np.float64), values, side='right').astype(np.float64)
+                encoded[e['output']] = values
+        return np.column_stack([encoded[name] for name in self.columns]) if self.columns else np.empty((n, 0))
@@ -1,5 +1,12 @@
 import argparse
+import hashlib
+import json
 import os
+import subprocess
+import sys
+import tempfile
+import uuid
+from urllib.parse import urlparse
 import boto3
 from botocore.exceptions import ClientError
 from sagemaker.workflow.pipeline import Pipeline
@@ -25,6 +32,96 @@ from sagemaker import image_uris
 from sagemaker.workflow.pipeline_context import PipelineSession
 
 
+def file_sha256(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def upload_script(s3, bucket: str, path: str, prefix: str = "pipelines/scripts") -> tuple:
+    """스크립트를 내용 해시 키(<prefix>/<sha>/<파일명>)에 업로드. 같은 내용이 이미 있으면 건너뜀
+
+    반환: (s3 URI, 해시 앞 12자리)
+    """
+    digest = file_sha256(path)[:12]
+    key = f"{prefix}/{digest}/{os.path.basename(path)}"
+    try:
+        s3.head_object(Bucket=bucket, Key=key)
+    except ClientError as e:
+        if (e.response.get("Error") or {}).get("Code") not in {"404", "NotFound", "NoSuchKey"}:
+            raise
+        print(f"Uploading {os.path.basename(path)} to s3://{bucket}/{key}")
+        s3.upload_file(path, bucket, key)
+    return f"s3://{bucket}/{key}", digest
+
+
+def stage_wheels(s3, bucket: str, requirements: str, prefix: str = "pipelines/wheels") -> str:
+    """고정 버전 의존성 휠을 처리 컨테이너 플랫폼용으로 내려받아 내용 해시 prefix 에 업로드
+
+    처리 단계는 네트워크 격리 상태에서도 이 휠만으로 설치(pip --no-index)하므로 런타임에
+    PyPI 에 접근하지 않는다. 같은 requirements 로 이미 올라가 있으면 건너뛴다.
+    반환: 휠 prefix S3 URI
+    """
+    python_version = os.environ.get("PROCESSING_PYTHON_VERSION", "3.9")
+    digest = hashlib.sha256(f"{file_sha256(requirements)}:{python_version}".encode("utf-8")).hexdigest()[:12]
+    key_prefix = f"{prefix}/{digest}/"
+    if s3.list_objects_v2(Bucket=bucket, Prefix=key_prefix, MaxKeys=1).get("KeyCount", 0):
+        return f"s3://{bucket}/{key_prefix}"
+    with tempfile.TemporaryDirectory() as wheel_dir:
+        subprocess.check_call([
+            sys.executable, "-m", "pip", "download", "--quiet", "-r", requirements, "-d", wheel_dir,
+            "--only-binary=:all:", "--platform", "manylinux2014_x86_64",
+            "--python-version", python_version, "--implementation", "cp",
+        ])
+        for name in sorted(os.listdir(wheel_dir)):
+            print(f"Uploading wheel {name} to s3://{bucket}/{key_prefix}")
+            s3.upload_file(os.path.join(wheel_dir, name), bucket, key_prefix + name)
+    return f"s3://{bucket}/{key_prefix}"
+
+
+def _digest_s3_listing(s3, uri: str, h) -> None:
+    """prefix(또는 단일 객체) 아래 객체들의 (키, ETag) 를 해시에 반영 (데이터 본문은 읽지 않음)"""
+    parsed = urlparse(uri)
+    for page in s3.get_paginator("list_objects_v2").paginate(Bucket=parsed.netloc, Prefix=parsed.path.lstrip("/")):
+        for obj in page.get("Contents", []):
+            h.update(f"{obj['Key']}:{obj['ETag']}\n".encode("utf-8"))
+
+
+# Extract 가 읽는 데이터와 추출 방식을 정하는 파라미터 (데이터 지문 계산 대상)
+FINGERPRINT_PARAMETERS = (
+    "ExternalCsvUri", "UseFeatureStore", "FeatureGroupName", "IncrementalExtract", "ExtractSql",
+    "ExtractSqlSince", "InteractionFeatureGroupName", "BehaviorFeatureGroupName", "SplitKey", "TrainFraction",
+)
+
+
+def data_fingerprint(s3, sm, settings: dict) -> str:
+    """Extract 입력(CSV, Feature Store 오프라인 스토어)과 추출 설정({파라미터 이름: 값})의 지문
+
+    Extract 가 읽는 외부 데이터와 경로에 넣을 수 없는 자유 형식 값(ExtractSql, ExternalCsvUri)은
+    스텝 인자만으로 구분되지 않으므로, 이 값을 Extract/Preprocess 출력 경로에 넣어 바뀌면 캐시 키와
+    하위 스텝 입력이 함께 바뀌도록 한다. 지문을 계산할 수 없으면 실행마다 다른 값을 돌려 캐시를 쓰지 않는다.
+    """
+    h = hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf-8"))
+    try:
+        if settings["ExternalCsvUri"].startswith("s3://"):
+            _digest_s3_listing(s3, settings["ExternalCsvUri"], h)
+        groups = [settings["InteractionFeatureGroupName"], settings["BehaviorFeatureGroupName"]]
+        if settings["UseFeatureStore"].lower() != "false":
+            groups.append(settings["FeatureGroupName"])
+        for name in filter(None, groups):
+            desc = sm.describe_feature_group(FeatureGroupName=name)
+            _digest_s3_listing(s3, desc["OfflineStoreConfig"]["S3StorageConfig"]["ResolvedOutputS3Uri"], h)
+    except Exception as e:
+        print(f"Data fingerprint unavailable ({e}); extract will not be cached")
+        return f"nocache-{uuid.uuid4().hex[:12]}"
+    return h.hexdigest()[:16]
+
+
+def fingerprint_settings(parameters: list, overrides: dict) -> dict:
+    """파이프라인 파라미터 정의 + 실행 시 지정값 → 지문 계산용 {이름: 문자열 값}"""
+    defaults = {p.name: p.default_value for p in parameters}
+    return {name: str(overrides.get(name, defaults[name])) for name in FINGERPRINT_PARAMETERS}
+
+
 def get_pipeline(region: str, role: str) -> Pipeline:
     # Use PipelineSession to ensure steps are compiled into a pipeline graph
     # instead of executing immediately (avoids JSON serialization of Parameters)
@@ -38,11 +135,29 @@ def get_pipeline(region: str, role: str) -> Pipeline:
     p_external_csv = ParameterString(name="ExternalCsvUri", default_value=os.environ.get("EXTERNAL_CSV_URI", ""))
     p_use_fs = ParameterString(name="UseFeatureStore", default_value=os.environ.get("USE_FEATURE_STORE", "true"))
     p_fg_name = ParameterString(name="FeatureGroupName", default_value=os.environ.get("FEATURE_GROUP_NAME", ""))
+    p_incremental = ParameterString(name="IncrementalExtract", default_value=os.environ.get("INCREMENTAL_EXTRACT", "false"))
+    p_extract_sql = ParameterString(name="ExtractSql", default_value=os.environ.get("EXTRACT_SQL", ""))
+    p_extract_sql_since = ParameterString(name="ExtractSqlSince", default_value=os.environ.get("EXTRACT_SQL_SINCE", ""))
+    p_split_key = ParameterString(name="SplitKey", default_value=os.environ.get("SPLIT_KEY", "id"))
+    p_train_fraction = ParameterFloat(name="TrainFraction", default_value=float(os.environ.get("TRAIN_FRACTION", "0.8")))
+    p_validation_rules = ParameterString(name="ValidationRules", default_value=os.environ.get("VALIDATION_RULES", ""))
+    p_validation_sample = ParameterFloat(name="ValidationSampleFraction", default_value=float(os.environ.get("VALIDATION_SAMPLE_FRACTION", "1.0")))
+    p_drift_max_psi = ParameterFloat(name="DriftMaxPsi", default_value=float(os.environ.get("DRIFT_MAX_PSI", "0.2")))
+    p_drift_max_ks = ParameterFloat(name="DriftMaxKs", default_value=float(os.environ.get("DRIFT_MAX_KS", "0.1")))
+    p_drift_max_label_delta = ParameterFloat(name="DriftMaxLabelRateDelta", default_value=float(os.environ.get("DRIFT_MAX_LABEL_RATE_DELTA", "0.05")))
+    p_interaction_fg_name = ParameterString(name="InteractionFeatureGroupName", default_value=os.environ.get("USER_INTERACTION_FG_NAME", ""))
+    p_behavior_fg_name = ParameterString(name="BehaviorFeatureGroupName", default_value=os.environ.get("BEHAVIOR_FG_NAME", ""))
     p_model_package_group_name = ParameterString(name="ModelPackageGroupName", default_value=os.environ.get("MODEL_PACKAGE_GROUP_NAME", "model-pkg"))
     p_auc_threshold = ParameterFloat(name="AucThreshold", default_value=0.65)
+    p_min_slice_auc = ParameterFloat(name="MinSliceAuc", default_value=float(os.environ.get("MIN_SLICE_AUC", "0.0")))
+    p_slice_crosses = ParameterString(name="EvalSliceCrosses", default_value=os.environ.get("EVAL_SLICE_CROSSES", "device*hour,ad_position*device"))
     p_num_round = ParameterInteger(name="NumRound", default_value=50)
 
-    cache = CacheConfig(enable_caching=False, expire_after="PT1H")
+    # 스텝 캐시: 캐시 키는 스텝 인자(내용 해시 코드 URI, 파라미터, 입력/출력 경로)로 결정된다
+    cache = CacheConfig(
+        enable_caching=os.environ.get("PIPELINE_CACHE", "true").lower() == "true",
+        expire_after=os.environ.get("PIPELINE_CACHE_EXPIRE", "P30D"),
+    )
 
     # Upload local processing scripts to an existing S3 bucket to avoid default bucket creation
     data_bucket_env = os.environ.get("DATA_BUCKET", "")
@@ -56,12 +171,11 @@ def get_pipeline(region: str, role: str) -> Pipeline:
         "preprocess": os.path.join(base_dir, "steps", "03_preprocess.py"),
         "evaluate": os.path.join(base_dir, "steps", "04_evaluate.py"),
     }
-    s3_prefix_scripts = "pipelines/scripts"
-    code_uris = {}
+    code_uris, code_hashes = {}, {}
     for name, path in scripts.items():
-        key = f"{s3_prefix_scripts}/{os.path.basename(path)}"
-        s3.upload_file(path, data_bucket_env, key)
-        code_uris[name] = f"s3://{data_bucket_env}/{key}"
+        code_uris[name], code_hashes[name] = upload_script(s3, data_bucket_env, path)
+    # Extract SQL 모드의 duckdb 등 고정 버전 휠 (단계에서 네트워크 없이 설치)
+    wheels_uri = stage_wheels(s3, data_bucket_env, os.path.join(base_dir, "requirements.txt"))
     # Ensure default dataset exists in S3 for fallback when Feature Store is empty
     dataset_local = os.path.abspath(os.path.join(base_dir, os.pardir, "ad_click_dataset.csv"))
     dataset_key = "datasets/ad_click_dataset.csv"
@@ -76,6 +190,28 @@ def get_pipeline(region: str, role: str) -> Pipeline:
                 s3.upload_file(dataset_local, data_bucket_env, dataset_key)
             else:
                 raise
+    # 기본 데이터셋 업로드 이후에 계산해야 첫 실행의 지문도 실제 입력을 반영. 기본값은 정의 시점의 지문이며
+    # upsert_and_start 는 실행마다 실제 파라미터 값으로 다시 계산해 넘긴다
+    fingerprint_params = [p_external_csv, p_use_fs, p_fg_name, p_incremental, p_extract_sql, p_extract_sql_since,
+                          p_interaction_fg_name, p_behavior_fg_name, p_split_key, p_train_fraction]
+    p_data_fingerprint = ParameterString(
+        name="DataFingerprint",
+        default_value=data_fingerprint(s3, boto3.client("sagemaker", region_name=region),
+                                       fingerprint_settings(fingerprint_params, {})),
+    )
+    # 하위 스텝이 읽는 중간 산출물 경로 = 데이터 지문 + 생성 코드 해시 + 실행 시점 추출 파라미터 값.
+    # 파라미터는 Join 으로 실행 시 평가되므로 지문을 넘기지 않고 값만 바꿔 시작한 실행도 다른 경로를 쓴다
+    settings_key = [
+        "/split=", p_split_key, "/fraction=", p_train_fraction.to_string(), "/incremental=", p_incremental,
+        "/fs=", p_use_fs, "/groups=", p_fg_name, "+", p_interaction_fg_name, "+", p_behavior_fg_name,
+        "/since=", p_extract_sql_since,
+    ]
+    extract_key = ["/extract/", p_data_fingerprint, f"-{code_hashes['extract']}", *settings_key]
+    preprocess_key = ["/preprocess/", p_data_fingerprint, f"-{code_hashes['extract']}-{code_hashes['preprocess']}", *settings_key]
+
+    # 학습 분할 프로파일(드리프트 기준선)도 추출 키 아래에 두고 모델 패키지 메타데이터(DriftBaselineUri)로 공개.
+    # 추론 앱은 최신 추출 실행이 아니라 배포된 모델이 학습한 분할과 비교한다
+    baseline_uri = Join(on="", values=["s3://", p_data_bucket, "/", p_prefix, *extract_key, "/baseline"])
 
     extract = SKLearnProcessor(
         framework_version="1.2-1",
@@ -86,17 +222,27 @@ def get_pipeline(region: str, role: str) -> Pipeline:
     )
     extract_args = extract.run(
         code=code_uris["extract"],
-        inputs=[],
+        inputs=[ProcessingInput(source=wheels_uri, destination="/opt/ml/processing/wheels")],
         outputs=[
             ProcessingOutput(
                 output_name="train",
                 source="/opt/ml/processing/train",
-                destination=Join(on="", values=["s3://", p_data_bucket, "/", p_prefix, "/extract/train"]),
+                destination=Join(on="", values=["s3://", p_data_bucket, "/", p_prefix, *extract_key, "/train"]),
             ),
             ProcessingOutput(
                 output_name="validation",
                 source="/opt/ml/processing/validation",
-                destination=Join(on="", values=["s3://", p_data_bucket, "/", p_prefix, "/extract/validation"]),
+                destination=Join(on="", values=["s3://", p_data_bucket, "/", p_prefix, *extract_key, "/validation"]),
+            ),
+            ProcessingOutput(
+                output_name="baseline",
+                source="/opt/ml/processing/baseline",
+                destination=baseline_uri,
+            ),
+            ProcessingOutput(
+                output_name="interactions",
+                source="/opt/ml/processing/interactions",
+                destination=Join(on="", values=["s3://", p_data_bucket, "/", p_prefix, *extract_key, "/interactions"]),
             ),
         ],
         arguments=[
@@ -104,9 +250,16 @@ def get_pipeline(region: str, role: str) -> Pipeline:
             "--csv", p_external_csv,
             "--use-feature-store", p_use_fs,
             "--feature-group-name", p_fg_name,
+            "--incremental", p_incremental,
+            "--sql", p_extract_sql,
+            "--sql-since", p_extract_sql_since,
+            "--interaction-group-name", p_interaction_fg_name,
+            "--behavior-group-name", p_behavior_fg_name,
+            "--split-key", p_split_key,
+            "--train-fraction", p_train_fraction.to_string(),
         ],
     )
-    extract_step = ProcessingStep(name="Extract", step_args=extract_args)
+    extract_step = ProcessingStep(name="Extract", step_args=extract_args, cache_config=cache)
 
     validate = SKLearnProcessor(
         framework_version="1.2-1",
@@ -128,8 +281,16 @@ def get_pipeline(region: str, role: str) -> Pipeline:
                 destination=Join(on="", values=["s3://", p_data_bucket, "/", p_prefix, "/validate/report"]),
             )
         ],
+        arguments=[
+            "--rules", p_validation_rules,
+            "--sample-fraction", p_validation_sample.to_string(),
+            "--snapshot-store", Join(on="", values=["s3://", p_data_bucket, "/", p_prefix, "/validate/snapshots"]),
+            "--max-psi", p_drift_max_psi.to_string(),
+            "--max-ks", p_drift_max_ks.to_string(),
+            "--max-label-rate-delta", p_drift_max_label_delta.to_string(),
+        ],
     )
-    validate_step = ProcessingStep(name="Validate", step_args=validate_args)
+    validate_step = ProcessingStep(name="Validate", step_args=validate_args, cache_config=cache)
 
     preprocess = SKLearnProcessor(
         framework_version="1.2-1",
@@ -138,26 +299,41 @@ def get_pipeline(region: str, role: str) -> Pipeline:
         instance_count=1,
         sagemaker_session=sm_sess,
     )
+    # 변환 아티팩트도 전처리 산출물과 같은 키로 저장 (캐시된 모델과 항상 짝이 맞도록)
+    transform_uri = Join(on="", values=["s3://", p_data_bucket, "/", p_prefix, "/model", *preprocess_key, "/transform"])
     preprocess_args = preprocess.run(
         code=code_uris["preprocess"],
         inputs=[
             ProcessingInput(source=extract_step.properties.ProcessingOutputConfig.Outputs[0].S3Output.S3Uri, destination="/opt/ml/processing/train"),
             ProcessingInput(source=extract_step.properties.ProcessingOutputConfig.Outputs[1].S3Output.S3Uri, destination="/opt/ml/processing/validation"),
+            # 실제 클릭 라벨(추론 앱 상호작용, 라벨 시점 행동 집계 조인) → 학습 분할에 추가
+            ProcessingInput(source=extract_step.properties.ProcessingOutputConfig.Outputs[3].S3Output.S3Uri, destination="/opt/ml/processing/interactions"),
         ],
         outputs=[
             ProcessingOutput(
                 output_name="train_pre",
                 source="/opt/ml/processing/train_pre",
-                destination=Join(on="", values=["s3://", p_data_bucket, "/", p_prefix, "/preprocess/train_pre"]),
+                destination=Join(on="", values=["s3://", p_data_bucket, "/", p_prefix, *preprocess_key, "/train_pre"]),
             ),
             ProcessingOutput(
                 output_name="validation_pre",
                 source="/opt/ml/processing/validation_pre",
-                destination=Join(on="", values=["s3://", p_data_bucket, "/", p_prefix, "/preprocess/validation_pre"]),
+                destination=Join(on="", values=["s3://", p_data_bucket, "/", p_prefix, *preprocess_key, "/validation_pre"]),
+            ),
+            ProcessingOutput(
+                output_name="validation_eval",
+                source="/opt/ml/processing/validation_eval",
+                destination=Join(on="", values=["s3://", p_data_bucket, "/", p_prefix, *preprocess_key, "/validation_eval"]),
+            ),
+            # 적합된 특성 변환 아티팩트: 모델 패키지 메타데이터(FeatureTransformUri)로 공개, 추론 앱이 이를 따라 로드
+            ProcessingOutput(
+                output_name="transform",
+                source="/opt/ml/processing/transform",
+                destination=transform_uri,
             ),
         ],
     )
-    preprocess_step = ProcessingStep(name="Preprocess", step_args=preprocess_args)
+    preprocess_step = ProcessingStep(name="Preprocess", step_args=preprocess_args, cache_config=cache)
 
     image = p_train_image
     train = Estimator(
@@ -176,10 +352,11 @@ def get_pipeline(region: str, role: str) -> Pipeline:
             "validation": TrainingInput(s3_data=preprocess_step.properties.ProcessingOutputConfig.Outputs[1].S3Output.S3Uri, content_type="text/csv"),
         }
     )
-    train_step = TrainingStep(name="Train", step_args=train_args)
+    train_step = TrainingStep(name="Train", step_args=train_args, cache_config=cache)
 
+    # 학습과 같은 XGBoost 이미지로 평가해 학습 산출물을 그대로 로드
     eval_proc = ScriptProcessor(
-        image_uri=image_uris.retrieve(framework="sklearn", region=sm_sess.boto_region_name, version="1.2-1"),
+        image_uri=p_train_image,
         role=role,
         instance_type=p_instance_type,
         instance_count=1,
@@ -191,7 +368,7 @@ def get_pipeline(region: str, role: str) -> Pipeline:
         code=code_uris["evaluate"],
         inputs=[
             ProcessingInput(source=train_step.properties.ModelArtifacts.S3ModelArtifacts, destination="/opt/ml/processing/model"),
-            ProcessingInput(source=preprocess_step.properties.ProcessingOutputConfig.Outputs[1].S3Output.S3Uri, destination="/opt/ml/processing/validation_pre"),
+            ProcessingInput(source=preprocess_step.properties.ProcessingOutputConfig.Outputs[2].S3Output.S3Uri, destination="/opt/ml/processing/validation_eval"),
         ],
         outputs=[
             ProcessingOutput(
@@ -200,8 +377,9 @@ def get_pipeline(region: str, role: str) -> Pipeline:
                 destination=Join(on="", values=["s3://", p_data_bucket, "/", p_prefix, "/evaluate/report"]),
             )
         ],
+        arguments=["--slice-crosses", p_slice_crosses],
     )
-    eval_step = ProcessingStep(name="Evaluate", step_args=eval_args, property_files=[evaluation])
+    eval_step = ProcessingStep(name="Evaluate", step_args=eval_args, property_files=[evaluation], cache_config=cache)
 
     # RegisterModel requires the estimator definition and concrete instance types.
     # Use a safe default instance type; deployment uses another stage later.
@@ -215,6 +393,10 @@ def get_pipeline(region: str, role: str) -> Pipeline:
         transform_instances=["ml.m5.large"],
         model_package_group_name=p_model_package_group_name,
         approval_status="PendingManualApproval",
+        customer_metadata_properties={
+            "FeatureTransformUri": Join(on="", values=[transform_uri, "/transform.json"]),
+            "DriftBaselineUri": Join(on="", values=[baseline_uri, "/profile.json"]),
+        },
     )
 
     cond = ConditionStep(
@@ -223,7 +405,12 @@ def get_pipeline(region: str, role: str) -> Pipeline:
             ConditionGreaterThanOrEqualTo(
                 left=JsonGet(step=eval_step, property_file=evaluation, json_path="metrics.auc.value"),
                 right=p_auc_threshold,
-            )
+            ),
+            # 가장 약한 세그먼트(행 수 충분)의 AUC 하한 (기본 0 = 비활성)
+            ConditionGreaterThanOrEqualTo(
+                left=JsonGet(step=eval_step, property_file=evaluation, json_path="metrics.min_slice_auc.value"),
+                right=p_min_slice_auc,
+            ),
         ],
         if_steps=[reg],
         else_steps=[],
@@ -239,9 +426,24 @@ def get_pipeline(region: str, role: str) -> Pipeline:
             p_external_csv,
             p_use_fs,
             p_fg_name,
+            p_incremental,
+            p_extract_sql,
+            p_extract_sql_since,
+            p_interaction_fg_name,
+            p_behavior_fg_name,
+            p_split_key,
+            p_train_fraction,
+            p_validation_rules,
+            p_validation_sample,
+            p_drift_max_psi,
+            p_drift_max_ks,
+            p_drift_max_label_delta,
             p_model_package_group_name,
             p_auc_threshold,
+            p_min_slice_auc,
+            p_slice_crosses,
             p_num_round,
+            p_data_fingerprint,
         ],
         steps=[extract_step, validate_step, preprocess_step, train_step, eval_step, cond],
         sagemaker_session=sm_sess,
@@ -268,11 +470,44 @@ def upsert_and_start(wait: bool = False):
         parameters["UseFeatureStore"] = os.environ["USE_FEATURE_STORE"]
     if os.environ.get("FEATURE_GROUP_NAME"):
         parameters["FeatureGroupName"] = os.environ["FEATURE_GROUP_NAME"]
+    if os.environ.get("INCREMENTAL_EXTRACT"):
+        parameters["IncrementalExtract"] = os.environ["INCREMENTAL_EXTRACT"]
+    if os.environ.get("EXTRACT_SQL"):
+        parameters["ExtractSql"] = os.environ["EXTRACT_SQL"]
+    if os.environ.get("EXTRACT_SQL_SINCE"):
+        parameters["ExtractSqlSince"] = os.environ["EXTRACT_SQL_SINCE"]
+    if os.environ.get("USER_INTERACTION_FG_NAME"):
+        parameters["InteractionFeatureGroupName"] = os.environ["USER_INTERACTION_FG_NAME"]
+    if os.environ.get("BEHAVIOR_FG_NAME"):
+        parameters["BehaviorFeatureGroupName"] = os.environ["BEHAVIOR_FG_NAME"]
+    if os.environ.get("SPLIT_KEY"):
+        parameters["SplitKey"] = os.environ["SPLIT_KEY"]
+    if os.environ.get("TRAIN_FRACTION"):
+        parameters["TrainFraction"] = float(os.environ["TRAIN_FRACTION"])
+    if os.environ.get("VALIDATION_RULES"):
+        parameters["ValidationRules"] = os.environ["VALIDATION_RULES"]
+    if os.environ.get("VALIDATION_SAMPLE_FRACTION"):
+        parameters["ValidationSampleFraction"] = float(os.environ["VALIDATION_SAMPLE_FRACTION"])
+    if os.environ.get("DRIFT_MAX_PSI"):
+        parameters["DriftMaxPsi"] = float(os.environ["DRIFT_MAX_PSI"])
+    if os.environ.get("DRIFT_MAX_KS"):
+        parameters["DriftMaxKs"] = float(os.environ["DRIFT_MAX_KS"])
+    if os.environ.get("DRIFT_MAX_LABEL_RATE_DELTA"):
+        parameters["DriftMaxLabelRateDelta"] = float(os.environ["DRIFT_MAX_LABEL_RATE_DELTA"])
+    if os.environ.get("MIN_SLICE_AUC"):
+        parameters["MinSliceAuc"] = float(os.environ["MIN_SLICE_AUC"])
+    if os.environ.get("EVAL_SLICE_CROSSES"):
+        parameters["EvalSliceCrosses"] = os.environ["EVAL_SLICE_CROSSES"]
     if os.environ.get("MODEL_PACKAGE_GROUP_NAME"):
         parameters["ModelPackageGroupName"] = os.environ["MODEL_PACKAGE_GROUP_NAME"]
     if os.environ.get("TRAIN_IMAGE_URI"):
         parameters["TrainImage"] = os.environ["TRAIN_IMAGE_URI"]
-        
+    # 이 실행의 실제 추출 파라미터로 데이터 지문 계산 (정의의 기본값은 upsert 시점 값)
+    parameters["DataFingerprint"] = data_fingerprint(
+        boto3.client("s3"), boto3.client("sagemaker", region_name=region),
+        fingerprint_settings(pipe.parameters, parameters),
+    )
+
     exe = pipe.start(parameters=parameters)
     print("Started pipeline:", exe.arn)
     print("Parameters passed:", parameters)
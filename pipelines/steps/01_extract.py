@@ -1,24 +1,694 @@
 import argparse
+import json
 import os
+import subprocess
+import sys
 import tempfile
+import threading
 import numpy as np
 import pandas as pd
 import boto3
 from botocore.exceptions import ClientError
 from urllib.parse import urlparse
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+# 학습 데이터 특성 순서 (label 다음 컬럼들)
+FEATURE_COLUMNS = ["gender", "age", "device", "hour"]
+# 원본 값(문자열, 결측 허용)으로 전달하는 범주형 특성. 인코딩은 03_preprocess 의 변환 아티팩트가 담당
+CATEGORICAL_COLUMNS = ["ad_position", "browsing_history"]
+# 단계 간 Parquet 교환 포맷의 레코드 식별자 컬럼
+ID_COLUMN = "id"
+PROFILE_QUANTILES = [0.01, 0.05, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99]
+
+
+def feature_profile(values: np.ndarray, max_bins: int = 20) -> dict:
+    """단일 특성의 고정 bin 히스토그램 + 분위수 스케치
+
+    저카디널리티(정수 범주형)는 값마다 bin 하나, 그 외에는 학습 분포 기준
+    등빈도 경계를 사용한다. 경계 바깥 값은 양 끝 bin 으로 집계된다.
+    """
+    values = values[~np.isnan(values)]
+    uniques = np.unique(values)
+    if uniques.size <= max_bins:
+        # 각 고유값이 자기 bin 에 들어가도록 중간점을 경계로 사용
+        edges = ((uniques[:-1] + uniques[1:]) / 2).tolist()
+    else:
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, max_bins + 1)[1:-1])).tolist()
+    counts = np.bincount(np.searchsorted(edges, values, side="right"), minlength=len(edges) + 1)
+    return {
+        "edges": edges,
+        "counts": counts.tolist(),
+        "count": int(values.size),
+        "mean": float(values.mean()) if values.size else None,
+        "std": float(values.std()) if values.size else None,
+        "quantiles": dict(zip(map(str, PROFILE_QUANTILES), np.quantile(values, PROFILE_QUANTILES).tolist())) if values.size else {},
+    }
+
+
+def write_baseline_profile(train: pd.DataFrame, out_dir: str, rows: int = None) -> None:
+    """학습 분할(또는 그 균등 표본)의 특성별 분포 프로파일을 JSON 으로 기록 (온라인 드리프트 기준선)"""
+    os.makedirs(out_dir, exist_ok=True)
+    if train.empty:
+        print("No training rows; baseline profile skipped")
+        return
+    arr = train[["label"] + FEATURE_COLUMNS].to_numpy(dtype=np.float64)
+    profile = {
+        "version": 1,
+        "rows": int(arr.shape[0] if rows is None else rows),
+        "label_rate": float(arr[:, 0].mean()) if arr.shape[0] else None,
+        "features": {name: feature_profile(arr[:, i + 1]) for i, name in enumerate(FEATURE_COLUMNS)},
+    }
+    with open(os.path.join(out_dir, "profile.json"), "w") as f:
+        json.dump(profile, f)
+    print(f"Baseline profile written for {len(FEATURE_COLUMNS)} features ({profile['rows']} rows)")
+
+
+def category_text(series: pd.Series) -> pd.Series:
+    """범주형 값 → 문자열 (숫자 코드는 %g 형식, 빈 문자열은 결측). 추론 앱 변환과 같은 규칙"""
+    if pd.api.types.is_numeric_dtype(series):
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        text = pd.Series(np.char.mod("%g", values), index=series.index, dtype="string")
+        return text.mask(np.isnan(values))
+    text = series.astype("string").str.strip()
+    return text.mask(text == "")
+
+
+# 오프라인 스토어에서 읽을 컬럼 (레코드 식별자/이벤트 시각 + 학습 컬럼 + 메타데이터)
+OFFLINE_KEY_COLUMNS = ["id", "event_time"]
+OFFLINE_FEATURE_COLUMNS = ["click"] + FEATURE_COLUMNS
+OFFLINE_META_COLUMNS = ["api_invocation_time", "write_time", "is_deleted"]
+ARROW_BATCH_ROWS = 65536
+# 축약 결과 병합 주기: 대기 중인 부분 결과 행 수가 누적 결과 크기(최소 이 값)에 이르면 한 번에 병합
+MERGE_MIN_ROWS = 500_000
+
+
+def list_parquet_keys(s3c, bucket: str, prefix: str, start_after: str = "") -> list:
+    keys = []
+    kwargs = {"StartAfter": start_after} if start_after else {}
+    for page in s3c.get_paginator("list_objects_v2").paginate(Bucket=bucket, Prefix=prefix, **kwargs):
+        keys.extend(obj["Key"] for obj in page.get("Contents", []) if obj["Key"].endswith(".parquet"))
+    return keys
+
+
+def latest_per_id(frame: pd.DataFrame) -> pd.DataFrame:
+    """id 별 최신 event_time 레코드만 유지 (동일 시각은 나중에 기록된 write 우선)"""
+    order = [c for c in ["event_time", "api_invocation_time", "write_time"] if c in frame.columns]
+    frame = frame.sort_values(order, kind="stable")
+    return frame.drop_duplicates(subset="id", keep="last")
+
+
+def iter_parquet_frames(path: str, columns: list):
+    """필요한 컬럼만 Arrow 배치 단위로 읽기 (pyarrow 미설치 시 파일 전체 읽기)"""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        frame = pd.read_parquet(path)
+        yield frame[[c for c in columns if c in frame.columns]]
+        return
+    pf = pq.ParquetFile(path)
+    present = [c for c in columns if c in pf.schema_arrow.names]
+    for batch in pf.iter_batches(batch_size=ARROW_BATCH_ROWS, columns=present):
+        yield batch.to_pandas()
+
+
+def reduce_parquet_file(s3c, bucket: str, key: str, work_dir: str, extra_columns=()) -> pd.DataFrame:
+    """파일 1개 다운로드 → 컬럼 투영 배치 읽기 → id 별 최신 레코드로 축약 → 로컬 파일 삭제
+
+    배치마다 먼저 축약하고 파일 끝에서 한 번 병합하므로 메모리는 파일 내 고유 id 수에 비례한다.
+    """
+    local = os.path.join(work_dir, key.replace("/", "_"))
+    s3c.download_file(bucket, key, local)
+    try:
+        columns = OFFLINE_KEY_COLUMNS + OFFLINE_FEATURE_COLUMNS + OFFLINE_META_COLUMNS
+        columns += [c for c in extra_columns if c not in columns]
+        parts = []
+        for frame in iter_parquet_frames(local, columns):
+            frame["event_time"] = pd.to_datetime(frame["event_time"], utc=True, errors="coerce")
+            parts.append(latest_per_id(frame.dropna(subset=["event_time"])))
+        if not parts:
+            return None
+        return parts[0] if len(parts) == 1 else latest_per_id(pd.concat(parts, ignore_index=True))
+    finally:
+        os.remove(local)
+
+
+def bounded_map(pool: ThreadPoolExecutor, fn, items, max_in_flight: int):
+    """fn(item) 을 최대 max_in_flight 개만 동시에 제출하고 완료 순서대로 결과를 돌려줌
+
+    전체를 한 번에 submit 하면 완료된 Future 와 그 결과(DataFrame)가 모두 살아 있으므로,
+    소비한 Future 는 바로 버리고 그 자리에 다음 작업을 제출한다.
+    """
+    items = iter(items)
+    end = object()
+    in_flight = set()
+    for item in items:
+        in_flight.add(pool.submit(fn, item))
+        if len(in_flight) >= max_in_flight:
+            break
+    while in_flight:
+        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            next_item = next(items, end)
+            if next_item is not end:
+                in_flight.add(pool.submit(fn, next_item))
+            yield future.result()
+        del done
+
+
+def scan_parquet_files(s3c, bucket: str, keys: list, max_workers: int = 0, extra_columns=()):
+    """Parquet 파일들을 병렬로 다운로드/축약하고, 완료되는 순서대로 누적 결과에 병합
+
+    동시에 떠 있는 작업은 작업자 수의 2배로 제한한다. 부분 결과는 모아 두었다가 대기 행 수가
+    누적 결과 크기에 이르면 한 번의 concat + 중복 제거로 병합하므로(기하급수 배치), 파일마다
+    전체를 다시 정렬하지 않고 총 비용이 O(N log N) 에 머문다.
+    반환: id 별 최신 레코드 (삭제 표시 포함) 또는 레코드가 없으면 None
+    """
+    # 다운로드(네트워크)와 Arrow 디코딩(GIL 해제)이 섞인 작업이므로 코어 수보다 넉넉히
+    max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+    print(f"Scanning {len(keys)} parquet files with {max_workers} workers")
+
+    merged, pending, pending_rows = None, [], 0
+    with tempfile.TemporaryDirectory() as work_dir, ThreadPoolExecutor(max_workers=max_workers) as pool:
+        reduce = lambda key: reduce_parquet_file(s3c, bucket, key, work_dir, extra_columns)  # noqa: E731
+        for part in bounded_map(pool, reduce, keys, max_in_flight=2 * max_workers):
+            if part is None or part.empty:
+                continue
+            pending.append(part)
+            pending_rows += len(part)
+            if pending_rows >= max(MERGE_MIN_ROWS, 0 if merged is None else len(merged)):
+                merged = latest_per_id(pd.concat(([merged] if merged is not None else []) + pending, ignore_index=True))
+                pending, pending_rows = [], 0
+    if pending:
+        merged = latest_per_id(pd.concat(([merged] if merged is not None else []) + pending, ignore_index=True))
+    return merged
+
+
+def online_view(merged: pd.DataFrame) -> pd.DataFrame:
+    """id 별 최신 레코드 → 학습에 쓸 온라인 스토어 동등 뷰"""
+    if "is_deleted" in merged.columns:
+        # 최신 write 가 삭제 표시인 레코드는 온라인 스토어에도 없음
+        merged = merged[~merged["is_deleted"].fillna(False).astype(bool)]
+    return merged.dropna(subset=OFFLINE_FEATURE_COLUMNS).reset_index(drop=True)
+
+
+def read_offline_store(s3c, resolved_s3_uri: str, max_workers: int = 0, extra_columns=()) -> pd.DataFrame:
+    """오프라인 스토어 전체 스캔 → 온라인 스토어와 동일한 id 별 최신 뷰"""
+    parsed = urlparse(resolved_s3_uri)
+    bucket, prefix = parsed.netloc, parsed.path.lstrip("/")
+    keys = list_parquet_keys(s3c, bucket, prefix)
+    if not keys:
+        raise FileNotFoundError(f"No parquet files under {resolved_s3_uri}")
+    merged = scan_parquet_files(s3c, bucket, keys, max_workers, extra_columns)
+    if merged is None:
+        raise FileNotFoundError(f"No records in parquet files under {resolved_s3_uri}")
+    return online_view(merged)
+
+
+def partition_key(prefix: str, ts: pd.Timestamp) -> str:
+    """오프라인 스토어 파티션 경로 (year=/month=/day=/hour=, 사전순 = 시간순)"""
+    return f"{prefix.rstrip('/')}/year={ts:%Y}/month={ts:%m}/day={ts:%d}/hour={ts:%H}"
+
+
+def read_offline_store_incremental(s3c, resolved_s3_uri: str, state_uri: str,
+                                   lookback_hours: int = 24, max_workers: int = 0,
+                                   extra_columns=()) -> pd.DataFrame:
+    """워터마크 이후 파티션의 미처리 파일만 읽어 이전 스냅샷과 병합
+
+    state_uri 아래에 manifest.json(최대 event_time, 처리한 파일 목록)과 snapshot.parquet
+    (삭제 표시를 포함한 id 별 최신 레코드)을 유지한다. 늦게 도착한 레코드를 위해
+    워터마크보다 lookback_hours 이전 파티션부터 다시 나열하되, 이미 처리한 파일은 건너뛴다.
+    매니페스트가 없으면 전체 스캔 후 상태를 새로 만든다.
+    """
+    parsed = urlparse(resolved_s3_uri)
+    bucket, prefix = parsed.netloc, parsed.path.lstrip("/")
+    state = urlparse(state_uri)
+    state_bucket, state_prefix = state.netloc, state.path.strip("/")
+    manifest_key = f"{state_prefix}/manifest.json"
+    snapshot_key = f"{state_prefix}/snapshot.parquet"
+
+    manifest = None
+    try:
+        manifest = json.loads(s3c.get_object(Bucket=state_bucket, Key=manifest_key)["Body"].read())
+    except ClientError as e:
+        if (e.response.get("Error") or {}).get("Code") not in {"404", "NotFound", "NoSuchKey"}:
+            raise
+        print(f"No extract manifest at s3://{state_bucket}/{manifest_key}; running a full scan")
+
+    previous = None
+    start_after = ""
+    processed = set()
+    if manifest and manifest.get("watermark"):
+        floor = pd.Timestamp(manifest["watermark"]) - pd.Timedelta(hours=lookback_hours)
+        start_after = partition_key(prefix, floor)
+        processed = set(manifest.get("processed_files", []))
+        with tempfile.NamedTemporaryFile(suffix=".parquet") as tmp:
+            s3c.download_file(state_bucket, snapshot_key, tmp.name)
+            previous = pd.read_parquet(tmp.name)
+        print(f"Incremental extract from watermark {manifest['watermark']} "
+              f"({len(previous)} records in previous snapshot)")
+
+    listed = list_parquet_keys(s3c, bucket, prefix, start_after=start_after)
+    new_keys = [k for k in listed if k not in processed]
+    print(f"{len(new_keys)} new parquet files ({len(listed) - len(new_keys)} already processed)")
+    part = scan_parquet_files(s3c, bucket, new_keys, max_workers, extra_columns) if new_keys else None
+
+    frames = [f for f in (previous, part) if f is not None and not f.empty]
+    if not frames:
+        raise FileNotFoundError(f"No records in parquet files under {resolved_s3_uri}")
+    merged = latest_per_id(pd.concat(frames, ignore_index=True)) if len(frames) > 1 else frames[0]
+
+    # 스냅샷을 먼저 쓰고 매니페스트를 마지막에 갱신 (중간 실패 시 이전 상태 유지)
+    watermark = pd.to_datetime(merged["event_time"], utc=True).max()
+    with tempfile.NamedTemporaryFile(suffix=".parquet") as tmp:
+        merged.to_parquet(tmp.name, index=False)
+        s3c.upload_file(tmp.name, state_bucket, snapshot_key)
+    # 다음 실행의 나열 범위 밖으로 밀려난 파일은 목록에서 제거해 매니페스트 크기를 제한
+    next_start_after = partition_key(prefix, watermark - pd.Timedelta(hours=lookback_hours))
+    s3c.put_object(Bucket=state_bucket, Key=manifest_key, Body=json.dumps({
+        "version": 1,
+        "watermark": watermark.isoformat(),
+        "processed_files": sorted(k for k in processed.union(listed) if k > next_start_after),
+        "snapshot": f"s3://{state_bucket}/{snapshot_key}",
+        "records": int(len(merged)),
+        "updated_at": pd.Timestamp.now(tz="UTC").isoformat(),
+    }).encode("utf-8"))
+    return online_view(merged)
+
+
+# 사용자 상호작용 Feature Group: 추론 앱 특성 순서와 라벨 요청 유형
+INTERACTION_FEATURES = ["user_age", "ad_position", "browsing_history", "time_of_day", "user_behavior_score"]
+LABEL_REQUEST_TYPE = "actual_click"
+LABEL_COLUMNS = ["interaction_id", "session_id", "user_key", "event_time", "actual_click"] + INTERACTION_FEATURES
+# 행동 집계 Feature Group (체크포인트 전용, 레코드 식별자 = user_key)
+CHECKPOINT_COLUMNS = ["user_key", "event_time", "user_behavior_score"]
+
+
+def read_history_file(s3c, bucket: str, key: str, work_dir: str, columns: list, request_type: str = None) -> pd.DataFrame:
+    """오프라인 스토어 파일 1개 → 모든 write 이력 (삭제 표시 제외, request_type 지정 시 해당 유형만)"""
+    local = os.path.join(work_dir, key.replace("/", "_"))
+    s3c.download_file(bucket, key, local)
+    read_columns = columns + ["is_deleted"] + (["request_type"] if request_type else [])
+    frames = []
+    try:
+        for frame in iter_parquet_frames(local, read_columns):
+            keep = pd.Series(True, index=frame.index)
+            if "is_deleted" in frame.columns:
+                keep &= ~frame["is_deleted"].fillna(False).astype(bool)
+            if request_type:
+                keep &= frame["request_type"] == request_type
+            frames.append(frame.loc[keep, [c for c in columns if c in frame.columns]])
+    finally:
+        os.remove(local)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+
+def read_history(s3c, resolved_s3_uri: str, columns: list, request_type: str = None, max_workers: int = 0) -> pd.DataFrame:
+    """오프라인 스토어 전체의 write 이력 (id 별 최신으로 접지 않음: as-of 조인용)"""
+    parsed = urlparse(resolved_s3_uri)
+    bucket, prefix = parsed.netloc, parsed.path.lstrip("/")
+    keys = list_parquet_keys(s3c, bucket, prefix)
+    if not keys:
+        raise FileNotFoundError(f"No parquet files under {resolved_s3_uri}")
+    max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+    print(f"Scanning {len(keys)} parquet files under {resolved_s3_uri} with {max_workers} workers")
+    with tempfile.TemporaryDirectory() as work_dir, ThreadPoolExecutor(max_workers=max_workers) as pool:
+        frames = list(pool.map(lambda k: read_history_file(s3c, bucket, k, work_dir, columns, request_type), keys))
+    return pd.concat(frames, ignore_index=True)
+
+
+def point_in_time_join(labels: pd.DataFrame, checkpoints: pd.DataFrame) -> pd.DataFrame:
+    """라벨 이벤트마다 그 시각 이전에 확정된 행동 집계값을 붙이는 as-of 조인
+
+    (user_key, event_time) 정렬 병합(merge_asof, backward)이므로 O(n log n) 이고,
+    allow_exact_matches=False 로 라벨과 같은 시각 이후의 체크포인트(클릭 자신이 반영됐을 수
+    있는 값)는 절대 사용하지 않는다. 이전 체크포인트가 없으면 클릭 시점에 요청에 실려 온 값을 쓴다.
+    반환: id, label + INTERACTION_FEATURES 컬럼 (event_time 순)
+    """
+    labels = labels.copy()
+    labels["event_time"] = pd.to_datetime(labels["event_time"], utc=True, errors="coerce")
+    # 체크포인트 키 = 추론 앱 behavior_keys 의 user_key (user_id, 없으면 세션). 이 컬럼이 없던 이전 행은 세션 사용
+    session_key = labels["session_id"].astype("string")
+    labels["user_key"] = labels["user_key"].astype("string").fillna(session_key) if "user_key" in labels.columns else session_key
+    # 오프라인 스토어의 중복 write 제거 후 시간순 정렬 (merge_asof 전제 조건)
+    labels = labels.dropna(subset=["event_time", "user_key"])
+    labels = labels.drop_duplicates(subset="interaction_id", keep="last").sort_values("event_time", kind="stable")
+
+    checkpoints = checkpoints[CHECKPOINT_COLUMNS].rename(columns={"user_behavior_score": "behavior_score_asof"})
+    checkpoints["user_key"] = checkpoints["user_key"].astype("string")
+    checkpoints["event_time"] = pd.to_datetime(checkpoints["event_time"], utc=True, errors="coerce")
+    checkpoints = checkpoints.dropna(subset=["event_time", "user_key"]).sort_values("event_time", kind="stable")
+
+    joined = pd.merge_asof(
+        labels, checkpoints,
+        on="event_time", by="user_key",
+        direction="backward", allow_exact_matches=False,
+    )
+    matched = joined["behavior_score_asof"].notna()
+    print(f"Point-in-time join: {len(joined)} labeled interactions, "
+          f"{int(matched.sum())} with a prior behavior checkpoint")
+    joined["user_behavior_score"] = joined["behavior_score_asof"].where(matched, joined["user_behavior_score"])
+
+    out = pd.DataFrame({
+        ID_COLUMN: joined["interaction_id"].astype(str),
+        "label": pd.to_numeric(joined["actual_click"], errors="coerce"),
+    })
+    for name in INTERACTION_FEATURES:
+        out[name] = pd.to_numeric(joined[name], errors="coerce").astype(np.float32)
+    return out.dropna().astype({"label": int}).reset_index(drop=True)
+
+
+# SQL 추출 모드에서 오프라인 스토어 Parquet 를 노출하는 뷰 이름
+SQL_SOURCE_VIEW = "offline_store"
+# 예: 온라인 스토어 동등 뷰 (id 별 최신 레코드, 삭제 제외)
+EXAMPLE_EXTRACT_SQL = f"""
+SELECT click AS label, gender, age, device, hour
+FROM {SQL_SOURCE_VIEW}
+WHERE NOT coalesce(is_deleted, false)
+QUALIFY row_number() OVER (PARTITION BY id ORDER BY event_time DESC, api_invocation_time DESC) = 1
+"""
+
+
+# 고정 버전 휠 디렉터리 (pipeline_def.py 가 pipelines/requirements.txt 로 준비해 입력으로 마운트)
+WHEEL_DIR = "/opt/ml/processing/wheels"
+
+
+def download_parquet_tree(s3c, s3_uri: str, local_dir: str, max_workers: int = 0, since: str = "") -> int:
+    """S3 prefix 아래 Parquet 파일을 상대 경로(year=/month=/... 파티션) 그대로 병렬 다운로드
+
+    since(ISO 시각)가 있으면 그 시각의 event_time 파티션부터만 나열해(StartAfter) 이전
+    파티션은 내려받지 않는다.
+    """
+    parsed = urlparse(s3_uri)
+    bucket, prefix = parsed.netloc, parsed.path.lstrip("/")
+    start_after = ""
+    if since:
+        # 오프라인 스토어 파티션은 UTC 기준
+        ts = pd.Timestamp(since)
+        start_after = partition_key(prefix, ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC"))
+    keys = list_parquet_keys(s3c, bucket, prefix, start_after=start_after)
+
+    def fetch(key):
+        local = os.path.join(local_dir, os.path.relpath(key, prefix))
+        os.makedirs(os.path.dirname(local), exist_ok=True)
+        s3c.download_file(bucket, key, local)
+
+    max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for _ in bounded_map(pool, fetch, keys, max_in_flight=2 * max_workers):
+            pass
+    return len(keys)
+
+
+def import_duckdb(wheel_dir: str = WHEEL_DIR):
+    """duckdb 는 처리 컨테이너 기본 이미지에 없으므로 입력으로 받은 고정 버전 휠에서만 설치 (네트워크 미사용)"""
+    try:
+        import duckdb
+    except ImportError:
+        if not os.path.isdir(wheel_dir):
+            raise SystemExit(f"duckdb is not installed and no wheel directory at {wheel_dir}; "
+                             "install pipelines/requirements.txt")
+        print(f"Installing duckdb from pinned wheels in {wheel_dir}")
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "--quiet", "--no-index",
+                               "--find-links", wheel_dir, "duckdb"])
+        import duckdb
+    return duckdb
+
+
+def run_sql_extract(sql: str, parquet_dir: str, split_key: str = "id") -> pd.DataFrame:
+    """로컬 Parquet 디렉터리를 offline_store 뷰로 노출하고 SQL 실행
+
+    DuckDB 가 Parquet 를 직접 스캔하므로 WHERE 조건과 사용 컬럼이 파일/행 그룹
+    읽기 단계로 내려간다(predicate/projection pushdown). 결과는 label(또는 click)과
+    FEATURE_COLUMNS 컬럼을 포함해야 한다.
+    """
+    duckdb = import_duckdb()
+    pattern = os.path.join(os.path.abspath(parquet_dir), "**", "*.parquet").replace("'", "''")
+    con = duckdb.connect()
+    try:
+        con.execute(f"PRAGMA threads={os.cpu_count() or 1}")
+        con.execute(
+            f"CREATE VIEW {SQL_SOURCE_VIEW} AS "
+            f"SELECT * FROM read_parquet('{pattern}', hive_partitioning = true, union_by_name = true)"
+        )
+        result = con.execute(sql).fetchdf()
+    finally:
+        con.close()
+
+    label_col = "label" if "label" in result.columns else "click"
+    missing = [c for c in [label_col] + FEATURE_COLUMNS if c not in result.columns]
+    if missing:
+        raise ValueError(f"SQL result is missing required columns: {missing}")
+    result = result.dropna(subset=[label_col] + FEATURE_COLUMNS)
+    print(f"SQL extraction returned {len(result)} rows")
+    return pd.DataFrame({
+        "label": result[label_col].astype(int).to_numpy(),
+        **{name: result[name].astype(int).to_numpy() for name in FEATURE_COLUMNS},
+        **{name: category_text(result[name]).to_numpy(dtype=object, na_value=None) for name in CATEGORICAL_COLUMNS if name in result.columns},
+        **({ID_COLUMN: result[ID_COLUMN].to_numpy()} if ID_COLUMN in result.columns else {}),
+        **({SPLIT_KEY_COLUMN: result[split_key].to_numpy()} if split_key in result.columns else {}),
+    })
+
+
+# CSV 컬럼 역할별 허용 이름 (소문자, 우선순위 순)
+CSV_COLUMN_ALIASES = {
+    "gender": ("gender", "sex", "is_male"),
+    "age": ("age", "user_age"),
+    "device": ("device_type", "device", "platform", "is_mobile"),
+    "hour": ("hour", "hour_of_day", "time_of_day"),
+    "ad_position": ("ad_position", "position", "ad_slot"),
+    "browsing_history": ("browsing_history", "browsing_category", "interest"),
+    "timestamp": ("timestamp", "event_time", "time"),
+    "click": ("clicked", "click", "label", "target", "y", "is_click"),
+    "id": ("id", "record_id"),
+}
+# "Afternoon" 같은 시간대 문자열 → 대표 시각
+TIME_OF_DAY_HOURS = {"morning": 9, "afternoon": 14, "evening": 18, "night": 22}
+CSV_CHUNK_ROWS = 250_000
+# 결정적 분할: 분할 키 해시를 이 개수의 버킷으로 나눠 비율만큼 학습에 배정
+SPLIT_BUCKETS = 10_000
+SPLIT_KEY_COLUMN = "_split_key"
+# 기준선 프로파일용 학습 행 표본 크기 (스트리밍 중 전체 학습 분할을 메모리에 두지 않음)
+PROFILE_SAMPLE_ROWS = 200_000
+
+
+def resolve_csv_columns(header) -> dict:
+    """헤더 → {역할: 실제 컬럼명}"""
+    cols = {c.lower(): c for c in header}
+    resolved = {}
+    for role, names in CSV_COLUMN_ALIASES.items():
+        found = next((cols[n] for n in names if n in cols), None)
+        if found is not None:
+            resolved[role] = found
+    return resolved
+
+
+def iter_csv_chunks(path: str, chunk_rows: int = CSV_CHUNK_ROWS, split_key: str = "id"):
+    """필요한 컬럼만, 표본으로 고정한 dtype 으로 청크 단위 읽기 (C 파서)
+
+    숫자 컬럼은 float32, 문자열 컬럼은 category 로 읽어 청크당 메모리를 줄인다.
+    반환: (컬럼 역할 매핑, 청크 이터레이터)
+    """
+    sample = pd.read_csv(path, nrows=1000, engine="c")
+    roles = resolve_csv_columns(sample.columns)
+    key_col = {c.lower(): c for c in sample.columns}.get(split_key.lower())
+    if key_col is not None:
+        roles["split_key"] = key_col
+    usecols = sorted(set(roles.values()))
+    dtypes = {
+        c: ("float32" if pd.api.types.is_numeric_dtype(sample[c]) and sample[c].dtype != bool else "category")
+        for c in usecols
+    }
+    for c in {key_col, roles.get("id")} - {None}:
+        # 식별자는 정밀도 손실 없이 문자열로 (분할 해시 입력)
+        dtypes[c] = "string"
+    return roles, pd.read_csv(path, usecols=usecols, dtype=dtypes, chunksize=chunk_rows, engine="c")
+
+
+def _binary(series: pd.Series, truthy) -> np.ndarray:
+    """숫자/불리언은 그대로, 문자열은 truthy 목록 포함 여부로 0/1"""
+    if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+        return series.fillna(0).to_numpy(dtype=np.int64)
+    text = series.astype(str).str.strip().str.lower()
+    numeric = pd.to_numeric(text, errors="coerce")
+    return np.where(numeric.notna(), numeric.fillna(0), text.isin(truthy)).astype(np.int64)
+
+
+def normalize_csv_chunk(raw: pd.DataFrame, roles: dict) -> pd.DataFrame:
+    """원본 CSV 청크 → label, gender, age, device, hour (정수, 결측은 기본값) + 범주형 원본 문자열"""
+    n = len(raw)
+    gender = _binary(raw[roles["gender"]], ("male", "true")) if "gender" in roles else np.zeros(n, dtype=np.int64)
+    age = (pd.to_numeric(raw[roles["age"]], errors="coerce").fillna(30).to_numpy(dtype=np.int64)
+           if "age" in roles else np.full(n, 30, dtype=np.int64))
+    device = (_binary(raw[roles["device"]], ("mobile", "smartphone", "true"))
+              if "device" in roles else np.zeros(n, dtype=np.int64))
+    if "hour" in roles:
+        hour_raw = raw[roles["hour"]]
+        if pd.api.types.is_numeric_dtype(hour_raw):
+            hour = hour_raw.fillna(12).to_numpy(dtype=np.int64)
+        else:
+            hour = hour_raw.astype(str).str.lower().map(TIME_OF_DAY_HOURS).fillna(12).to_numpy(dtype=np.int64)
+    elif "timestamp" in roles:
+        hour = pd.to_datetime(raw[roles["timestamp"]], errors="coerce").dt.hour.fillna(0).to_numpy(dtype=np.int64)
+    else:
+        hour = np.full(n, 12, dtype=np.int64)
+    click = _binary(raw[roles["click"]], ("true", "yes")) if "click" in roles else np.zeros(n, dtype=np.int64)
+    out = pd.DataFrame({"label": click, "gender": gender, "age": age, "device": device, "hour": hour})
+    for name in CATEGORICAL_COLUMNS:
+        if name in roles:
+            out[name] = category_text(raw[roles[name]]).to_numpy(dtype=object, na_value=None)
+    if "id" in roles:
+        out[ID_COLUMN] = raw[roles["id"]].to_numpy()
+    if "split_key" in roles:
+        out[SPLIT_KEY_COLUMN] = raw[roles["split_key"]].to_numpy()
+    return out
+
+
+def hash_split_mask(keys, train_fraction: float) -> np.ndarray:
+    """분할 키의 고정 해시(pd.util.hash_array, 프로세스/실행 간 동일) → 학습 여부
+
+    같은 키는 항상 같은 쪽에 배정되므로 행 추가/증분 실행에도 검증 세트가 학습으로
+    새지 않고, 그룹 키(세션/사용자)를 쓰면 한 그룹이 두 분할에 걸치지 않는다.
+    """
+    hashed = pd.util.hash_array(np.asarray(keys).astype(str).astype(object))
+    return (hashed % SPLIT_BUCKETS) < int(round(train_fraction * SPLIT_BUCKETS))
+
+
+def interchange_schema():
+    """단계 간 교환 포맷(Parquet) 스키마: 레코드 식별자 + 라벨 + 학습 특성 (타입 고정, 범주형은 결측 허용 문자열)"""
+    import pyarrow as pa
+    return pa.schema([
+        (ID_COLUMN, pa.string()),
+        ("label", pa.int8()),
+        ("gender", pa.int8()),
+        ("age", pa.int16()),
+        ("device", pa.int8()),
+        ("hour", pa.int8()),
+        *[(name, pa.string()) for name in CATEGORICAL_COLUMNS],
+    ])
+
+
+class SplitWriter:
+    """정규화된 청크를 train/validation Parquet 에 행 그룹 단위로 이어 쓰는 스트리밍 분할기
+
+    청크에 SPLIT_KEY_COLUMN 이 있으면 그 값으로, 없으면 id(또는 행 내용 해시)로 분할한다.
+    id 가 없는 입력(합성 데이터 등)은 행 내용 해시를 id 로 쓴다.
+    여러 스레드가 동시에 write() 해도 안전하다. 기준선 프로파일을 위해 학습 행의
+    균등 표본(무작위 키 하위 k개)만 메모리에 유지한다.
+    """
+
+    def __init__(self, out_dir: str, train_fraction: float = 0.8, seed: int = 42,
+                 sample_rows: int = PROFILE_SAMPLE_ROWS):
+        import pyarrow.parquet as pq
+        self.train_fraction = train_fraction
+        self.sample_rows = sample_rows
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+        self._schema = interchange_schema()
+        self._train = pq.ParquetWriter(os.path.join(out_dir, "train", "data.parquet"), self._schema)
+        self._val = pq.ParquetWriter(os.path.join(out_dir, "validation", "data.parquet"), self._schema)
+        self._sample = None
+        self.train_rows = 0
+        self.val_rows = 0
+
+    def _table(self, frame: pd.DataFrame):
+        import pyarrow as pa
+        return pa.Table.from_pandas(frame[self._schema.names], schema=self._schema, preserve_index=False)
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        if ID_COLUMN not in chunk.columns:
+            row_hash = pd.util.hash_pandas_object(chunk[["label"] + FEATURE_COLUMNS], index=False).to_numpy()
+            chunk = chunk.assign(**{ID_COLUMN: row_hash.astype(str)})
+        chunk = chunk.assign(**{ID_COLUMN: chunk[ID_COLUMN].astype(str)})
+        # 원천에 없는 범주형 컬럼은 결측으로 채워 스키마 유지
+        chunk = chunk.assign(**{name: None for name in CATEGORICAL_COLUMNS if name not in chunk.columns})
+        keys = chunk[SPLIT_KEY_COLUMN if SPLIT_KEY_COLUMN in chunk.columns else ID_COLUMN].to_numpy()
+        is_train = hash_split_mask(keys, self.train_fraction)
+        train, val = chunk[is_train], chunk[~is_train]
+        train_table, val_table = self._table(train), self._table(val)
+        with self._lock:
+            self._train.write_table(train_table)
+            self._val.write_table(val_table)
+            self.train_rows += len(train)
+            self.val_rows += len(val)
+            keyed = train[["label"] + FEATURE_COLUMNS].assign(_key=self._rng.random(len(train)))
+            pool = keyed if self._sample is None else pd.concat([self._sample, keyed], ignore_index=True)
+            self._sample = pool.nsmallest(self.sample_rows, "_key") if len(pool) > self.sample_rows else pool
+
+    def profile_sample(self) -> pd.DataFrame:
+        return self._sample.drop(columns="_key") if self._sample is not None else pd.DataFrame()
+
+    def close(self) -> None:
+        self._train.close()
+        self._val.close()
+        print(f"Wrote train={self.train_rows} validation={self.val_rows} rows")
+
+
+def stream_csv_file(path: str, writer: SplitWriter, chunk_rows: int = CSV_CHUNK_ROWS,
+                    split_key: str = "id") -> int:
+    roles, chunks = iter_csv_chunks(path, chunk_rows, split_key)
+    rows = 0
+    for raw in chunks:
+        writer.write(normalize_csv_chunk(raw, roles))
+        rows += len(raw)
+    return rows
+
+
+def stream_csv_from_s3(s3c, csv_uri: str, writer: SplitWriter, chunk_rows: int = CSV_CHUNK_ROWS,
+                       split_key: str = "id", max_workers: int = 0) -> int:
+    """단일 CSV 또는 CSV prefix(여러 파일 병렬) → 청크 스트리밍 분할. 반환: 읽은 행 수
+
+    파일은 로컬 디스크로 내려받은 뒤 청크로 읽으므로 메모리는 입력 크기와 무관하다.
+    """
+    parsed = urlparse(csv_uri)
+    bucket, key = parsed.netloc, parsed.path.lstrip("/")
+    if key.lower().endswith(".csv"):
+        keys = [key]
+    else:
+        keys = []
+        for page in s3c.get_paginator("list_objects_v2").paginate(Bucket=bucket, Prefix=key):
+            keys.extend(o["Key"] for o in page.get("Contents", []) if o["Key"].lower().endswith(".csv"))
+        if not keys:
+            raise FileNotFoundError(f"No CSV files under {csv_uri}")
+
+    def process(k):
+        with tempfile.NamedTemporaryFile(suffix=".csv") as tmp:
+            s3c.download_file(bucket, k, tmp.name)
+            return stream_csv_file(tmp.name, writer, chunk_rows, split_key)
+
+    workers = max_workers or min(len(keys), os.cpu_count() or 1)
+    print(f"Streaming {len(keys)} CSV file(s) from {csv_uri} with {workers} worker(s)")
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(process, keys))
 
 
 def main():
     ap = argparse.ArgumentParser()
-    ap.add_argument("--s3", required=True)
+    ap.add_argument("--s3", default="", help="Pipeline prefix URI (required for --incremental)")
     ap.add_argument("--csv", default="")
     ap.add_argument("--use-feature-store", default="false")
     ap.add_argument("--feature-group-name", default="")
+    ap.add_argument("--incremental", default="false")
+    ap.add_argument("--lookback-hours", type=int, default=24)
+    ap.add_argument("--sql", default="", help=f"SQL over the '{SQL_SOURCE_VIEW}' view (enables SQL extraction)")
+    ap.add_argument("--offline-dir", default="", help="Local Parquet directory for --sql (skips Feature Store)")
+    ap.add_argument("--sql-since", default="",
+                    help="ISO timestamp; --sql only downloads offline-store partitions from this event time on")
+    ap.add_argument("--output-dir", default="/opt/ml/processing")
+    ap.add_argument("--interaction-group-name", default="",
+                    help="User-interaction Feature Group; writes point-in-time labeled interactions")
+    ap.add_argument("--behavior-group-name", default="",
+                    help="Behavior-aggregate Feature Group holding the checkpoints joined as of each label")
+    ap.add_argument("--csv-chunk-rows", type=int, default=CSV_CHUNK_ROWS)
+    ap.add_argument("--split-key", default="id", help="Column hashed for the train/validation split (e.g. id, session_id, user_id)")
+    ap.add_argument("--train-fraction", type=float, default=0.8)
     args = ap.parse_args()
 
-    os.makedirs("/opt/ml/processing/train", exist_ok=True)
-    os.makedirs("/opt/ml/processing/validation", exist_ok=True)
+    out = args.output_dir
+    os.makedirs(os.path.join(out, "train"), exist_ok=True)
+    os.makedirs(os.path.join(out, "validation"), exist_ok=True)
+    os.makedirs(os.path.join(out, "interactions"), exist_ok=True)
 
     # Resolve AWS region explicitly to avoid NoRegionError inside processing containers
     region = os.environ.get("AWS_REGION") or os.environ.get("AWS_DEFAULT_REGION")
@@ -27,14 +697,26 @@ def main():
             region = boto3.session.Session().region_name
         except Exception:
             region = None
-    if not region:
+    if not region and not args.offline_dir:
         raise SystemExit("AWS region not found in environment; set AWS_REGION or AWS_DEFAULT_REGION")
 
     session = boto3.session.Session(region_name=region)
-    s3c = session.client("s3")
+    s3c = session.client("s3") if region else None
 
     df = None
-    if args.use_feature_store.lower() == "true" and args.feature_group_name:
+    if args.sql and args.offline_dir:
+        # 로컬 실행: 내보낸 오프라인 스토어 디렉터리에 같은 SQL 적용
+        df = run_sql_extract(args.sql, args.offline_dir, args.split_key)
+    elif args.sql and args.feature_group_name:
+        sm = session.client("sagemaker")
+        desc = sm.describe_feature_group(FeatureGroupName=args.feature_group_name)
+        resolved_s3_uri = desc["OfflineStoreConfig"]["S3StorageConfig"]["ResolvedOutputS3Uri"]
+        with tempfile.TemporaryDirectory() as parquet_dir:
+            n_files = download_parquet_tree(s3c, resolved_s3_uri, parquet_dir, since=args.sql_since)
+            print(f"Downloaded {n_files} parquet files from {resolved_s3_uri}"
+                  f"{f' since {args.sql_since}' if args.sql_since else ''} for SQL extraction")
+            df = run_sql_extract(args.sql, parquet_dir, args.split_key)
+    elif args.use_feature_store.lower() == "true" and args.feature_group_name:
         print(f"Using Feature Store with Feature Group: {args.feature_group_name}")
         sm = session.client("sagemaker")
         
@@ -52,45 +734,28 @@ def main():
             
             if resolved_s3_uri:
                 print(f"Feature Store S3 path: {resolved_s3_uri}")
-                # S3에서 파케트 파일들 목록 가져오기
-                s3_uri_parts = resolved_s3_uri.replace("s3://", "").split("/", 1)
-                bucket = s3_uri_parts[0]
-                prefix = s3_uri_parts[1] if len(s3_uri_parts) > 1 else ""
-                
-                # S3에서 파케트 파일 찾기
-                s3_paginator = s3c.get_paginator('list_objects_v2')
-                parquet_files = []
-                for page in s3_paginator.paginate(Bucket=bucket, Prefix=prefix):
-                    for obj in page.get('Contents', []):
-                        if obj['Key'].endswith('.parquet'):
-                            parquet_files.append(obj['Key'])
-                            if len(parquet_files) >= 5:  # 최대 5개 파일만 처리
-                                break
-                    if len(parquet_files) >= 5:
-                        break
-                
-                if parquet_files:
-                    print(f"Found {len(parquet_files)} parquet files, using first one for sampling")
-                    # 첫 번째 파케트 파일 다운로드
-                    tmp = tempfile.NamedTemporaryFile(delete=False, suffix='.parquet')
-                    s3c.download_file(bucket, parquet_files[0], tmp.name)
-                    
-                    # 파케트 파일 읽기
-                    raw = pd.read_parquet(tmp.name)
-                    print(f"Loaded {len(raw)} records from Feature Store")
-                    
-                    # 필요한 컬럼 추출 및 변환
-                    df = pd.DataFrame({
-                        "label": raw["click"].astype(int),
-                        0: raw["gender"].astype(int),
-                        1: raw["age"].astype(int), 
-                        2: raw["device"].astype(int),
-                        3: raw["hour"].astype(int)
-                    })
-                    print(f"Processed {len(df)} records for training")
+                # 오프라인 스토어 병렬 스캔 + id 별 최신 레코드 유지 (증분 모드는 워터마크 이후 파일만)
+                if args.incremental.lower() == "true" and args.s3:
+                    raw = read_offline_store_incremental(
+                        s3c, resolved_s3_uri, f"{args.s3.rstrip('/')}/extract/state", args.lookback_hours,
+                        extra_columns=[args.split_key] + CATEGORICAL_COLUMNS
+                    )
                 else:
-                    print("No parquet files found in Feature Store, falling back to CSV")
-                    raise FileNotFoundError("No data files found")
+                    raw = read_offline_store(s3c, resolved_s3_uri, extra_columns=[args.split_key] + CATEGORICAL_COLUMNS)
+                print(f"Loaded {len(raw)} latest records from Feature Store")
+
+                # 필요한 컬럼 추출 및 변환
+                df = pd.DataFrame({
+                    "label": raw["click"].astype(int),
+                    "gender": raw["gender"].astype(int),
+                    "age": raw["age"].astype(int),
+                    "device": raw["device"].astype(int),
+                    "hour": raw["hour"].astype(int),
+                    ID_COLUMN: raw["id"],
+                    SPLIT_KEY_COLUMN: raw[args.split_key if args.split_key in raw.columns else "id"],
+                    **{name: category_text(raw[name]).to_numpy(dtype=object, na_value=None) for name in CATEGORICAL_COLUMNS if name in raw.columns},
+                })
+                print(f"Processed {len(df)} records for training")
             else:
                 print("No resolved S3 URI found for Feature Store")
                 raise ValueError("Feature Store not properly configured")
@@ -104,96 +769,70 @@ def main():
             else:
                 print("No CSV fallback available, using synthetic data")
     
-    # CSV 처리 로직은 그대로 유지
-    if df is None and args.csv and args.csv.startswith("s3://"):
-        u = urlparse(args.csv)
-        b = u.netloc
-        k = u.path.lstrip("/")
-        tmp = tempfile.NamedTemporaryFile(delete=False)
-        try:
-            s3c.download_file(b, k, tmp.name)
-            raw = pd.read_csv(tmp.name)
-            cols = {c.lower(): c for c in raw.columns}
-            def col(*names):
-                for n in names:
-                    if n in cols:
-                        return cols[n]
-                return None
-            gender_col = col("gender", "sex", "is_male")
-            gender = raw[gender_col] if gender_col else pd.Series(0, index=raw.index)
-            if str(gender.dtype) == "bool":
-                gender = gender.astype(int)
-            elif gender.dtype == "object":
-                # Convert Male/Female to 1/0
-                gender = (gender.str.lower() == "male").astype(int)
-            
-            age_col = col("age", "user_age")
-            age = raw[age_col] if age_col else pd.Series(30, index=raw.index)
-            
-            device_col = col("device_type", "device", "platform", "is_mobile")
-            device = raw[device_col] if device_col else pd.Series(0, index=raw.index)
-            if device is not None and str(device.dtype) == "bool":
-                device = device.astype(int)
-            elif device.dtype == "object":
-                # Convert Desktop/Mobile to 1/0
-                device = (device.str.lower().isin(["mobile", "smartphone"])).astype(int)
-                
-            hourcol = col("hour", "hour_of_day", "time_of_day")
-            ts = col("timestamp", "event_time", "time")
-            if ts and hourcol is None:
-                dt = pd.to_datetime(raw[ts], errors="coerce")
-                hour = dt.dt.hour.fillna(0).astype(int)
-            elif hourcol:
-                hour_data = raw[hourcol]
-                if hour_data.dtype == "object":
-                    # Convert time strings like "Afternoon", "Morning" to hours
-                    time_map = {"morning": 9, "afternoon": 14, "evening": 18, "night": 22}
-                    hour = hour_data.str.lower().map(time_map).fillna(12).astype(int)
-                else:
-                    hour = hour_data.astype(int)
-            else:
-                hour = pd.Series(12, index=raw.index)
-                
-            click_col = col("clicked", "click", "label", "target", "y", "is_click")
-            click = raw[click_col].astype(int) if click_col else pd.Series(0, index=raw.index)
-            
-            # Handle missing values before converting to int
-            gender = gender.fillna(0).astype(int)
-            age = age.fillna(30).astype(int)  # Default age 30
-            device = device.fillna(0).astype(int)  # Default device 0
-            hour = hour.fillna(12).astype(int)  # Default hour 12
-            
-            out = pd.DataFrame({"label": click, 0: gender, 1: age, 2: device, 3: hour})
-            df = out
-        except ClientError as e:
-            code = (e.response.get("Error") or {}).get("Code")
-            print(f"CSV download failed from {args.csv}: {e}")
-            if code in {"404", "NotFound", "NoSuchKey"}:
+    streamed = False
+    writer = SplitWriter(out, args.train_fraction)
+    try:
+        if df is None and args.csv and args.csv.startswith("s3://"):
+            # 단일 CSV 또는 CSV prefix 를 청크 단위로 정규화하며 바로 분할 기록
+            try:
+                stream_csv_from_s3(s3c, args.csv, writer, args.csv_chunk_rows, args.split_key)
+                streamed = True
+            except ClientError as e:
+                code = (e.response.get("Error") or {}).get("Code")
+                print(f"CSV download failed from {args.csv}: {e}")
+                if code not in {"404", "NotFound", "NoSuchKey"}:
+                    raise
                 print("CSV not found in S3, generating synthetic data instead.")
-                df = None
-            else:
-                raise
+            except Exception as e:
+                print(f"CSV processing failed: {e}")
+            if not streamed:
+                # 일부만 기록된 출력은 버리고 새로 작성
+                writer.close()
+                writer = SplitWriter(out, args.train_fraction)
+        if df is None and not streamed:
+            print("Falling back to synthetic data generation.")
+            n = 1000
+            rng = np.random.default_rng(42)
+            gender = rng.integers(0, 2, size=n)
+            age = rng.integers(16, 71, size=n)
+            device = rng.integers(0, 2, size=n)
+            hour = rng.integers(0, 24, size=n)
+            position = rng.integers(0, 3, size=n)
+            night = ((hour >= 20) | (hour <= 2)).astype(int)
+            logit = -3.0 + 0.8 * gender + 0.03 * age + 0.5 * device + 0.4 * night + 0.3 * (position == 0)
+            p = 1 / (1 + np.exp(-logit))
+            y = (rng.random(n) < p).astype(int)
+            df = pd.DataFrame({
+                "label": y, "gender": gender, "age": age, "device": device, "hour": hour,
+                "ad_position": np.array(["Top", "Side", "Bottom"])[position],
+                "browsing_history": rng.choice(["Shopping", "News", "Entertainment", "Education", "Social Media"], size=n),
+            })
+        if df is not None:
+            writer.write(df)
+    finally:
+        writer.close()
+    write_baseline_profile(writer.profile_sample(), os.path.join(out, "baseline"),
+                           rows=writer.train_rows)
+
+    # 실제 클릭 라벨 + 라벨 시점의 행동 집계 (추론 앱 5개 특성 순서). 03_preprocess 가 학습 분할에 추가한다.
+    # 하위 단계 입력이 비지 않도록 라벨이 없을 때도 빈 파일을 기록
+    interactions = pd.DataFrame({ID_COLUMN: pd.Series(dtype=str), "label": pd.Series(dtype=int),
+                                 **{name: pd.Series(dtype=np.float32) for name in INTERACTION_FEATURES}})
+    if args.interaction_group_name and s3c is not None:
+        try:
+            sm = session.client("sagemaker")
+
+            def offline_uri(name):
+                return sm.describe_feature_group(FeatureGroupName=name)["OfflineStoreConfig"]["S3StorageConfig"]["ResolvedOutputS3Uri"]
+
+            labels = read_history(s3c, offline_uri(args.interaction_group_name), LABEL_COLUMNS, LABEL_REQUEST_TYPE)
+            checkpoints = pd.DataFrame(columns=CHECKPOINT_COLUMNS)
+            if args.behavior_group_name:
+                checkpoints = read_history(s3c, offline_uri(args.behavior_group_name), CHECKPOINT_COLUMNS)
+            interactions = point_in_time_join(labels, checkpoints)
         except Exception as e:
-            print(f"CSV processing failed: {e}")
-            df = None
-    if df is None:
-        print("Falling back to synthetic data generation.")
-        n = 1000
-        rng = np.random.default_rng(42)
-        gender = rng.integers(0, 2, size=n)
-        age = rng.integers(16, 71, size=n)
-        device = rng.integers(0, 2, size=n)
-        hour = rng.integers(0, 24, size=n)
-        night = ((hour >= 20) | (hour <= 2)).astype(int)
-        logit = -3.0 + 0.8 * gender + 0.03 * age + 0.5 * device + 0.4 * night
-        p = 1 / (1 + np.exp(-logit))
-        y = (rng.random(n) < p).astype(int)
-        X = np.column_stack([gender, age, device, hour])
-        df = pd.DataFrame(np.column_stack([y, X]))
-    train = df.sample(frac=0.8, random_state=42)
-    val = df.drop(train.index)
-    train.to_csv("/opt/ml/processing/train/data.csv", index=False, header=False)
-    val.to_csv("/opt/ml/processing/validation/data.csv", index=False, header=False)
+            print(f"Interaction label extraction skipped: {e}")
+    interactions.to_parquet(os.path.join(out, "interactions", "data.parquet"), index=False)
 
 
 if __name__ == "__main__":
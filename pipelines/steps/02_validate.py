@@ -1,17 +1,446 @@
+import argparse
+import json
 import os
+import sys
+from urllib.parse import urlparse
+import numpy as np
 import pandas as pd
 
+# 단계 간 교환 포맷의 식별자/라벨 컬럼 (01_extract 와 동일)
+ID_COLUMN = "id"
+LABEL_COLUMN = "label"
+BATCH_ROWS = 262_144
+# 고유값 수 추정(KMV 스케치) 크기: 상대 오차 약 1/sqrt(k)
+KMV_SIZE = 4096
+# 식별자 중복 추정에 보관하는 해시 표본의 최대 고유값 수. 넘치면 해시 임계값을 절반으로 낮춰
+# 표본을 줄인다(같은 id 는 항상 함께 포함/제외되므로 표본 안의 중복은 정확, 전체는 표본 비율로 환산)
+DUPLICATE_SAMPLE_SIZE = 65_536
+# 이 개수 이하의 고유값을 가진 컬럼은 값별 빈도를 그대로 기록
+MAX_TRACKED_VALUES = 64
+# 수치 컬럼 히스토그램의 최대 구간 수 (초과 시 구간 폭을 2배씩 넓힘)
+HIST_MAX_BINS = 256
+# PSI 계산 구간 수 (이전 스냅샷 분포의 분위수 경계)
+PSI_BINS = 10
+PSI_EPSILON = 1e-4
+Z_95 = 1.96
+
+# 선언적 검증 규칙 (--rules 로 교체 가능). 표본 모드에서는 95% 신뢰구간 전체가
+# 임계값을 벗어날 때만 위반으로 판정한다. 식별자 중복률 규칙은 원본 CSV id 가 행 단위로
+# 고유하지 않고(예: 10000행에 4000개) 동일 행은 같은 내용 해시 id 를 가지므로 기본값에서 제외.
+# id 가 고유 키인 데이터는 --rules 에 {"column": "id", "max_duplicate_rate": 0.01} 처럼 추가한다.
+DEFAULT_RULES = [
+    {"dataset": "train", "min_rows": 100},
+    {"dataset": "validation", "min_rows": 20},
+    {"required_columns": [ID_COLUMN, LABEL_COLUMN, "gender", "age", "device", "hour"]},
+    {"column": LABEL_COLUMN, "max_null_rate": 0.0, "allowed_values": [0, 1], "min_mean": 0.001, "max_mean": 0.999},
+    {"column": "gender", "max_null_rate": 0.0, "allowed_values": [0, 1]},
+    {"column": "device", "max_null_rate": 0.0, "allowed_values": [0, 1]},
+    {"column": "age", "max_null_rate": 0.0, "min": 0, "max": 120},
+    {"column": "hour", "max_null_rate": 0.0, "min": 0, "max": 23},
+]
+
+
+def _hash(values: np.ndarray) -> np.ndarray:
+    return pd.util.hash_array(values.astype(str).astype(object) if values.dtype == object else values)
+
+
+class Histogram:
+    """2의 거듭제곱 폭 격자에 맞춘 가변 해상도 히스토그램
+
+    구간 수가 HIST_MAX_BINS 를 넘으면 폭을 2배 이상으로 넓혀 다시 합친다. 격자가 항상
+    0 기준 2의 거듭제곱 배수이므로 서로 다른 실행의 히스토그램도 같은 경계에서 비교된다.
+    width == 0 이면 값 자체가 구간 키(정수형 특성은 대부분 그대로 유지됨).
+    """
+
+    def __init__(self, max_bins: int = HIST_MAX_BINS):
+        self.max_bins = max_bins
+        self.width = 0.0
+        self.keys = np.array([], dtype=np.float64)
+        self.counts = np.array([], dtype=np.int64)
+
+    def _bucket(self, values: np.ndarray) -> np.ndarray:
+        return values if self.width == 0 else np.floor(values / self.width) * self.width
+
+    @staticmethod
+    def _merge(keys: np.ndarray, counts: np.ndarray) -> tuple:
+        keys, inverse = np.unique(keys, return_inverse=True)
+        return keys, np.bincount(inverse, weights=counts, minlength=keys.size).astype(np.int64)
+
+    def update(self, values: np.ndarray) -> None:
+        keys, counts = np.unique(self._bucket(values), return_counts=True)
+        self.keys, self.counts = self._merge(np.concatenate([self.keys, keys]), np.concatenate([self.counts, counts]))
+        while self.keys.size > self.max_bins:
+            span = float(self.keys[-1] - self.keys[0])
+            self.width = max(self.width * 2, 2.0 ** np.ceil(np.log2(span / (self.max_bins // 2))))
+            self.keys, self.counts = self._merge(self._bucket(self.keys), self.counts)
+
+    def to_dict(self) -> dict:
+        return {"bin_width": self.width, "keys": self.keys.tolist(), "counts": self.counts.tolist()}
+
+
+class ColumnProfile:
+    """한 컬럼의 단일 패스 누적 통계 (배치 단위 벡터 연산)"""
+
+    def __init__(self, name: str, dtype: str, track_duplicates: bool = False):
+        self.name = name
+        self.dtype = dtype
+        self.numeric = dtype not in ("string", "object", "large_string")
+        self.count = 0
+        self.nulls = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.sum = 0.0
+        self.sumsq = 0.0
+        # 식별자 컬럼은 값별 빈도 대신 중복 검사만
+        self.value_counts = None if track_duplicates else {}
+        self.histogram = Histogram() if self.numeric and not track_duplicates else None
+        self._kmv = np.array([], dtype=np.uint64)
+        # 중복 추정용 해시 표본: 해시 < _dup_threshold 인 값의 {해시: 등장 횟수} (None 이면 중복 검사 안 함)
+        self._dup_threshold = 2**64 if track_duplicates else None
+        self._dup_keys = np.array([], dtype=np.uint64)
+        self._dup_counts = np.array([], dtype=np.int64)
+
+    def update(self, values: np.ndarray) -> None:
+        self.count += values.size
+        if self.numeric:
+            values = values.astype(np.float64, copy=False)
+            null = np.isnan(values)
+        else:
+            null = pd.isna(values)
+        self.nulls += int(null.sum())
+        present = values[~null]
+        if present.size == 0:
+            return
+        if self.numeric:
+            self.min = min(self.min, float(present.min()))
+            self.max = max(self.max, float(present.max()))
+            self.sum += float(present.sum())
+            self.sumsq += float(np.square(present).sum())
+            if self.histogram is not None:
+                self.histogram.update(present)
+        if self.value_counts is not None:
+            uniques, counts = np.unique(present, return_counts=True)
+            for value, c in zip(uniques.tolist(), counts.tolist()):
+                self.value_counts[value] = self.value_counts.get(value, 0) + c
+            if len(self.value_counts) > MAX_TRACKED_VALUES:
+                self.value_counts = None
+        hashes = _hash(present)
+        # KMV: 해시 최솟값 k개만 유지 (병합 가능, 메모리 고정)
+        self._kmv = np.unique(np.concatenate([self._kmv, hashes]))[:KMV_SIZE]
+        if self._dup_threshold is not None:
+            self._sample_duplicates(hashes)
+
+    def _sample_duplicates(self, hashes: np.ndarray) -> None:
+        if self._dup_threshold < 2**64:
+            hashes = hashes[hashes < np.uint64(self._dup_threshold)]
+        keys, inverse = np.unique(np.concatenate([self._dup_keys, hashes]), return_inverse=True)
+        weights = np.concatenate([self._dup_counts, np.ones(hashes.size, dtype=np.int64)])
+        counts = np.bincount(inverse, weights=weights, minlength=keys.size).astype(np.int64)
+        while keys.size > DUPLICATE_SAMPLE_SIZE:
+            self._dup_threshold //= 2
+            keep = keys < np.uint64(self._dup_threshold)
+            keys, counts = keys[keep], counts[keep]
+        self._dup_keys, self._dup_counts = keys, counts
+
+    @property
+    def duplicate_sample_rate(self) -> float:
+        return self._dup_threshold / 2**64 if self._dup_threshold is not None else 0.0
+
+    def distinct_estimate(self) -> int:
+        if self._kmv.size < KMV_SIZE:
+            return int(self._kmv.size)
+        kth = float(self._kmv[-1]) / float(np.iinfo(np.uint64).max)
+        return int((KMV_SIZE - 1) / kth)
+
+    def duplicate_count(self) -> int:
+        """중복 행 수 (표본이 줄지 않았으면 정확, 줄었으면 표본 중복 수 / 표본 비율)"""
+        if not self._dup_keys.size:
+            return 0
+        sampled = int(self._dup_counts.sum()) - int(self._dup_keys.size)
+        return int(round(sampled / self.duplicate_sample_rate))
+
+    def to_dict(self) -> dict:
+        present = self.count - self.nulls
+        out = {
+            "dtype": self.dtype,
+            "count": self.count,
+            "nulls": self.nulls,
+            "null_rate": self.nulls / self.count if self.count else 0.0,
+            "distinct_estimate": self.distinct_estimate(),
+        }
+        if self.numeric and present:
+            mean = self.sum / present
+            out.update({
+                "min": self.min,
+                "max": self.max,
+                "mean": mean,
+                "std": float(np.sqrt(max(self.sumsq / present - mean * mean, 0.0))),
+            })
+        if self.histogram is not None and present:
+            out["histogram"] = self.histogram.to_dict()
+        if self.value_counts is not None:
+            out["value_counts"] = {str(k): v for k, v in sorted(self.value_counts.items())}
+        if self._dup_threshold is not None:
+            out["duplicates"] = self.duplicate_count()
+            out["duplicate_rate"] = min(out["duplicates"] / present, 1.0) if present else 0.0
+            out["duplicate_sample_rate"] = self.duplicate_sample_rate
+        return out
+
+
+def iter_batches(directory: str):
+    """(스키마 {컬럼: 타입}, 배치 DataFrame 이터레이터). Parquet 우선, 헤더 없는 CSV 허용"""
+    parquet = os.path.join(directory, "data.parquet")
+    if os.path.exists(parquet):
+        import pyarrow.parquet as pq
+        pf = pq.ParquetFile(parquet)
+        schema = {f.name: str(f.type) for f in pf.schema_arrow}
+        return schema, (b.to_pandas() for b in pf.iter_batches(batch_size=BATCH_ROWS))
+    path = os.path.join(directory, "data.csv")
+    head = pd.read_csv(path, header=None, nrows=1000)
+    names = [LABEL_COLUMN] + [str(c) for c in head.columns[1:]]
+    schema = {n: ("double" if pd.api.types.is_numeric_dtype(head[c]) else "string") for n, c in zip(names, head.columns)}
+    return schema, pd.read_csv(path, header=None, names=names, chunksize=BATCH_ROWS)
+
+
+def profile_dataset(directory: str, sample_fraction: float = 1.0, seed: int = 7) -> dict:
+    """한 분할을 한 번 훑어 컬럼별 프로파일 생성. sample_fraction < 1 이면 id 해시 기반 표본"""
+    schema, batches = iter_batches(directory)
+    columns = {
+        name: ColumnProfile(name, dtype, track_duplicates=(name == ID_COLUMN))
+        for name, dtype in schema.items()
+    }
+    rows_seen = 0
+    rows_profiled = 0
+    threshold = int(sample_fraction * 2**32)
+    for batch in batches:
+        rows_seen += len(batch)
+        if sample_fraction < 1.0:
+            key = batch[ID_COLUMN].to_numpy() if ID_COLUMN in batch.columns else np.arange(rows_seen - len(batch), rows_seen)
+            # 같은 id 는 항상 같이 뽑히므로 중복 id 검사가 표본에서도 유효
+            keep = (_hash(np.asarray(key)) ^ np.uint64(seed)) % np.uint64(2**32) < threshold
+            batch = batch[keep]
+        rows_profiled += len(batch)
+        for name, column in columns.items():
+            column.update(batch[name].to_numpy())
+    return {
+        "rows": rows_seen,
+        "rows_profiled": rows_profiled,
+        "sample_fraction": sample_fraction,
+        "schema": schema,
+        "columns": {name: column.to_dict() for name, column in columns.items()},
+    }
+
+
+def proportion_bounds(rate: float, n: int, sampled: bool) -> tuple:
+    """비율 추정값의 95% 신뢰구간 (전수 조사면 구간 폭 0)"""
+    if not sampled or n == 0:
+        return rate, rate
+    half = Z_95 * np.sqrt(max(rate * (1 - rate), 1.0 / n) / n)
+    return max(0.0, rate - half), min(1.0, rate + half)
+
+
+def evaluate_rules(profiles: dict, rules: list) -> list:
+    """규칙 목록을 프로파일에 적용 → 위반 메시지 목록"""
+    violations = []
+    for rule in rules:
+        if "required_columns" in rule:
+            for ds, profile in profiles.items():
+                missing = [c for c in rule["required_columns"] if c not in profile["schema"]]
+                if missing:
+                    violations.append(f"{ds}: missing columns {missing}")
+            continue
+        if "dataset" in rule:
+            rows = profiles[rule["dataset"]]["rows"]
+            if rows < rule.get("min_rows", 0):
+                violations.append(f"{rule['dataset']}: rows {rows} < {rule['min_rows']}")
+            continue
+        name = rule["column"]
+        for ds, profile in profiles.items():
+            stats = profile["columns"].get(name)
+            if stats is None:
+                continue
+            sampled = profile["sample_fraction"] < 1.0
+            n = profile["rows_profiled"]
+            if "max_null_rate" in rule:
+                low, _ = proportion_bounds(stats["null_rate"], n, sampled)
+                if low > rule["max_null_rate"]:
+                    violations.append(f"{ds}.{name}: null_rate {stats['null_rate']:.4f} > {rule['max_null_rate']}")
+            if "min" in rule and stats.get("min", rule["min"]) < rule["min"]:
+                violations.append(f"{ds}.{name}: min {stats['min']} < {rule['min']}")
+            if "max" in rule and stats.get("max", rule["max"]) > rule["max"]:
+                violations.append(f"{ds}.{name}: max {stats['max']} > {rule['max']}")
+            if "allowed_values" in rule:
+                allowed = {str(float(v)) for v in rule["allowed_values"]} | {str(v) for v in rule["allowed_values"]}
+                seen = set((stats.get("value_counts") or {}).keys())
+                if "value_counts" not in stats or seen - allowed:
+                    violations.append(f"{ds}.{name}: values outside {rule['allowed_values']}")
+            if "mean" in stats and ("min_mean" in rule or "max_mean" in rule):
+                # 0/1 컬럼의 평균은 비율이므로 같은 신뢰구간 적용
+                low, high = proportion_bounds(stats["mean"], n, sampled)
+                if "min_mean" in rule and high < rule["min_mean"]:
+                    violations.append(f"{ds}.{name}: mean {stats['mean']:.4f} < {rule['min_mean']}")
+                if "max_mean" in rule and low > rule["max_mean"]:
+                    violations.append(f"{ds}.{name}: mean {stats['mean']:.4f} > {rule['max_mean']}")
+            if "max_duplicate_rate" in rule and "duplicate_rate" in stats:
+                low, _ = proportion_bounds(stats["duplicate_rate"], n, sampled)
+                if low > rule["max_duplicate_rate"]:
+                    violations.append(f"{ds}.{name}: duplicate_rate {stats['duplicate_rate']:.4f} > {rule['max_duplicate_rate']}")
+    return violations
+
+
+# ----- 스냅샷 간 분포 변화 -----
+
+def _cdf(histogram: dict, points: np.ndarray) -> np.ndarray:
+    """히스토그램의 누적 분포를 points 에서 평가 (구간 질량은 구간 하한에 있다고 봄)"""
+    keys = np.asarray(histogram["keys"], dtype=np.float64)
+    cum = np.cumsum(np.asarray(histogram["counts"], dtype=np.float64))
+    cum /= cum[-1]
+    idx = np.searchsorted(keys, points, side="right") - 1
+    return np.where(idx >= 0, cum[np.clip(idx, 0, None)], 0.0)
+
+
+def ks_statistic(reference: dict, current: dict) -> float:
+    """두 히스토그램 누적 분포의 최대 차이"""
+    points = np.union1d(reference["keys"], current["keys"])
+    return float(np.abs(_cdf(reference, points) - _cdf(current, points)).max())
+
+
+def population_stability_index(reference: dict, current: dict, bins: int = PSI_BINS) -> float:
+    """이전 분포의 분위수 경계로 나눈 구간별 비율 차이로 PSI 계산"""
+    keys = np.asarray(reference["keys"], dtype=np.float64)
+    cum = _cdf(reference, keys)
+    idx = np.clip(np.searchsorted(cum, np.arange(1, bins) / bins, side="left"), 0, keys.size - 1)
+    edges = np.unique(keys[idx])
+
+    def mass(histogram):
+        return np.diff(np.concatenate([[0.0], _cdf(histogram, edges), [1.0]]))
+
+    p = np.clip(mass(reference), PSI_EPSILON, None)
+    q = np.clip(mass(current), PSI_EPSILON, None)
+    return float(np.sum((q - p) * np.log(q / p)))
+
+
+def build_snapshot(profile: dict) -> dict:
+    """학습 분할 프로파일 → 다음 실행과 비교할 압축 스냅샷 (히스토그램·스케치·요약 통계만)"""
+    columns = profile["columns"]
+    label = columns.get(LABEL_COLUMN, {})
+    return {
+        "version": 1,
+        "created_at": pd.Timestamp.now(tz="UTC").isoformat(),
+        "rows": profile["rows"],
+        "rows_profiled": profile["rows_profiled"],
+        "label_rate": label.get("mean"),
+        "features": {
+            name: {k: stats[k] for k in ("histogram", "mean", "std", "null_rate", "distinct_estimate") if k in stats}
+            for name, stats in columns.items()
+            if name not in (ID_COLUMN, LABEL_COLUMN) and "histogram" in stats
+        },
+    }
+
+
+def compare_snapshots(previous: dict, current: dict, max_psi: float, max_ks: float,
+                      max_label_rate_delta: float) -> tuple:
+    """(특성별 PSI/KS · 라벨 비율 변화 리포트, 위반 메시지 목록). 임계값이 0 이하이면 해당 검사 생략"""
+    report = {"previous_created_at": previous.get("created_at"), "features": {}}
+    violations = []
+    for name, stats in current["features"].items():
+        before = previous.get("features", {}).get(name)
+        if before is None or not before.get("histogram", {}).get("keys"):
+            continue
+        psi = population_stability_index(before["histogram"], stats["histogram"])
+        ks = ks_statistic(before["histogram"], stats["histogram"])
+        report["features"][name] = {"psi": psi, "ks": ks}
+        if max_psi > 0 and psi > max_psi:
+            violations.append(f"shift.{name}: psi {psi:.4f} > {max_psi}")
+        if max_ks > 0 and ks > max_ks:
+            violations.append(f"shift.{name}: ks {ks:.4f} > {max_ks}")
+    if previous.get("label_rate") is not None and current.get("label_rate") is not None:
+        delta = current["label_rate"] - previous["label_rate"]
+        report["label_rate"] = {"previous": previous["label_rate"], "current": current["label_rate"], "delta": delta}
+        if max_label_rate_delta > 0 and abs(delta) > max_label_rate_delta:
+            violations.append(f"shift.{LABEL_COLUMN}: label rate delta {delta:+.4f} exceeds {max_label_rate_delta}")
+    return report, violations
+
+
+def load_snapshot(s3c, store_uri: str):
+    """저장소의 latest.json (없으면 None)"""
+    from botocore.exceptions import ClientError
+    parsed = urlparse(store_uri)
+    key = f"{parsed.path.strip('/')}/latest.json"
+    try:
+        return json.loads(s3c.get_object(Bucket=parsed.netloc, Key=key)["Body"].read())
+    except ClientError as e:
+        if (e.response.get("Error") or {}).get("Code") not in {"404", "NotFound", "NoSuchKey"}:
+            raise
+        print(f"No previous training snapshot at s3://{parsed.netloc}/{key}")
+        return None
+
+
+def save_snapshot(s3c, store_uri: str, snapshot: dict) -> None:
+    """시각별 이력 파일을 먼저 쓰고 latest.json 을 마지막에 갱신"""
+    parsed = urlparse(store_uri)
+    prefix = parsed.path.strip("/")
+    body = json.dumps(snapshot).encode("utf-8")
+    stamp = pd.Timestamp(snapshot["created_at"]).strftime("%Y%m%dT%H%M%SZ")
+    s3c.put_object(Bucket=parsed.netloc, Key=f"{prefix}/history/{stamp}.json", Body=body)
+    s3c.put_object(Bucket=parsed.netloc, Key=f"{prefix}/latest.json", Body=body)
+
+
+def s3_client():
+    import boto3
+    # Resolve AWS region explicitly to avoid NoRegionError inside processing containers
+    region = os.environ.get("AWS_REGION") or os.environ.get("AWS_DEFAULT_REGION") or boto3.session.Session().region_name
+    if not region:
+        raise SystemExit("AWS region not found in environment; set AWS_REGION or AWS_DEFAULT_REGION")
+    return boto3.session.Session(region_name=region).client("s3")
+
 
 def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rules", default="", help="JSON list of validation rules (replaces the defaults)")
+    ap.add_argument("--sample-fraction", type=float, default=1.0)
+    ap.add_argument("--snapshot-store", default="", help="S3 URI holding the previous training snapshot profile")
+    ap.add_argument("--max-psi", type=float, default=0.2)
+    ap.add_argument("--max-ks", type=float, default=0.1)
+    ap.add_argument("--max-label-rate-delta", type=float, default=0.05)
+    args = ap.parse_args()
+
     os.makedirs("/opt/ml/processing/report", exist_ok=True)
-    train = pd.read_csv("/opt/ml/processing/train/data.csv", header=None)
-    val = pd.read_csv("/opt/ml/processing/validation/data.csv", header=None)
-    assert train.shape[1] >= 2, "train columns < 2"
-    assert val.shape[1] == train.shape[1], "schema mismatch"
-    assert not train.isna().any().any(), "train contains NA"
-    assert not val.isna().any().any(), "validation contains NA"
+    profiles = {
+        "train": profile_dataset("/opt/ml/processing/train", args.sample_fraction),
+        "validation": profile_dataset("/opt/ml/processing/validation", args.sample_fraction),
+    }
+    rules = json.loads(args.rules) if args.rules.strip() else DEFAULT_RULES
+    violations = evaluate_rules(profiles, rules)
+    if profiles["train"]["schema"] != profiles["validation"]["schema"]:
+        violations.append("schema mismatch between train and validation")
+
+    # 이전 실행의 학습 스냅샷 프로파일과 비교 (원본 데이터는 읽지 않음)
+    snapshot = build_snapshot(profiles["train"])
+    shift = None
+    s3c = s3_client() if args.snapshot_store else None
+    if s3c is not None:
+        previous = load_snapshot(s3c, args.snapshot_store)
+        if previous is not None:
+            shift, shift_violations = compare_snapshots(
+                previous, snapshot, args.max_psi, args.max_ks, args.max_label_rate_delta)
+            violations.extend(shift_violations)
+
+    with open("/opt/ml/processing/report/profile.json", "w") as f:
+        json.dump({"datasets": profiles, "rules": rules, "shift": shift, "violations": violations}, f, indent=2)
     with open("/opt/ml/processing/report/summary.txt", "w") as f:
-        f.write(f"train={train.shape}, val={val.shape}\n")
+        f.write(f"train=({profiles['train']['rows']}, {len(profiles['train']['schema'])}), "
+                f"val=({profiles['validation']['rows']}, {len(profiles['validation']['schema'])})\n")
+        for v in violations:
+            f.write(f"VIOLATION: {v}\n")
+
+    if violations:
+        print("Data validation failed:", *violations, sep="\n  ")
+        sys.exit(1)
+    # 통과한 스냅샷만 다음 비교 기준으로 저장 (차단된 데이터가 기준을 덮어쓰지 않도록)
+    if s3c is not None:
+        save_snapshot(s3c, args.snapshot_store, snapshot)
+    print("Data validation passed")
 
 
 if __name__ == "__main__":
@@ -1,20 +1,208 @@
+import json
 import os
+import numpy as np
 import pandas as pd
 
+# 단계 간 교환 포맷의 식별자/라벨 컬럼 (01_extract 와 동일)
+ID_COLUMN = "id"
+LABEL_COLUMN = "label"
+# 이전 실행 산출물(헤더 없는 CSV)의 특성 순서
+LEGACY_FEATURE_COLUMNS = ["gender", "age", "device", "hour"]
 
-def preprocess(df: pd.DataFrame) -> pd.DataFrame:
+# 변환 정의: 수치(결측은 학습 중앙값), 분위수 구간화, 범주형 코드, 교차.
+# user_behavior_score 는 실제 클릭 라벨 행(01_extract 의 시점 기준 조인)에만 있으므로
+# 그 행이 있는 실행에서만 인코더가 생기고, 없는 학습 행은 중앙값으로 대체된다
+NUMERIC_FEATURES = ["gender", "age", "device", "hour", "user_behavior_score"]
+BUCKETIZED_FEATURES = {"age": 8, "hour": 6}
+CATEGORICAL_FEATURES = ["ad_position", "browsing_history"]
+CROSSED_FEATURES = [("device", "hour_bucket"), ("ad_position", "device")]
+# 학습 빈도가 이보다 낮은 범주는 미지(코드 0)로 취급
+MIN_CATEGORY_COUNT = 5
+MAX_CATEGORIES = 256
+# 추론 앱 요청 특성 이름 → 변환 입력 이름 (앱은 이 별칭으로 같은 아티팩트를 적용)
+INPUT_ALIASES = {"age": ["user_age"], "hour": ["time_of_day"]}
+# 추론 앱 입력 코드 → 학습 어휘 (화면 광고 위치 1~5: 헤더·사이드바·본문 중간·본문 하단·팝업,
+# 관심 분야 1~5). 아티팩트에 함께 저장해 앱과 학습(실제 클릭 라벨 행 포함)이 같은 규칙으로 변환
+INPUT_VALUE_MAPS = {
+    "ad_position": {"1": "Top", "2": "Side", "3": "Side", "4": "Bottom", "5": "Top"},
+    "browsing_history": {"1": "Shopping", "2": "News", "3": "Entertainment", "4": "Education", "5": "Social Media"},
+}
+TRANSFORM_FILE = "transform.json"
+# 01_extract 의 실제 클릭 라벨(추론 앱 특성 이름) → 교환 포맷 컬럼. Feature Group 에 없는 특성(gender/device)은 결측 대체
+INTERACTION_COLUMNS = {
+    "user_age": "age", "time_of_day": "hour", "ad_position": "ad_position", "browsing_history": "browsing_history",
+    "user_behavior_score": "user_behavior_score",
+}
+
+
+def read_split(directory: str) -> pd.DataFrame:
+    """단계 간 교환 포맷(Parquet) 우선, 이전 실행 산출물(헤더 없는 CSV)도 허용"""
+    parquet = os.path.join(directory, "data.parquet")
+    if os.path.exists(parquet):
+        return pd.read_parquet(parquet)
+    df = pd.read_csv(os.path.join(directory, "data.csv"), header=None)
+    return df.rename(columns=dict(enumerate([LABEL_COLUMN] + LEGACY_FEATURE_COLUMNS)))
+
+
+def read_interactions(directory: str) -> pd.DataFrame:
+    """실제 클릭 라벨 행 → 교환 포맷 컬럼 (파일이 없거나 비어 있으면 빈 DataFrame)"""
+    path = os.path.join(directory, "data.parquet")
+    if not os.path.exists(path):
+        return pd.DataFrame()
+    df = pd.read_parquet(path)
+    keep = [c for c in (ID_COLUMN, LABEL_COLUMN) if c in df.columns]
+    df = df[keep + [c for c in INTERACTION_COLUMNS if c in df.columns]].rename(columns=INTERACTION_COLUMNS)
+    # 앱이 기록한 숫자 코드 → 학습 어휘 문자열 (학습 분할과 합칠 때 같은 타입/값 공간)
+    for name in CATEGORICAL_FEATURES:
+        if name in df.columns:
+            df[name] = category_values(df[name], name).to_numpy(dtype=object, na_value=None)
     return df
 
 
+def category_keys(series: pd.Series) -> pd.Series:
+    """범주형 값 → 비교 키 (숫자 코드는 %g 형식, 빈 문자열은 결측). 추론 앱과 같은 규칙"""
+    if pd.api.types.is_numeric_dtype(series):
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        keys = pd.Series(np.char.mod("%g", values), index=series.index, dtype="string")
+        return keys.mask(np.isnan(values))
+    keys = series.astype("string").str.strip()
+    return keys.mask(keys == "")
+
+
+def category_values(series: pd.Series, name: str) -> pd.Series:
+    """비교 키 + 앱 입력 코드 매핑 (INPUT_VALUE_MAPS 에 없는 값은 그대로)"""
+    keys = category_keys(series)
+    mapping = INPUT_VALUE_MAPS.get(name)
+    return keys.replace(mapping) if mapping else keys
+
+
+class FeatureTransform:
+    """학습 분할에서 적합한 벡터화 특성 변환 (JSON 아티팩트로 직렬화)
+
+    인코더는 순서대로 적용되며 교차(cross)는 앞선 인코더 출력을 입력으로 쓴다.
+    범주형 코드 0 은 결측/미지 범주다. 추론 쪽(mlops_client/transform.py)이
+    같은 아티팩트를 읽어 온라인 요청을 동일하게 인코딩한다.
+    """
+
+    def __init__(self, encoders: list):
+        self.encoders = encoders
+
+    @property
+    def columns(self) -> list:
+        return [e["output"] for e in self.encoders]
+
+    @classmethod
+    def fit(cls, df: pd.DataFrame) -> "FeatureTransform":
+        encoders = []
+        for name in NUMERIC_FEATURES:
+            if name not in df.columns:
+                continue
+            values = pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+            fill = float(np.nanmedian(values)) if np.isfinite(values).any() else 0.0
+            encoders.append({"output": name, "kind": "numeric", "input": name, "fill": fill})
+            if name in BUCKETIZED_FEATURES:
+                filled = np.where(np.isnan(values), fill, values)
+                quantiles = np.linspace(0, 1, BUCKETIZED_FEATURES[name] + 1)[1:-1]
+                edges = np.unique(np.quantile(filled, quantiles)).tolist() if filled.size else []
+                encoders.append({"output": f"{name}_bucket", "kind": "bucket", "input": name, "fill": fill, "edges": edges})
+        for name in CATEGORICAL_FEATURES:
+            if name not in df.columns:
+                continue
+            counts = category_values(df[name], name).value_counts()
+            # 빈도 내림차순, 동률은 값 순서 (실행 간 결정적)
+            counts = counts[counts >= MIN_CATEGORY_COUNT].sort_index().sort_values(ascending=False, kind="stable")
+            vocabulary = [str(v) for v in counts.index[:MAX_CATEGORIES]]
+            if vocabulary:
+                encoders.append({"output": name, "kind": "category", "input": name, "vocabulary": vocabulary})
+        transform = cls(encoders)
+        encoded = transform._encode(df)
+        for left, right in CROSSED_FEATURES:
+            if left in encoded and right in encoded:
+                sizes = [transform._cardinality(n, encoded[n]) for n in (left, right)]
+                transform.encoders.append({"output": f"{left}_x_{right}", "kind": "cross", "inputs": [left, right], "sizes": sizes})
+        return transform
+
+    def _cardinality(self, name: str, codes: np.ndarray) -> int:
+        encoder = next(e for e in self.encoders if e["output"] == name)
+        if encoder["kind"] == "category":
+            return len(encoder["vocabulary"]) + 1
+        if encoder["kind"] == "bucket":
+            return len(encoder["edges"]) + 1
+        return int(np.nanmax(codes)) + 1 if codes.size else 1
+
+    def _encode(self, df: pd.DataFrame) -> dict:
+        n = len(df)
+        encoded = {}
+        for e in self.encoders:
+            kind = e["kind"]
+            if kind == "cross":
+                left, right = (encoded[name] for name in e["inputs"])
+                size_left, size_right = e["sizes"]
+                encoded[e["output"]] = (np.clip(left, 0, size_left - 1) * size_right + np.clip(right, 0, size_right - 1)).astype(np.float64)
+                continue
+            column = df[e["input"]] if e["input"] in df.columns else pd.Series([None] * n, index=df.index, dtype=object)
+            if kind == "category":
+                # 미지/결측은 get_indexer 가 -1 → 코드 0
+                codes = pd.Index(e["vocabulary"]).get_indexer(category_values(column, e["input"]).to_numpy(dtype=object, na_value=None)) + 1
+                encoded[e["output"]] = codes.astype(np.float64)
+                continue
+            values = pd.to_numeric(column, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+            values = np.where(np.isnan(values), e["fill"], values)
+            if kind == "bucket":
+                values = np.searchsorted(np.asarray(e["edges"], dtype=np.float64), values, side="right").astype(np.float64)
+            encoded[e["output"]] = values
+        return encoded
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        encoded = self._encode(df)
+        return pd.DataFrame({name: encoded[name] for name in self.columns}, index=df.index)
+
+    def to_dict(self) -> dict:
+        return {
+            "version": 1,
+            "created_at": pd.Timestamp.now(tz="UTC").isoformat(),
+            "columns": self.columns,
+            "aliases": INPUT_ALIASES,
+            "value_maps": INPUT_VALUE_MAPS,
+            "encoders": self.encoders,
+        }
+
+
+def preprocess(df: pd.DataFrame, transform: FeatureTransform) -> pd.DataFrame:
+    """식별자/라벨 + 변환된 특성 (특성 순서 = 아티팩트의 columns)"""
+    keep = [c for c in (ID_COLUMN, LABEL_COLUMN) if c in df.columns]
+    return pd.concat([df[keep].reset_index(drop=True), transform.transform(df).reset_index(drop=True)], axis=1)
+
+
+def write_training_csv(df: pd.DataFrame, path: str) -> None:
+    """XGBoost text/csv 입력: 라벨 첫 컬럼, 헤더/식별자 없음 (학습 컨테이너 경계에서만 CSV)"""
+    features = [c for c in df.columns if c not in (ID_COLUMN, LABEL_COLUMN)]
+    df[[LABEL_COLUMN] + features].to_csv(path, header=False, index=False)
+
+
 def main():
     os.makedirs("/opt/ml/processing/train_pre", exist_ok=True)
     os.makedirs("/opt/ml/processing/validation_pre", exist_ok=True)
-    train = pd.read_csv("/opt/ml/processing/train/data.csv", header=None)
-    val = pd.read_csv("/opt/ml/processing/validation/data.csv", header=None)
-    train_p = preprocess(train)
-    val_p = preprocess(val)
-    train_p.to_csv("/opt/ml/processing/train_pre/data.csv", header=False, index=False)
-    val_p.to_csv("/opt/ml/processing/validation_pre/data.csv", header=False, index=False)
+    os.makedirs("/opt/ml/processing/validation_eval", exist_ok=True)
+    os.makedirs("/opt/ml/processing/transform", exist_ok=True)
+    train = read_split("/opt/ml/processing/train")
+    val = read_split("/opt/ml/processing/validation")
+    # 추론 앱에서 수집한 실제 클릭 라벨은 학습에만 추가 (검증 분할은 이전 모델과 비교 가능하도록 유지)
+    interactions = read_interactions("/opt/ml/processing/interactions")
+    if not interactions.empty:
+        train = pd.concat([train, interactions], ignore_index=True)
+        print(f"Added {len(interactions)} labeled interactions to the training split")
+    # 변환은 학습 분할에서만 적합 (검증 분할 정보 누출 방지)
+    transform = FeatureTransform.fit(train)
+    with open(os.path.join("/opt/ml/processing/transform", TRANSFORM_FILE), "w") as f:
+        json.dump(transform.to_dict(), f)
+    print(f"Fitted feature transform: {transform.columns}")
+    train_p = preprocess(train, transform)
+    val_p = preprocess(val, transform)
+    write_training_csv(train_p, "/opt/ml/processing/train_pre/data.csv")
+    write_training_csv(val_p, "/opt/ml/processing/validation_pre/data.csv")
+    # 평가 단계용: 식별자와 컬럼 이름/타입을 유지한 Parquet
+    val_p.to_parquet("/opt/ml/processing/validation_eval/data.parquet", index=False)
 
 
 if __name__ == "__main__":
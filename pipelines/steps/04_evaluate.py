@@ -1,29 +1,313 @@
+import argparse
+import glob
 import json
 import os
+import pickle
+import shutil
+import tarfile
+import numpy as np
 import pandas as pd
-from sklearn.metrics import roc_auc_score
-from sklearn.linear_model import LogisticRegression
 
+# 단계 간 교환 포맷의 식별자/라벨 컬럼 (01_extract 와 동일)
+ID_COLUMN = "id"
+LABEL_COLUMN = "label"
+MODEL_DIR = "/opt/ml/processing/model"
+# 학습 산출물(model.tar.gz) 안의 XGBoost 모델 파일 이름
+MODEL_FILE = "xgboost-model"
+SCORE_BATCH_ROWS = 262_144
+# 이 행 수까지는 점수를 모두 보관해 정렬 기반 정확 AUC, 초과하면 히스토그램 근사
+EXACT_AUC_MAX_ROWS = 5_000_000
+# 점수 히스토그램 구간 수 ([0, 1] 균등). 근사 AUC 와 부트스트랩에 사용
+SCORE_BINS = 4096
+BOOTSTRAP_SAMPLES = 500
+BOOTSTRAP_SEED = 7
 
-def main():
-    os.makedirs("/opt/ml/processing/report", exist_ok=True)
-    val = pd.read_csv("/opt/ml/processing/validation_pre/data.csv", header=None)
-    y_val = val.iloc[:, 0]
-    X_val = val.iloc[:, 1:]
-
-    # Simple baseline model using only validation (for skeleton). In real pipeline, load model artifacts.
-    # Train a quick logistic regression to produce a metric; this keeps skeleton self-contained.
-    clf = LogisticRegression(max_iter=200)
-    clf.fit(X_val, y_val)
-    probs = clf.predict_proba(X_val)[:, 1]
-    auc = float(roc_auc_score(y_val, probs))
-
-    report = {
-        "metrics": {
-            "auc": {"value": auc, "standard": "AUC"}
+# 세그먼트별 지표: 구간 경계가 있는 컬럼은 구간화, 나머지는 정수 코드 그대로
+SLICE_COLUMNS = ["age", "hour", "device", "gender", "ad_position", "browsing_history"]
+SLICE_EDGES = {"age": [18, 25, 35, 45, 55, 65], "hour": [6, 12, 18, 22]}
+DEFAULT_SLICE_CROSSES = "device*hour,ad_position*device"
+# 세그먼트 지표 계산에 쓰는 최대 행 수 (초과 시 균등 표본)
+SLICE_MAX_ROWS = 1_000_000
+# min_slice_auc 판정에 포함할 최소 행 수
+MIN_SLICE_ROWS = 200
+CALIBRATION_BINS = 10
+
+
+def import_xgboost():
+    """평가는 학습과 같은 XGBoost 이미지에서 실행 (런타임 설치 없음)"""
+    try:
+        import xgboost
+    except ImportError as e:
+        raise RuntimeError(
+            "xgboost is not installed in this image; run the evaluate step with the XGBoost training image (TrainImage)"
+        ) from e
+    return xgboost
+
+
+def extract_model_member(archive: str, out_dir: str):
+    """model.tar.gz 에서 모델 파일 하나만 꺼냄 → 경로 (일반 파일 없으면 None)
+
+    일반 파일 멤버만 보고 저장 경로는 basename 으로 고정해, 아카이브의 절대 경로·'..'·링크
+    멤버가 out_dir 밖에 쓰지 못하게 한다.
+    """
+    with tarfile.open(archive) as tar:
+        members = [m for m in tar.getmembers() if m.isfile()]
+        if not members:
+            return None
+        member = next((m for m in members if os.path.basename(m.name) == MODEL_FILE), members[0])
+        path = os.path.join(out_dir, os.path.basename(member.name))
+        with tar.extractfile(member) as src, open(path, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+    return path
+
+
+def load_booster(model_dir: str = MODEL_DIR):
+    """학습 단계 산출물(model.tar.gz 의 xgboost-model) → Booster. 저장 형식/피클 모두 허용"""
+    xgb = import_xgboost()
+    for archive in glob.glob(os.path.join(model_dir, "*.tar.gz")):
+        extract_model_member(archive, model_dir)
+    candidates = [p for p in glob.glob(os.path.join(model_dir, "**", "*"), recursive=True)
+                  if os.path.isfile(p) and not p.endswith(".tar.gz")]
+    if not candidates:
+        raise FileNotFoundError(f"No model artifact under {model_dir}")
+    path = next((p for p in candidates if os.path.basename(p) == MODEL_FILE), candidates[0])
+    booster = xgb.Booster()
+    try:
+        booster.load_model(path)
+    except xgb.core.XGBoostError:
+        with open(path, "rb") as f:
+            booster = pickle.load(f)
+    print(f"Loaded model from {path}")
+    return booster
+
+
+def open_validation():
+    """(전체 행 수 또는 None, 특성 이름 또는 None, (라벨 배열, 특성 행렬) 배치 이터레이터)
+
+    Parquet 교환 포맷 우선, 없으면 학습용 헤더 없는 CSV. 특성 순서는 학습 CSV 와 같다
+    (라벨/식별자 제외 컬럼 순서).
+    """
+    parquet = "/opt/ml/processing/validation_eval/data.parquet"
+    if os.path.exists(parquet):
+        import pyarrow.parquet as pq
+        pf = pq.ParquetFile(parquet)
+        features = [c for c in pf.schema_arrow.names if c not in (ID_COLUMN, LABEL_COLUMN)]
+
+        def batches():
+            for batch in pf.iter_batches(batch_size=SCORE_BATCH_ROWS, columns=[LABEL_COLUMN] + features):
+                frame = batch.to_pandas()
+                yield frame[LABEL_COLUMN].to_numpy(dtype=np.int8), frame[features].to_numpy(dtype=np.float32)
+        return pf.metadata.num_rows, features, batches()
+    chunks = pd.read_csv("/opt/ml/processing/validation_pre/data.csv", header=None, chunksize=SCORE_BATCH_ROWS)
+    return None, None, ((f[0].to_numpy(dtype=np.int8), f.iloc[:, 1:].to_numpy(dtype=np.float32)) for f in chunks)
+
+
+def roc_auc(labels: np.ndarray, scores: np.ndarray) -> float:
+    """정렬 1회(O(n log n)) 순위합 AUC. 동점 점수는 평균 순위"""
+    order = np.argsort(scores, kind="mergesort")
+    sorted_scores, sorted_labels = scores[order], labels[order].astype(np.float64)
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(sorted_scores)) + 1])
+    ends = np.append(starts[1:], scores.size)
+    positives = np.add.reduceat(sorted_labels, starts)
+    n_pos = positives.sum()
+    n_neg = scores.size - n_pos
+    if n_pos == 0 or n_neg == 0:
+        return float("nan")
+    rank_sum = float(np.dot((starts + ends + 1) / 2.0, positives))
+    return (rank_sum - n_pos * (n_pos + 1) / 2.0) / (n_pos * n_neg)
+
+
+def histogram_auc(pos_counts: np.ndarray, neg_counts: np.ndarray) -> np.ndarray:
+    """점수 구간별 양/음성 수 → AUC (같은 구간은 동점 처리). 마지막 축 기준으로 벡터화"""
+    neg_below = np.cumsum(neg_counts, axis=-1) - neg_counts
+    wins = (pos_counts * (neg_below + 0.5 * neg_counts)).sum(axis=-1)
+    total = pos_counts.sum(axis=-1) * neg_counts.sum(axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(total > 0, wins / total, np.nan)
+
+
+def bootstrap_auc_interval(pos_counts: np.ndarray, neg_counts: np.ndarray,
+                           samples: int = BOOTSTRAP_SAMPLES, seed: int = BOOTSTRAP_SEED) -> tuple:
+    """포아송 부트스트랩 95% 구간: 구간별 개수를 Poisson(개수)로 재표본 (표본 x 구간 행렬 1회 연산)"""
+    rng = np.random.default_rng(seed)
+    pos = rng.poisson(pos_counts, size=(samples, pos_counts.size))
+    neg = rng.poisson(neg_counts, size=(samples, neg_counts.size))
+    aucs = histogram_auc(pos, neg)
+    aucs = aucs[~np.isnan(aucs)]
+    if aucs.size == 0:
+        return float("nan"), float("nan")
+    low, high = np.quantile(aucs, [0.025, 0.975])
+    return float(low), float(high)
+
+
+def parse_crosses(spec: str) -> list:
+    """"device*hour,gender*age" → [("device", "hour"), ("gender", "age")]"""
+    return [tuple(p.strip() for p in item.split("*")) for item in spec.split(",") if "*" in item]
+
+
+def slice_codes(X: np.ndarray, features: list, crosses: list) -> tuple:
+    """특성 행렬 → ({세그먼트 컬럼: 정수 코드 배열}, 세그먼트 패밀리 목록)"""
+    codes = {}
+    for name in SLICE_COLUMNS:
+        if name not in features:
+            continue
+        values = X[:, features.index(name)]
+        if name in SLICE_EDGES:
+            codes[name] = np.searchsorted(SLICE_EDGES[name], values, side="right").astype(np.int64)
+        else:
+            codes[name] = np.clip(np.nan_to_num(values), 0, None).astype(np.int64)
+    families = [(name,) for name in codes] + [c for c in crosses if all(n in codes for n in c)]
+    return codes, families
+
+
+def slice_label(name: str, code: int) -> str:
+    edges = SLICE_EDGES.get(name)
+    if edges is None:
+        return f"{name}={code}"
+    if code == 0:
+        return f"{name}<{edges[0]:g}"
+    if code == len(edges):
+        return f"{name}>={edges[-1]:g}"
+    return f"{name}=[{edges[code - 1]:g},{edges[code]:g})"
+
+
+def sliced_metrics(labels: np.ndarray, scores: np.ndarray, codes: dict, families: list) -> dict:
+    """모든 세그먼트의 AUC / log loss / 보정 오차(ECE) / CTR 을 정렬 1회로 계산
+
+    각 패밀리(단일 컬럼 또는 교차)의 세그먼트 코드를 하나의 정수 키로 합쳐 행을 패밀리 수만큼
+    이어 붙이고, (키, 점수) 로 한 번 lexsort 한다. 그러면 세그먼트가 연속 구간이 되고 구간 안은
+    점수 순이므로, 순위합 AUC·동점 처리·보정 구간 집계가 모두 reduceat 으로 끝난다.
+    """
+    cards = {name: int(c.max()) + 1 if c.size else 1 for name, c in codes.items()}
+    stride = max(int(np.prod([cards[n] for n in family])) for family in families)
+    n = labels.size
+    keys = np.concatenate([
+        f * stride + np.ravel_multi_index(tuple(codes[name] for name in family), tuple(cards[name] for name in family))
+        for f, family in enumerate(families)
+    ])
+    order = np.lexsort((np.tile(scores, len(families)), keys))
+    key = keys[order]
+    rows = order % n
+    s = scores[rows].astype(np.float64)
+    y = labels[rows].astype(np.float64)
+    m = key.size
+
+    new_slice = np.r_[True, key[1:] != key[:-1]]
+    starts = np.flatnonzero(new_slice)
+    counts = np.diff(np.r_[starts, m])
+    slice_id = np.cumsum(new_slice) - 1
+    # 세그먼트 안 동점 점수는 평균 순위
+    new_tie = new_slice | np.r_[True, s[1:] != s[:-1]]
+    tie_starts = np.flatnonzero(new_tie)
+    tie_ends = np.r_[tie_starts[1:], m]
+    rank = ((tie_starts + tie_ends + 1) / 2.0)[np.cumsum(new_tie) - 1] - starts[slice_id]
+
+    pos = np.add.reduceat(y, starts)
+    neg = counts - pos
+    rank_sum = np.add.reduceat(rank * y, starts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        auc = np.where((pos > 0) & (neg > 0), (rank_sum - pos * (pos + 1) / 2.0) / (pos * neg), np.nan)
+    p = np.clip(s, 1e-7, 1 - 1e-7)
+    logloss = np.add.reduceat(-(y * np.log(p) + (1 - y) * np.log1p(-p)), starts) / counts
+    mean_score = np.add.reduceat(s, starts) / counts
+    # 점수 순 정렬이므로 (세그먼트, 보정 구간) 도 연속 구간
+    cal_bin = np.minimum((s * CALIBRATION_BINS).astype(np.int64), CALIBRATION_BINS - 1)
+    cal_starts = np.flatnonzero(new_slice | np.r_[True, cal_bin[1:] != cal_bin[:-1]])
+    gap = np.abs(np.add.reduceat(y, cal_starts) - np.add.reduceat(s, cal_starts))
+    ece = np.bincount(slice_id[cal_starts], weights=gap, minlength=starts.size) / counts
+
+    out = {}
+    for i, k in enumerate(key[starts].tolist()):
+        family = families[k // stride]
+        parts = np.unravel_index(k % stride, tuple(cards[name] for name in family))
+        name = "&".join(slice_label(col, int(code)) for col, code in zip(family, parts))
+        out[name] = {
+            "rows": int(counts[i]),
+            "auc": None if np.isnan(auc[i]) else float(auc[i]),
+            "logloss": float(logloss[i]),
+            "calibration_error": float(ece[i]),
+            "ctr": float(pos[i] / counts[i]),
+            "mean_score": float(mean_score[i]),
         }
+    return out
+
+
+def evaluate(booster, crosses: list) -> dict:
+    """검증 데이터를 배치 단위로 점수화하며 전체 AUC 통계와 세그먼트 지표용 표본을 누적"""
+    xgb = import_xgboost()
+    total, features, batches = open_validation()
+    # 전체 행 수를 알면 보관 비율을 미리 정해 균등 표본 유지 (정확 AUC / 세그먼트 지표용)
+    keep_fraction = 1.0 if total is None or total <= EXACT_AUC_MAX_ROWS else EXACT_AUC_MAX_ROWS / total
+    rng = np.random.default_rng(BOOTSTRAP_SEED)
+    pos_counts = np.zeros(SCORE_BINS, dtype=np.int64)
+    neg_counts = np.zeros(SCORE_BINS, dtype=np.int64)
+    kept_labels, kept_scores, kept_X = [], [], []
+    rows = 0
+    for labels, X in batches:
+        scores = booster.predict(xgb.DMatrix(X))
+        rows += labels.size
+        bins = np.clip((scores * SCORE_BINS).astype(np.int64), 0, SCORE_BINS - 1)
+        pos_counts += np.bincount(bins, weights=labels, minlength=SCORE_BINS).astype(np.int64)
+        neg_counts += np.bincount(bins, weights=1 - labels, minlength=SCORE_BINS).astype(np.int64)
+        keep = slice(None) if keep_fraction >= 1.0 else rng.random(labels.size) < keep_fraction
+        kept_labels.append(labels[keep])
+        kept_scores.append(scores[keep])
+        kept_X.append(X[keep])
+    if rows == 0:
+        raise ValueError("Validation set is empty")
+    labels, scores = np.concatenate(kept_labels), np.concatenate(kept_scores)
+
+    if keep_fraction >= 1.0:
+        auc, method = roc_auc(labels, scores), "exact"
+    else:
+        auc, method = float(histogram_auc(pos_counts, neg_counts)), f"histogram_{SCORE_BINS}"
+    ci_lower, ci_upper = bootstrap_auc_interval(pos_counts, neg_counts)
+    print(f"AUC={auc:.4f} ({method}, 95% CI {ci_lower:.4f}-{ci_upper:.4f}) on {rows} rows")
+
+    slices = {}
+    if features:
+        X = np.concatenate(kept_X)
+        if labels.size > SLICE_MAX_ROWS:
+            idx = rng.choice(labels.size, SLICE_MAX_ROWS, replace=False)
+            labels, scores, X = labels[idx], scores[idx], X[idx]
+        codes, families = slice_codes(X, features, crosses)
+        if families:
+            slices = sliced_metrics(labels, scores, codes, families)
+            print(f"Computed metrics for {len(slices)} slices over {len(families)} slice families")
+    eligible = {k: v for k, v in slices.items() if v["auc"] is not None and v["rows"] >= MIN_SLICE_ROWS}
+    worst = min(eligible, key=lambda k: eligible[k]["auc"]) if eligible else None
+    worst_calibrated = max(eligible, key=lambda k: eligible[k]["calibration_error"]) if eligible else None
+    return {
+        "auc": {
+            "value": auc,
+            "standard": "AUC",
+            "method": method,
+            "ci_lower": ci_lower,
+            "ci_upper": ci_upper,
+        },
+        "rows": {"value": rows},
+        "positive_rate": {"value": float(pos_counts.sum() / rows)},
+        # 조건 단계에서 참조 가능한 요약값 (적격 세그먼트가 없으면 전체 AUC / 0)
+        "min_slice_auc": {"value": eligible[worst]["auc"] if worst else auc, "slice": worst},
+        "max_slice_calibration_error": {
+            "value": eligible[worst_calibrated]["calibration_error"] if worst_calibrated else 0.0,
+            "slice": worst_calibrated,
+        },
+        "slices": slices,
     }
 
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--slice-crosses", default=DEFAULT_SLICE_CROSSES,
+                    help="Comma-separated slice crosses, e.g. device*hour,gender*age")
+    args = ap.parse_args()
+
+    os.makedirs("/opt/ml/processing/report", exist_ok=True)
+    # 배포될 학습 산출물 자체를 평가 (품질 게이트가 실제 모델을 측정)
+    booster = load_booster()
+    report = {"metrics": evaluate(booster, parse_crosses(args.slice_crosses))}
+
     with open("/opt/ml/processing/report/evaluation.json", "w") as f:
         json.dump(report, f)
 
@@ -0,0 +1,274 @@
+"""Replay recorded user interactions against the inference app or an endpoint.
+
+사용자 상호작용 Feature Group(오프라인 스토어) 또는 로컬 Parquet 내보내기에서 예측 요청을
+읽어 원래 도착 간격(또는 --speed 배율)을 유지하며 재생하고, 두 대상(모델/앱 버전)의
+지연 시간·처리량을 비교한다.
+
+    python scripts/replay_interactions.py \
+        --feature-group my-mlops-user-interactions-v1 --start 2025-09-20T00:00:00 --limit 5000 \
+        --target app:http://<alb-dns> --target endpoint:my-mlops-dev-endpoint#challenger \
+        --speed 10 --output replay_report.json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+
+import boto3
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from mlops_client import (  # noqa: E402
+    EndpointClient, RetryPolicy, ServiceClient, load_transform, package_transform_uri, variant_model_package,
+)
+
+# 추론 앱이 모델에 보내는 특성 순서 (inference_app/scoring.py 와 동일)
+FEATURE_NAMES = ["user_age", "ad_position", "browsing_history", "time_of_day", "user_behavior_score"]
+# 재생 대상 요청 유형 (행동 집계 체크포인트 등은 제외)
+REPLAY_REQUEST_TYPES = ("prediction",)
+
+
+# ----- 입력 -----
+
+def offline_store_prefix(sm, feature_group_name):
+    desc = sm.describe_feature_group(FeatureGroupName=feature_group_name)
+    s3_cfg = desc["OfflineStoreConfig"]["S3StorageConfig"]
+    return s3_cfg.get("ResolvedOutputS3Uri") or s3_cfg["S3Uri"]
+
+
+def download_offline_store(s3, s3_uri, local_dir, max_workers=16):
+    """오프라인 스토어 prefix 아래 Parquet 파일을 병렬 다운로드 → 로컬 경로 목록"""
+    parsed = urlparse(s3_uri)
+    bucket, prefix = parsed.netloc, parsed.path.lstrip("/")
+    keys = []
+    for page in s3.get_paginator("list_objects_v2").paginate(Bucket=bucket, Prefix=prefix):
+        keys.extend(o["Key"] for o in page.get("Contents", []) if o["Key"].endswith(".parquet"))
+
+    def fetch(i_key):
+        i, key = i_key
+        path = os.path.join(local_dir, f"{i:06d}.parquet")
+        s3.download_file(bucket, key, path)
+        return path
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(fetch, enumerate(keys)))
+
+
+def load_interactions(paths, start=None, end=None, limit=None):
+    """Parquet 파일들 → event_time 순으로 정렬된 예측 요청 DataFrame"""
+    columns = ["interaction_id", "session_id", "request_type", "event_time", "response_time_ms"] + FEATURE_NAMES
+    frames = []
+    for path in paths:
+        frame = pd.read_parquet(path)
+        if "is_deleted" in frame.columns:
+            frame = frame[~frame["is_deleted"].astype(bool)]
+        frames.append(frame[[c for c in columns if c in frame.columns]])
+    if not frames:
+        raise SystemExit("no interaction records found")
+    df = pd.concat(frames, ignore_index=True)
+
+    df = df[df["request_type"].isin(REPLAY_REQUEST_TYPES)]
+    df["event_time"] = pd.to_datetime(df["event_time"], utc=True, errors="coerce")
+    df = df.dropna(subset=["event_time"])
+    if start:
+        df = df[df["event_time"] >= pd.Timestamp(start, tz="UTC")]
+    if end:
+        df = df[df["event_time"] < pd.Timestamp(end, tz="UTC")]
+    # 오프라인 스토어는 같은 레코드의 여러 write 를 가질 수 있으므로 중복 제거
+    df = df.drop_duplicates(subset=["interaction_id"], keep="last")
+    df = df.sort_values("event_time", kind="stable")
+    if limit:
+        df = df.head(limit)
+    for name in FEATURE_NAMES:
+        df[name] = pd.to_numeric(df[name], errors="coerce").fillna(0.0)
+    return df.reset_index(drop=True)
+
+
+def build_schedule(event_times, speed=1.0, max_gap_seconds=None):
+    """원래 도착 간격 / speed → 재생 시작 기준 상대 시각(초) 배열
+
+    max_gap_seconds 가 있으면 긴 유휴 구간(야간 등)을 그 값으로 압축한다.
+    """
+    seconds = event_times.astype("int64").to_numpy() / 1e9
+    gaps = np.diff(seconds, prepend=seconds[0] if len(seconds) else 0.0)
+    if max_gap_seconds is not None:
+        gaps = np.minimum(gaps, max_gap_seconds)
+    return np.cumsum(gaps) / speed
+
+
+# ----- 대상 -----
+
+def endpoint_transform(endpoint_name, variant, region):
+    """대상 변형을 만든 모델 패키지의 FeatureTransformUri → 특성 변환 (모델은 인코딩된 입력을 받음)"""
+    sm = boto3.client("sagemaker", region_name=region)
+    package = variant_model_package(sm, endpoint_name, variant or None)
+    uri = package and package_transform_uri(sm, package)
+    if not uri:
+        raise SystemExit(f"no FeatureTransformUri for {endpoint_name}#{variant or '<first variant>'} (model package {package})")
+    return load_transform(uri, boto3.client("s3", region_name=region))
+
+
+def make_target(spec, region, max_workers):
+    """app:<base_url> 또는 endpoint:<name>[#<variant>] → (이름, 단건 호출 함수)"""
+    kind, _, value = spec.partition(":")
+    # 재생은 실제 지연을 측정하므로 클라이언트 재시도는 하지 않음
+    no_retry = RetryPolicy(max_attempts=1)
+    if kind == "app":
+        client = ServiceClient(value, max_workers=max_workers, retry=no_retry)
+        return spec, lambda row: client.predict(row["features"], session_id=row["session_id"])
+    if kind == "endpoint":
+        name, _, variant = value.partition("#")
+        client = EndpointClient(name, region_name=region, max_workers=max_workers, retry=no_retry,
+                                transform=endpoint_transform(name, variant, region))
+        kwargs = {"TargetVariant": variant} if variant else {}
+        return spec, lambda row: client.invoke(client.encode([row["record"]]), **kwargs)
+    raise SystemExit(f"unknown target spec: {spec} (expected app:<url> or endpoint:<name>[#variant])")
+
+
+def replay(call, rows, schedule, max_in_flight):
+    """스케줄대로 요청을 보내고 (지연ms, 성공 여부, 발송 지연ms) 배열과 총 소요 시간 반환"""
+    n = len(rows)
+    latency = np.full(n, np.nan)
+    ok = np.zeros(n, dtype=bool)
+    lag = np.zeros(n)
+    slots = threading.BoundedSemaphore(max_in_flight)
+
+    def send(i):
+        start = time.perf_counter()
+        try:
+            call(rows[i])
+            ok[i] = True
+        except Exception:
+            ok[i] = False
+        finally:
+            latency[i] = (time.perf_counter() - start) * 1000
+            slots.release()
+
+    futures = []
+    with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+        t0 = time.perf_counter()
+        for i in range(n):
+            delay = schedule[i] - (time.perf_counter() - t0)
+            if delay > 0:
+                time.sleep(delay)
+            # 동시 요청 한도에 걸리면 대기 시간이 발송 지연(lag)으로 기록됨
+            slots.acquire()
+            lag[i] = max(0.0, (time.perf_counter() - t0) - schedule[i]) * 1000
+            futures.append(pool.submit(send, i))
+        wait(futures)
+        elapsed = time.perf_counter() - t0
+    return latency, ok, lag, elapsed
+
+
+# ----- 리포트 -----
+
+def summarize(latency, ok, lag, elapsed):
+    done = latency[ok]
+    pct = (lambda q: round(float(np.percentile(done, q)), 2)) if done.size else (lambda q: None)
+    return {
+        "requests": int(latency.size),
+        "errors": int((~ok).sum()),
+        "error_rate": round(float((~ok).mean()), 4) if latency.size else 0.0,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(latency.size / elapsed, 2) if elapsed > 0 else None,
+        "latency_ms": {
+            "mean": round(float(done.mean()), 2) if done.size else None,
+            "p50": pct(50),
+            "p90": pct(90),
+            "p99": pct(99),
+            "max": round(float(done.max()), 2) if done.size else None,
+        },
+        "send_lag_ms_p99": round(float(np.percentile(lag, 99)), 2) if lag.size else None,
+    }
+
+
+def compare(baseline, candidate):
+    """baseline 대비 candidate 변화율(%)"""
+    def delta(a, b):
+        return round((b - a) / a * 100, 2) if a and b is not None else None
+
+    return {
+        "throughput_rps_pct": delta(baseline["throughput_rps"], candidate["throughput_rps"]),
+        "error_rate_diff": round(candidate["error_rate"] - baseline["error_rate"], 4),
+        **{f"latency_{k}_pct": delta(baseline["latency_ms"][k], candidate["latency_ms"][k])
+           for k in ("mean", "p50", "p90", "p99")},
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    src = ap.add_mutually_exclusive_group(required=True)
+    src.add_argument("--feature-group", help="User-interaction Feature Group name (reads its offline store)")
+    src.add_argument("--parquet", help="Local Parquet file or directory exported from the offline store")
+    ap.add_argument("--target", action="append", required=True,
+                    help="app:<base_url> or endpoint:<name>[#variant]; pass twice to compare versions")
+    ap.add_argument("--start", help="Replay records with event_time >= START (ISO-8601)")
+    ap.add_argument("--end", help="Replay records with event_time < END (ISO-8601)")
+    ap.add_argument("--limit", type=int, help="Maximum number of requests to replay")
+    ap.add_argument("--speed", type=float, default=1.0, help="Time scale factor (2 = twice as fast)")
+    ap.add_argument("--max-gap", type=float, help="Compress idle gaps longer than this many seconds (after scaling)")
+    ap.add_argument("--max-in-flight", type=int, default=64)
+    ap.add_argument("--output", help="Write the JSON report to this path")
+    args = ap.parse_args()
+
+    region = os.environ.get("AWS_REGION") or boto3.Session().region_name or "ap-northeast-2"
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.feature_group:
+            sm = boto3.client("sagemaker", region_name=region)
+            s3 = boto3.client("s3", region_name=region)
+            paths = download_offline_store(s3, offline_store_prefix(sm, args.feature_group), tmp)
+        elif os.path.isdir(args.parquet):
+            paths = sorted(os.path.join(args.parquet, f) for f in os.listdir(args.parquet) if f.endswith(".parquet"))
+        else:
+            paths = [args.parquet]
+        df = load_interactions(paths, args.start, args.end, args.limit)
+
+    max_gap = args.max_gap * args.speed if args.max_gap is not None else None
+    schedule = build_schedule(df["event_time"], args.speed, max_gap)
+    # app 대상은 특성 벡터, endpoint 대상은 특성 이름 → 값 레코드를 변환해 보냄
+    rows = [
+        {"features": features, "record": dict(zip(FEATURE_NAMES, features)), "session_id": session_id}
+        for features, session_id in zip(df[FEATURE_NAMES].to_numpy().tolist(), df["session_id"].tolist())
+    ]
+    recorded = df["response_time_ms"].astype(float).to_numpy() if "response_time_ms" in df else np.array([])
+    print(f"replaying {len(rows)} requests over {schedule[-1] if len(schedule) else 0:.1f}s "
+          f"(speed x{args.speed}) against {len(args.target)} target(s)")
+
+    report = {
+        "source": args.feature_group or args.parquet,
+        "requests": len(rows),
+        "speed": args.speed,
+        "recorded_response_time_ms": {
+            "p50": round(float(np.percentile(recorded, 50)), 2) if recorded.size else None,
+            "p99": round(float(np.percentile(recorded, 99)), 2) if recorded.size else None,
+        },
+        "targets": {},
+    }
+    # 대상끼리 간섭하지 않도록 같은 스케줄을 순차 재생
+    for spec in args.target:
+        name, call = make_target(spec, region, args.max_in_flight)
+        report["targets"][name] = summarize(*replay(call, rows, schedule, args.max_in_flight))
+        print(name, json.dumps(report["targets"][name]))
+
+    if len(args.target) >= 2:
+        baseline = args.target[0]
+        report["comparison"] = {
+            spec: compare(report["targets"][baseline], report["targets"][spec])
+            for spec in args.target[1:]
+        }
+        report["comparison_baseline"] = baseline
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,7 @@ from infra.iam_role import CiCdIam
 from infra.cicd import CiCdPipeline
 from infra.sagemaker_exec import SmExecutionRole
 from infra.sagemaker_ci import ModelRegistry, SageMakerCiCd
-from infra.feature_store import FeatureGroup, UserInteractionFeatureGroup
+from infra.feature_store import FeatureGroup, UserBehaviorFeatureGroup, UserInteractionFeatureGroup
 from infra.rds import RdsConstruct
 from infra.studio import Studio
 
@@ -166,8 +166,22 @@ class BaseStack(Stack):
 
             if storage.data_bucket.policy:
                 user_interaction_fg.feature_group.node.add_dependency(storage.data_bucket.policy)
+
+            # 행동 집계 체크포인트는 상호작용 그룹과 분리 (오프라인 스토어 소비자 오염 방지)
+            user_behavior_fg = UserBehaviorFeatureGroup(
+                self,
+                "UserBehaviorFeatureGroup",
+                feature_group_name="my-mlops-user-behavior-v1",
+                s3_uri=f"s3://{storage.data_bucket.bucket_name}/feature-store/user-behavior/",
+                role=sm_exec.role,
+                kms_key_arn=kms.key.key_arn,
+            )
+
+            if storage.data_bucket.policy:
+                user_behavior_fg.feature_group.node.add_dependency(storage.data_bucket.policy)
             
         self.user_interaction_fg_name = "my-mlops-user-interactions-v1"  # 고정 이름으로 변경
+        self.user_behavior_fg_name = "my-mlops-user-behavior-v1"
 
         enable_sm_ci = bool(self.node.try_get_context("enable_sagemaker_ci") or False)
         if enable_sm_ci and cicd is not None:
@@ -203,6 +217,7 @@ class BaseStack(Stack):
                 use_sm_pipeline=bool(self.node.try_get_context("use_sm_pipeline") or False),
                 use_feature_store=bool(self.node.try_get_context("use_feature_store") or True),
                 feature_group_name=(self.node.try_get_context("feature_group_name") or f"{name_prefix}-feature-group"),
+                shadow_variant_name=(self.node.try_get_context("sm_shadow_variant_name") or ""),
             )
 
             iam.codebuild_role.add_to_policy(iam_cdk.PolicyStatement(
@@ -339,6 +339,7 @@ class DevMLOpsStack(Stack):
             resources=[
                 f"arn:aws:sagemaker:{self.region}:{self.account}:feature-group/ad-click-feature-group-dev",
                 f"arn:aws:sagemaker:{self.region}:{self.account}:feature-group/my-mlops-user-interactions-v1",
+                f"arn:aws:sagemaker:{self.region}:{self.account}:feature-group/my-mlops-user-behavior-v1",
             ],
         ))
 
@@ -373,6 +374,7 @@ class DevMLOpsStack(Stack):
         # 개발에서도 운영 Feature Store 사용
         shared_user_interaction_fg_name = "my-mlops-user-interactions-v1"  # 운영과 동일
         self.user_interaction_fg_name = shared_user_interaction_fg_name
+        self.user_behavior_fg_name = "my-mlops-user-behavior-v1"  # 운영과 동일
 
         # ========================================
         # SageMaker CI/CD (개발 전용 MLOps 파이프라인)
@@ -8,6 +8,7 @@ from aws_cdk import (
     aws_iam as iam,
     aws_logs as logs,
     Duration,
+    IgnoreMode,
 )
 
 
@@ -22,6 +23,12 @@ class ModelInferenceStack(Stack):
         sagemaker_endpoint_name: str,
         model_package_group_name: str,
         user_interaction_fg_name: str,
+        user_behavior_fg_name: str = "",
+        pipeline_bucket_name: str = "",
+        drift_baseline_uri: str = "",
+        feature_transform_uri: str = "",
+        shadow_variant_name: str = "",
+        shadow_fraction: float = 0.0,
         **kwargs
     ) -> None:
         super().__init__(scope, construct_id, **kwargs)
@@ -76,6 +83,20 @@ class ModelInferenceStack(Stack):
             )
         )
 
+        # 배포된 모델 → 모델 패키지 추적 권한 (패키지 메타데이터의 FeatureTransformUri 조회용)
+        task_role.add_to_policy(
+            iam.PolicyStatement(
+                actions=[
+                    "sagemaker:DescribeEndpointConfig",
+                    "sagemaker:DescribeModel",
+                ],
+                resources=[
+                    f"arn:aws:sagemaker:{self.region}:{self.account}:endpoint-config/*",
+                    f"arn:aws:sagemaker:{self.region}:{self.account}:model/*",
+                ],
+            )
+        )
+
         # 모델 패키지 조회 권한 (모델 정보 확인용)
         task_role.add_to_policy(
             iam.PolicyStatement(
@@ -86,16 +107,33 @@ class ModelInferenceStack(Stack):
                 resources=[
                     f"arn:aws:sagemaker:{self.region}:{self.account}:model-package-group/{model_package_group_name}",
                     f"arn:aws:sagemaker:{self.region}:{self.account}:model-package-group/{model_package_group_name}/*",
+                    f"arn:aws:sagemaker:{self.region}:{self.account}:model-package/{model_package_group_name}/*",
                 ],
             )
         )
 
+        # 모델 패키지 품질 지표(metrics.json / evaluation.json), 특성 변환(transform.json),
+        # 드리프트 기준선(profile.json) 읽기 권한 (파이프라인 버킷 한정)
+        if pipeline_bucket_name:
+            task_role.add_to_policy(
+                iam.PolicyStatement(
+                    actions=["s3:GetObject"],
+                    resources=[
+                        f"arn:aws:s3:::{pipeline_bucket_name}/*metrics.json",
+                        f"arn:aws:s3:::{pipeline_bucket_name}/*evaluation.json",
+                        f"arn:aws:s3:::{pipeline_bucket_name}/*transform.json",
+                        f"arn:aws:s3:::{pipeline_bucket_name}/*profile.json",
+                    ],
+                )
+            )
+
         # Feature Store 권한 추가
         task_role.add_to_policy(
             iam.PolicyStatement(
                 actions=[
                     "sagemaker:PutRecord",
                     "sagemaker:GetRecord",
+                    "sagemaker:BatchGetRecord",
                     "sagemaker:DescribeFeatureGroup",
                 ],
                 resources=[
@@ -103,6 +141,33 @@ class ModelInferenceStack(Stack):
                 ],
             )
         )
+        # 행동 집계 체크포인트 기록 권한 (선택, 별도 Feature Group)
+        if user_behavior_fg_name:
+            task_role.add_to_policy(
+                iam.PolicyStatement(
+                    actions=["sagemaker:PutRecord"],
+                    resources=[
+                        f"arn:aws:sagemaker:{self.region}:{self.account}:feature-group/{user_behavior_fg_name}",
+                    ],
+                )
+            )
+
+        # 드리프트 기준선 위치 수동 지정 (선택, 모델 패키지에 DriftBaselineUri 가 없을 때만 사용)
+        if drift_baseline_uri:
+            task_role.add_to_policy(
+                iam.PolicyStatement(
+                    actions=["s3:GetObject"],
+                    resources=[f"arn:aws:s3:::{drift_baseline_uri.replace('s3://', '', 1)}"],
+                )
+            )
+        # 특성 변환 위치 수동 지정 (선택, 모델 패키지에 FeatureTransformUri 가 없을 때만 사용)
+        if feature_transform_uri:
+            task_role.add_to_policy(
+                iam.PolicyStatement(
+                    actions=["s3:GetObject"],
+                    resources=[f"arn:aws:s3:::{feature_transform_uri.replace('s3://', '', 1)}"],
+                )
+            )
 
         # CloudWatch 로그 그룹
         log_group = logs.LogGroup(
@@ -118,15 +183,24 @@ class ModelInferenceStack(Stack):
             memory_limit_mib=512,
             desired_count=1,
             task_image_options=ecs_patterns.ApplicationLoadBalancedTaskImageOptions(
+                # 앱이 mlops_client(특성 변환)를 함께 쓰므로 저장소 루트를 빌드 컨텍스트로 사용
                 image=ecs.ContainerImage.from_asset(
-                    directory="./inference_app",
+                    directory=".",
+                    file="inference_app/Dockerfile",
+                    exclude=["*", "!inference_app", "!mlops_client", "**/__pycache__"],
+                    ignore_mode=IgnoreMode.DOCKER,
                 ),
                 container_port=8080,
                 environment={
                     "SAGEMAKER_ENDPOINT_NAME": sagemaker_endpoint_name,
                     "MODEL_PACKAGE_GROUP": model_package_group_name,
                     "USER_INTERACTION_FG_NAME": user_interaction_fg_name,
+                    "BEHAVIOR_FG_NAME": user_behavior_fg_name,
                     "AWS_DEFAULT_REGION": self.region,
+                    "DRIFT_BASELINE_URI": drift_baseline_uri,
+                    "FEATURE_TRANSFORM_URI": feature_transform_uri,
+                    "SHADOW_VARIANT_NAME": shadow_variant_name,
+                    "SHADOW_FRACTION": str(shadow_fraction),
                 },
                 log_driver=ecs.LogDrivers.aws_logs(
                     stream_prefix="inference-app",
@@ -137,11 +211,14 @@ class ModelInferenceStack(Stack):
             public_load_balancer=True,
             listener_port=80,
             protocol=elbv2.ApplicationProtocol.HTTP,
+            # 기동 직후(워밍업, 모델/변환 로드) 헬스체크 실패로 태스크가 교체되지 않도록 유예
+            health_check_grace_period=Duration.seconds(90),
         )
 
-        # 헬스체크 설정
+        # 헬스체크 설정 (readiness: 워밍업·기록 대기열·특성 변환 등 태스크 로컬 상태만 판정하므로
+        # 준비 전인 태스크에는 트래픽을 보내지 않고, 공유 의존성 장애로 모든 태스크가 교체되지는 않음)
         fargate_service.target_group.configure_health_check(
-            path="/health",
+            path="/readyz",
             healthy_http_codes="200",
             interval=Duration.seconds(30),
             timeout=Duration.seconds(5),
@@ -1,21 +1,23 @@
+import os
+
 import boto3
-rt = boto3.client("sagemaker-runtime", region_name="ap-northeast-2")
-endpoint = "my-mlops-dev-endpoint"
 
-# XGBoost(binary:logistic) 입력: 라벨 없이 feature만 CSV (행 단위)
-# 본 예제의 feature 순서: gender(0/1), age(int), device(0:web,1:mobile), hour(0-23)
-payload = "1,32,1,21\n0,48,0,9\n"
+from mlops_client import EndpointClient, load_transform
 
-res = rt.invoke_endpoint(
-    EndpointName=endpoint,
-    ContentType="text/csv",
-    Accept="text/csv",
-    Body=payload,
+# XGBoost(binary:logistic) 입력: 라벨 없이 feature만 CSV (행 단위)
+# 원본 특성을 Preprocess 단계가 저장한 변환 아티팩트로 인코딩한 뒤 전송
+records = [
+    {"gender": 1, "age": 32, "device": 1, "hour": 21, "ad_position": "Top", "browsing_history": "Shopping"},
+    {"gender": 0, "age": 48, "device": 0, "hour": 9, "ad_position": "Side", "browsing_history": "News"},
+]
+transform = load_transform(
+    # 모델 패키지의 CustomerMetadataProperties.FeatureTransformUri 값
+    os.environ["FEATURE_TRANSFORM_URI"],
+    boto3.client("s3"),
 )
 
-raw = res["Body"].read().decode("utf-8").strip()
-print("raw:", raw)                 # 예: "0.34\n0.42"
-scores = [float(x) for x in raw.splitlines()]
-print("scores:", scores)           # [0.34, 0.42]
-preds = [int(s >= 0.5) for s in scores]
-print("preds:", preds)             # [0, 0]
+with EndpointClient("my-mlops-dev-endpoint", region_name="ap-northeast-2", transform=transform) as client:
+    scores = client.predict(records)       # 원본 특성 인코딩 후 큰 입력은 자동 분할 + 병렬 호출
+    print("scores:", scores.tolist())      # [0.34, 0.42]
+    preds = client.predict_classes(records)
+    print("preds:", preds.tolist())        # [0, 0]
@@ -0,0 +1,28 @@
+"""테스트 공통 설정: 단독 실행 모듈 디렉터리를 import 경로에 추가하고 파이프라인 단계 스크립트를 로드"""
+import importlib.util
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, "inference_app")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+def load_step(name):
+    """pipelines/steps/<name>.py 를 모듈로 로드 (파일명이 숫자로 시작해 import 문 사용 불가)"""
+    path = os.path.join(ROOT, "pipelines", "steps", f"{name}.py")
+    spec = importlib.util.spec_from_file_location(f"step_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    """재시도 백오프 대기 생략, 대기 시간 기록"""
+    delays = []
+    monkeypatch.setattr("time.sleep", delays.append)
+    return delays
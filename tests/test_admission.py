@@ -0,0 +1,62 @@
+"""어드미션 컨트롤: AIMD 한도 조정, 우선순위 입장, 대기 예산 초과 시 거절"""
+import threading
+import time
+
+from admission import AdmissionController, is_exempt, route_priority
+
+
+def test_admits_up_to_limit_then_rejects_after_budget():
+    admission = AdmissionController(initial_limit=2)
+    assert admission.acquire(0, 0.0) and admission.acquire(0, 0.0)
+    started = time.monotonic()
+    assert not admission.acquire(0, 0.05)
+    assert time.monotonic() - started >= 0.05
+    stats = admission.stats()
+    assert (stats['in_flight'], stats['admitted'], stats['rejected'], stats['queued']) == (2, 2, 1, 0)
+    assert admission.retry_after() >= 1
+
+
+def test_aimd_grows_on_fast_success_and_backs_off_on_slow_or_failed():
+    admission = AdmissionController(initial_limit=4, max_limit=5, latency_target_ms=100, backoff=0.5)
+    for _ in range(8):
+        admission.acquire(0, 0.0)
+        admission.release(0.01)
+    assert admission.limit == 5  # max_limit 에서 멈춤
+    admission.acquire(0, 0.0)
+    admission.release(0.5)  # 목표 초과
+    assert admission.limit == 2
+    admission.acquire(0, 0.0)
+    admission.release(0.01, ok=False)  # 5xx
+    assert admission.limit == 1
+    admission.acquire(0, 0.0)
+    admission.release(0.5)
+    assert admission.limit == 1  # min_limit 아래로 내려가지 않음
+
+
+def test_waiters_enter_in_priority_order():
+    admission = AdmissionController(initial_limit=1, max_limit=1)
+    assert admission.acquire(0, 0.0)
+    order = []
+
+    def wait(priority):
+        if admission.acquire(priority, 2.0):
+            order.append(priority)
+            admission.release(0.0)
+
+    threads = []
+    for priority in (2, 1, 0):
+        threads.append(threading.Thread(target=wait, args=(priority,)))
+        threads[-1].start()
+        # 도착 순서를 고정 (낮은 우선순위가 먼저 대기)
+        while admission.stats()['queued'] < len(threads):
+            time.sleep(0.001)
+    admission.release(0.0)
+    for t in threads:
+        t.join(5)
+    assert order == [0, 1, 2]
+
+
+def test_health_and_static_paths_are_exempt():
+    assert is_exempt('/livez') and is_exempt('/readyz') and is_exempt('/static/app.1a2b.js')
+    assert not is_exempt('/api/predict')
+    assert route_priority('/api/predict')[0] < route_priority('/api/rank')[0] < route_priority('/api/models')[0]
@@ -0,0 +1,42 @@
+"""실시간 CTR 집계: 스레드별 샤드 분산과 스냅샷 병합"""
+import threading
+
+from click_metrics import ClickMetrics, summarize
+
+
+def test_threads_spread_across_shards_and_totals_merge():
+    metrics = ClickMetrics(n_shards=8)
+    used = set()
+    barrier = threading.Barrier(16)
+
+    def work():
+        barrier.wait()
+        used.add(id(metrics._shard()))
+        for _ in range(100):
+            metrics.record_impression(1, 12, 'mobile', 0.2, ts=1000.0)
+            metrics.record_outcome(1, 12, 'mobile', 0.2, clicked=True, ts=1000.0)
+
+    threads = [threading.Thread(target=work) for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # 16 스레드가 순번 배정으로 8개 샤드를 모두 사용
+    assert len(used) == 8
+    dims = metrics.snapshot()['buckets']
+    counts = [c for bucket in dims.values() for c in bucket['dims'].values()]
+    assert sum(c[0] for c in counts) == 1600 and sum(c[3] for c in counts) == 1600
+
+
+def test_same_thread_keeps_its_shard():
+    metrics = ClickMetrics(n_shards=4)
+    assert metrics._shard() is metrics._shard()
+
+
+def test_summary_reports_ctr_from_recorded_outcomes():
+    metrics = ClickMetrics()
+    for clicked in (1, 0, 0, 0):
+        metrics.record_outcome(2, 9, 'desktop', 0.25, clicked, ts=1000.0)
+    summary = summarize(metrics.snapshot())
+    assert summary['totals']['observed_click_rate'] == 0.25
+    assert summary['by_device']['desktop']['labeled'] == 4
@@ -0,0 +1,51 @@
+"""드리프트 기준선: 배포된 모델 패키지의 DriftBaselineUri 를 따라 모니터 교체"""
+import io
+import json
+
+from drift import DriftBaselineResolver
+
+
+def profile(edges):
+    return {"features": {"age": {"edges": edges, "counts": [1] * (len(edges) + 1)}}}
+
+
+class FakeSageMaker:
+    def __init__(self, packages):
+        self.packages = packages
+
+    def describe_model_package(self, ModelPackageName):
+        return {"CustomerMetadataProperties": self.packages[ModelPackageName]}
+
+
+class FakeS3:
+    def __init__(self, objects):
+        self.objects = objects
+
+    def get_object(self, Bucket, Key):
+        return {"Body": io.BytesIO(json.dumps(self.objects[f"s3://{Bucket}/{Key}"]).encode())}
+
+
+def test_baseline_follows_deployed_model_package():
+    s3 = FakeS3({
+        "s3://b/run1/baseline/profile.json": profile([30.0]),
+        "s3://b/run2/baseline/profile.json": profile([25.0, 50.0]),
+        "s3://b/manual/profile.json": profile([40.0]),
+    })
+    sm = FakeSageMaker({
+        "pkg/1": {"DriftBaselineUri": "s3://b/run1/baseline/profile.json"},
+        "pkg/2": {"DriftBaselineUri": "s3://b/run2/baseline/profile.json"},
+        "pkg/legacy": {},
+    })
+    resolver = DriftBaselineResolver(sm, s3, {"age": 0}, fallback_uri="s3://b/manual/profile.json", min_samples=1)
+    first = resolver.refresh("pkg/1")
+    first.observe([33.0])
+    assert resolver.refresh("pkg/1") is first
+    second = resolver.refresh("pkg/2")
+    assert second is not first and second._baseline["age"]["edges"] == [25.0, 50.0]
+    # 메타데이터가 없는 이전 패키지는 수동 지정 기준선
+    assert resolver.refresh("pkg/legacy") is not None and resolver.uri == "s3://b/manual/profile.json"
+
+
+def test_no_baseline_disables_monitoring():
+    resolver = DriftBaselineResolver(FakeSageMaker({"pkg/1": {}}), FakeS3({}), {"age": 0})
+    assert resolver.refresh("pkg/1") is None and resolver.current is None
@@ -0,0 +1,115 @@
+"""04_evaluate: 순위합 AUC와 정렬 1회 세그먼트 지표를 단순 계산과 비교"""
+import io
+import tarfile
+
+import numpy as np
+import pytest
+
+from conftest import load_step
+
+evaluate = load_step("04_evaluate")
+
+
+def pairwise_auc(y, s):
+    """모든 (양성, 음성) 쌍 비교 AUC (동점 0.5)"""
+    pos, neg = s[y == 1], s[y == 0]
+    if pos.size == 0 or neg.size == 0:
+        return None
+    diff = pos[:, None] - neg[None, :]
+    return float(((diff > 0) + 0.5 * (diff == 0)).mean())
+
+
+def naive_slice(y, s):
+    p = np.clip(s, 1e-7, 1 - 1e-7)
+    bins = np.minimum((s * evaluate.CALIBRATION_BINS).astype(int), evaluate.CALIBRATION_BINS - 1)
+    ece = sum(abs(y[bins == b].sum() - s[bins == b].sum()) for b in np.unique(bins)) / y.size
+    return {
+        "rows": y.size,
+        "auc": pairwise_auc(y, s),
+        "logloss": float(-(y * np.log(p) + (1 - y) * np.log1p(-p)).mean()),
+        "calibration_error": ece,
+        "ctr": float(y.mean()),
+        "mean_score": float(s.mean()),
+    }
+
+
+@pytest.fixture
+def scored():
+    rng = np.random.default_rng(3)
+    n = 3000
+    X = np.column_stack([
+        rng.integers(15, 80, n),   # age
+        rng.integers(0, 24, n),    # hour
+        rng.integers(0, 2, n),     # device
+        rng.integers(0, 4, n),     # ad_position 코드
+    ]).astype(np.float64)
+    # 동점이 많도록 점수를 0.01 단위로 반올림
+    scores = np.round(rng.random(n), 2)
+    labels = (rng.random(n) < scores).astype(np.int64)
+    return X, ["age", "hour", "device", "ad_position"], labels, scores
+
+
+def test_rank_auc_matches_pairwise_with_ties(scored):
+    _, _, labels, scores = scored
+    assert evaluate.roc_auc(labels, scores) == pytest.approx(pairwise_auc(labels, scores), abs=1e-12)
+    assert np.isnan(evaluate.roc_auc(np.zeros(5), np.arange(5.0)))
+
+
+def test_histogram_auc_and_bootstrap_interval(scored):
+    _, _, labels, scores = scored
+    bins = np.rint(scores * 100).astype(np.int64)
+    pos = np.bincount(bins[labels == 1], minlength=101)
+    neg = np.bincount(bins[labels == 0], minlength=101)
+    point = float(evaluate.histogram_auc(pos, neg))
+    assert point == pytest.approx(evaluate.roc_auc(labels, scores), abs=1e-12)
+    low, high = evaluate.bootstrap_auc_interval(pos, neg, samples=200)
+    assert low < point < high and high - low < 0.1
+
+
+def test_sliced_metrics_match_per_segment_computation(scored):
+    X, features, labels, scores = scored
+    codes, families = evaluate.slice_codes(X, features, evaluate.parse_crosses("device*hour,ad_position*device"))
+    assert families == [("age",), ("hour",), ("device",), ("ad_position",), ("device", "hour"), ("ad_position", "device")]
+    out = evaluate.sliced_metrics(labels, scores, codes, families)
+
+    for family in families:
+        keys = np.column_stack([codes[name] for name in family])
+        for combo in np.unique(keys, axis=0):
+            mask = (keys == combo).all(axis=1)
+            name = "&".join(evaluate.slice_label(col, int(c)) for col, c in zip(family, combo))
+            expected = naive_slice(labels[mask], scores[mask])
+            got = out.pop(name)
+            assert got["rows"] == expected["rows"]
+            if expected["auc"] is None:
+                assert got["auc"] is None
+            else:
+                assert got["auc"] == pytest.approx(expected["auc"], abs=1e-9)
+            for metric in ("logloss", "calibration_error", "ctr", "mean_score"):
+                assert got[metric] == pytest.approx(expected[metric], abs=1e-9), (name, metric)
+    # 모든 세그먼트가 정확히 한 번씩
+    assert out == {}
+
+
+def test_slice_labels_describe_bucket_edges():
+    assert evaluate.slice_label("age", 0) == "age<18"
+    assert evaluate.slice_label("age", 2) == "age=[25,35)"
+    assert evaluate.slice_label("hour", 4) == "hour>=22"
+    assert evaluate.slice_label("device", 1) == "device=1"
+
+
+def test_extract_model_member_writes_only_the_model_inside_out_dir(tmp_path):
+    archive = tmp_path / "model.tar.gz"
+    with tarfile.open(archive, "w:gz") as tar:
+        for name, data in (("../escape.txt", b"x"), ("nested/xgboost-model", b"model")):
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+        link = tarfile.TarInfo("link")
+        link.type, link.linkname = tarfile.SYMTYPE, "/etc/passwd"
+        tar.addfile(link)
+    out = tmp_path / "model"
+    out.mkdir()
+    path = evaluate.extract_model_member(str(archive), str(out))
+    assert path == str(out / "xgboost-model")
+    assert sorted(p.name for p in out.iterdir()) == ["xgboost-model"]
+    assert not (tmp_path / "escape.txt").exists()
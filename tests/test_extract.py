@@ -0,0 +1,114 @@
+import os
+import shutil
+
+import pandas as pd
+
+from conftest import load_step
+
+extract = load_step("01_extract")
+
+
+class LocalS3:
+    """download_file / list_objects_v2 만 흉내 내는 로컬 디렉터리 기반 S3"""
+
+    def __init__(self, root):
+        self.root = root
+
+    def download_file(self, bucket, key, local):
+        shutil.copy(os.path.join(self.root, key), local)
+
+
+def offline_file(root, key, ids, event_times, clicks):
+    path = os.path.join(root, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    n = len(ids)
+    pd.DataFrame({
+        "id": ids, "event_time": event_times, "click": clicks,
+        "gender": [1] * n, "age": [30] * n, "device": [0] * n, "hour": [12] * n,
+        "api_invocation_time": event_times, "write_time": event_times, "is_deleted": [False] * n,
+    }).to_parquet(path, index=False)
+    return key
+
+
+def test_scan_keeps_latest_record_per_id_across_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(extract, "MERGE_MIN_ROWS", 2)
+    root = str(tmp_path)
+    keys = [
+        offline_file(root, "fg/a.parquet", ["1", "2"], ["2025-01-01T00:00:00Z", "2025-01-01T00:00:00Z"], [0, 0]),
+        offline_file(root, "fg/b.parquet", ["1", "3"], ["2025-01-02T00:00:00Z", "2025-01-01T00:00:00Z"], [1, 1]),
+        offline_file(root, "fg/c.parquet", ["2"], ["2024-12-31T00:00:00Z"], [1]),
+    ]
+    merged = extract.scan_parquet_files(LocalS3(root), "bucket", keys, max_workers=2)
+    latest = merged.set_index("id")["click"].to_dict()
+    assert latest == {"1": 1, "2": 0, "3": 1}
+
+
+def test_bounded_map_limits_in_flight_work():
+    from concurrent.futures import ThreadPoolExecutor
+    import threading
+
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def work(i):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        with lock:
+            active[0] -= 1
+        return i
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = sorted(extract.bounded_map(pool, work, range(50), max_in_flight=3))
+    assert results == list(range(50))
+    assert peak[0] <= 3
+
+
+class ListingS3(LocalS3):
+    def get_paginator(self, name):
+        root = self.root
+
+        class Paginator:
+            def paginate(self, Bucket, Prefix, StartAfter=""):
+                keys = []
+                for directory, _, files in os.walk(root):
+                    for f in files:
+                        key = os.path.relpath(os.path.join(directory, f), root).replace(os.sep, "/")
+                        if key.startswith(Prefix) and key > StartAfter:
+                            keys.append(key)
+                yield {"Contents": [{"Key": k} for k in sorted(keys)]}
+
+        return Paginator()
+
+
+def test_sql_download_prunes_partitions_before_since(tmp_path):
+    root = str(tmp_path / "s3")
+    for hour in ("01", "05", "09"):
+        offline_file(root, f"fg/year=2025/month=03/day=02/hour={hour}/part.parquet", ["1"], ["2025-03-02T00:00:00Z"], [1])
+    out = tmp_path / "out"
+    n = extract.download_parquet_tree(ListingS3(root), "s3://bucket/fg", str(out), since="2025-03-02T05:30:00")
+    assert n == 2
+    assert sorted(p.parent.name for p in out.rglob("*.parquet")) == ["hour=05", "hour=09"]
+
+
+def test_point_in_time_join_uses_only_earlier_checkpoints_by_user_key():
+    labels = pd.DataFrame({
+        "interaction_id": ["c1", "c2", "c3"],
+        "session_id": ["s1", "s2", "s3"],
+        "user_key": ["u1", "u1", None],
+        "event_time": ["2025-01-01T10:00:00Z", "2025-01-01T12:00:00Z", "2025-01-01T12:00:00Z"],
+        "actual_click": [1, 0, 1],
+        "user_age": [30.0] * 3, "ad_position": [1.0] * 3, "browsing_history": [2.0] * 3,
+        "time_of_day": [10.0] * 3, "user_behavior_score": [99.0] * 3,
+    })
+    checkpoints = pd.DataFrame({
+        "user_key": ["u1", "u1", "s3"],
+        "event_time": ["2025-01-01T09:00:00Z", "2025-01-01T12:00:00Z", "2025-01-01T11:00:00Z"],
+        "user_behavior_score": [10.0, 50.0, 70.0],
+    })
+    out = extract.point_in_time_join(labels, checkpoints).set_index("id")
+    # 같은 시각의 체크포인트(클릭 자신이 반영됐을 수 있음)는 쓰지 않음
+    assert out.loc["c1", "user_behavior_score"] == 10.0
+    assert out.loc["c2", "user_behavior_score"] == 10.0
+    # user_key 가 없던 행은 세션 키로 조인
+    assert out.loc["c3", "user_behavior_score"] == 70.0
+    assert out["label"].tolist() == [1, 0, 1]
@@ -0,0 +1,62 @@
+import pytest
+
+from feature_lookup import LookupUnavailable, OnlineFeatureLookup, TTLCache
+
+
+class FakeFeatureStore:
+    """BatchGetRecord 응답 흉내: throttled 에 든 식별자는 지정 횟수만큼 UnprocessedIdentifiers 로 반환"""
+
+    def __init__(self, records, throttled=None):
+        self.records = records
+        self.throttled = dict(throttled or {})
+        self.calls = []
+
+    def batch_get_record(self, Identifiers):
+        ident = Identifiers[0]
+        ids = ident["RecordIdentifiersValueAsString"]
+        self.calls.append(list(ids))
+        unprocessed = [r for r in ids if self.throttled.get(r, 0) > 0]
+        for r in unprocessed:
+            self.throttled[r] -= 1
+        records = [
+            {"RecordIdentifierValueAsString": r,
+             "Record": [{"FeatureName": k, "ValueAsString": v} for k, v in self.records[r].items()]}
+            for r in ids if r in self.records and r not in unprocessed
+        ]
+        response = {"Records": records}
+        if unprocessed:
+            response["UnprocessedIdentifiers"] = [dict(ident, RecordIdentifiersValueAsString=unprocessed)]
+        return response
+
+
+def make_lookup(client, **kwargs):
+    return OnlineFeatureLookup(client, "fg", ["user_age"], cache=TTLCache(), **kwargs)
+
+
+def test_missing_record_is_none_and_cached():
+    client = FakeFeatureStore({"a": {"user_age": "30"}})
+    lookup = make_lookup(client)
+    assert lookup.get_many(["a", "b"]) == {"a": {"user_age": "30"}, "b": None}
+    assert lookup.get_many(["a", "b"]) == {"a": {"user_age": "30"}, "b": None}
+    assert len(client.calls) == 1
+
+
+def test_unprocessed_identifiers_are_retried(no_sleep):
+    client = FakeFeatureStore({"a": {"user_age": "30"}, "b": {"user_age": "41"}}, throttled={"b": 1})
+    lookup = make_lookup(client)
+    assert lookup.get_many(["a", "b"]) == {"a": {"user_age": "30"}, "b": {"user_age": "41"}}
+    assert client.calls == [["a", "b"], ["b"]]
+    assert len(no_sleep) == 1
+    assert lookup.unprocessed_retries == 1
+
+
+def test_unprocessed_after_retries_raises_and_is_not_cached(no_sleep):
+    client = FakeFeatureStore({"a": {"user_age": "30"}, "b": {"user_age": "41"}}, throttled={"b": 3})
+    lookup = make_lookup(client, max_attempts=3)
+    with pytest.raises(LookupUnavailable) as info:
+        lookup.get_many(["a", "b"])
+    assert info.value.unprocessed == ["b"]
+    assert info.value.result == {"a": {"user_age": "30"}}
+    assert info.value.retry_after >= 1
+    # 스로틀링이 풀리면 캐시된 "없음" 대신 실제 레코드를 조회
+    assert lookup.get("b") == {"user_age": "41"}
@@ -0,0 +1,154 @@
+"""학습(03_preprocess)과 추론 쪽(mlops_client/transform.py) 특성 변환의 일치 여부"""
+import io
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import load_step
+from feature_transform import TransformResolver
+from mlops_client.transform import FeatureTransform
+
+preprocess = load_step("03_preprocess")
+
+
+def training_frame(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "id": [f"r{i}" for i in range(n)],
+        "label": rng.integers(0, 2, n),
+        "gender": rng.integers(0, 2, n).astype(float),
+        "age": rng.integers(18, 70, n).astype(float),
+        "device": rng.integers(0, 2, n).astype(float),
+        "hour": rng.integers(0, 24, n).astype(float),
+        "ad_position": rng.choice(["Top", "Side", "Bottom"], n).astype(object),
+        "browsing_history": rng.choice(["Shopping", "News", "Entertainment", "Education", "Social Media"], n).astype(object),
+    })
+    df.loc[::17, "age"] = np.nan
+    df.loc[::23, "browsing_history"] = None
+    return df
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    train = training_frame()
+    transform = preprocess.FeatureTransform.fit(train)
+    # 아티팩트 JSON 왕복 후 추론 앱이 읽는 것과 같은 형태
+    spec = json.loads(json.dumps(transform.to_dict()))
+    return train, transform, FeatureTransform(spec)
+
+
+def test_record_and_column_paths_match_training_encoding(fitted):
+    train, transform, serving = fitted
+    expected = transform.transform(train).to_numpy()
+    records = train.drop(columns=["id", "label"]).to_dict("records")
+    by_record = np.array([serving.transform_record(r) for r in records])
+    columns = {name: train[name].tolist() for name in train.columns}
+    by_columns = serving.transform_columns(columns, len(train))
+    assert serving.columns == transform.columns
+    np.testing.assert_array_equal(by_record, expected)
+    np.testing.assert_array_equal(by_columns, expected)
+
+
+def test_app_feature_names_and_codes_map_to_training_vocabulary(fitted):
+    _, transform, serving = fitted
+    training_row = pd.DataFrame([{"gender": 1.0, "age": 33.0, "device": 1.0, "hour": 21.0,
+                                  "ad_position": "Top", "browsing_history": "News"}])
+    # 앱 요청: 특성 이름은 별칭(user_age/time_of_day), 범주는 화면 코드(헤더 1, 뉴스 2)
+    app_record = {"user_age": 33, "ad_position": 1, "browsing_history": 2.0, "time_of_day": 21,
+                  "user_behavior_score": 50.0, "gender": 1, "device": 1}
+    expected = transform.transform(training_row).to_numpy()[0]
+    np.testing.assert_array_equal(serving.transform_record(app_record), expected)
+    np.testing.assert_array_equal(
+        serving.transform_columns({k: [v] for k, v in app_record.items()}, 1)[0], expected
+    )
+    encoded = dict(zip(serving.columns, serving.transform_record(app_record)))
+    assert encoded["ad_position"] > 0 and encoded["browsing_history"] > 0
+
+
+def test_unknown_and_missing_values_use_code_zero_and_training_median(fitted):
+    train, transform, serving = fitted
+    encoded = dict(zip(serving.columns, serving.transform_record({"ad_position": 7.5})))
+    assert encoded["ad_position"] == 0.0
+    assert encoded["browsing_history"] == 0.0
+    assert encoded["age"] == float(np.nanmedian(train["age"]))
+
+
+def test_interaction_rows_are_mapped_before_joining_training(tmp_path):
+    pd.DataFrame({
+        "id": ["c1", "c2"], "label": [1, 0],
+        "user_age": [25.0, 40.0], "time_of_day": [9.0, 22.0],
+        "ad_position": [1.0, 4.0], "browsing_history": [5.0, np.nan], "user_behavior_score": [62.5, 10.0],
+    }).to_parquet(tmp_path / "data.parquet", index=False)
+    rows = preprocess.read_interactions(str(tmp_path))
+    assert list(rows.columns) == ["id", "label", "age", "hour", "ad_position", "browsing_history", "user_behavior_score"]
+    assert rows["ad_position"].tolist() == ["Top", "Bottom"]
+    assert rows["browsing_history"].iloc[0] == "Social Media" and pd.isna(rows["browsing_history"].iloc[1])
+
+
+def test_behavior_score_from_interactions_is_encoded_and_served():
+    train = training_frame(n=200)
+    interactions = pd.DataFrame({
+        "id": ["c1", "c2", "c3"], "label": [1, 0, 1],
+        "age": [25.0, 40.0, 31.0], "hour": [9.0, 22.0, 13.0],
+        "user_behavior_score": [80.0, 20.0, 60.0],
+    })
+    transform = preprocess.FeatureTransform.fit(pd.concat([train, interactions], ignore_index=True))
+    assert "user_behavior_score" in transform.columns
+    serving = FeatureTransform(json.loads(json.dumps(transform.to_dict())))
+    position = serving.columns.index("user_behavior_score")
+    # 앱은 FEATURE_NAMES 의 같은 이름으로 보냄, 점수가 없는 학습 행은 중앙값
+    assert serving.transform_record({"user_age": 30, "user_behavior_score": 72.5})[position] == 72.5
+    assert transform.transform(train)["user_behavior_score"].eq(60.0).all()
+
+
+class FakeSageMaker:
+    def __init__(self, packages):
+        self.packages = packages
+        self.calls = 0
+
+    def describe_model_package(self, ModelPackageName):
+        self.calls += 1
+        return {"CustomerMetadataProperties": self.packages[ModelPackageName]}
+
+
+class FakeS3:
+    def __init__(self, objects):
+        self.objects = objects
+        self.gets = []
+
+    def get_object(self, Bucket, Key):
+        self.gets.append(f"s3://{Bucket}/{Key}")
+        if self.gets[-1] not in self.objects:
+            raise RuntimeError("NoSuchKey")
+        return {"Body": io.BytesIO(json.dumps(self.objects[self.gets[-1]]).encode())}
+
+
+def test_resolver_follows_deployed_model_package(fitted):
+    spec = fitted[1].to_dict()
+    s3 = FakeS3({"s3://b/run1/transform.json": spec, "s3://b/run2/transform.json": spec})
+    sm = FakeSageMaker({
+        "pkg/1": {"FeatureTransformUri": "s3://b/run1/transform.json"},
+        "pkg/2": {"FeatureTransformUri": "s3://b/run2/transform.json"},
+        "pkg/legacy": {},
+    })
+    resolver = TransformResolver(sm, s3)
+    assert resolver.refresh("pkg/1") is not None and resolver.uri == "s3://b/run1/transform.json"
+    # 같은 패키지면 다시 조회하지 않음
+    resolver.refresh("pkg/1")
+    assert sm.calls == 1 and len(s3.gets) == 1
+    resolver.refresh("pkg/2")
+    assert resolver.uri == "s3://b/run2/transform.json"
+    # 메타데이터가 없는 패키지 + 대체 경로 없음 → 변환 없음 (준비 실패)
+    assert resolver.refresh("pkg/legacy") is None and resolver.current is None
+
+
+def test_resolver_uses_fallback_uri_and_retries_failed_loads(fitted):
+    spec = fitted[1].to_dict()
+    s3 = FakeS3({})
+    resolver = TransformResolver(FakeSageMaker({}), s3, fallback_uri="s3://b/manual/transform.json")
+    assert resolver.refresh(None) is None
+    s3.objects["s3://b/manual/transform.json"] = spec
+    assert resolver.refresh(None) is not None
+    assert resolver.uri == "s3://b/manual/transform.json"
@@ -0,0 +1,81 @@
+from health import DependencyMonitor
+
+
+class FakeSageMaker:
+    def __init__(self, status="InService", instances=1, fail=False):
+        self.status, self.instances, self.fail = status, instances, fail
+
+    def describe_endpoint(self, EndpointName):
+        if self.fail:
+            raise RuntimeError("endpoint not found")
+        return {
+            "EndpointStatus": self.status,
+            "EndpointConfigName": "cfg-1",
+            "ProductionVariants": [{"CurrentInstanceCount": self.instances}],
+        }
+
+    def describe_endpoint_config(self, EndpointConfigName):
+        return {"ProductionVariants": [{"VariantName": "AllTraffic", "ModelName": "model-1"}]}
+
+
+def test_not_ready_until_warm():
+    monitor = DependencyMonitor(FakeSageMaker(), "ep")
+    assert monitor.snapshot()["reasons"] == ["warming_up"]
+    monitor.refresh()
+    state = monitor.snapshot()
+    assert state["ready"] and state["degraded"] == []
+    assert monitor.model_name == "model-1"
+
+
+def test_shared_endpoint_failure_is_degraded_not_unready():
+    monitor = DependencyMonitor(FakeSageMaker(fail=True), "ep")
+    monitor.refresh()
+    state = monitor.snapshot()
+    assert state["ready"]
+    assert state["degraded"] == ["endpoint_not_found", "model_not_loaded"]
+
+
+def test_task_local_checks_gate_readiness():
+    backlog = {"n": 0}
+    loaded = {"ok": False}
+    monitor = DependencyMonitor(
+        FakeSageMaker(), "ep", backlog_fn=lambda: backlog["n"], max_backlog=10,
+        local_checks={"feature_transform_missing": lambda: loaded["ok"]},
+    )
+    monitor.refresh()
+    assert monitor.snapshot()["reasons"] == ["feature_transform_missing"]
+    loaded["ok"] = True
+    backlog["n"] = 11
+    assert monitor.snapshot()["reasons"] == ["feature_store_backlog"]
+
+
+class PackagedModelSageMaker(FakeSageMaker):
+    def describe_model(self, ModelName):
+        return {"Containers": [{"ModelPackageName": "arn:aws:sagemaker:r:a:model-package/grp/3"}]}
+
+
+def test_refresh_tracks_deployed_model_package():
+    monitor = DependencyMonitor(PackagedModelSageMaker(), "ep")
+    assert monitor.model_package_arn is None
+    monitor.refresh()
+    assert monitor.model_package_arn == "arn:aws:sagemaker:r:a:model-package/grp/3"
+
+
+class ShadowVariantSageMaker(FakeSageMaker):
+    def describe_endpoint_config(self, EndpointConfigName):
+        return {"ProductionVariants": [
+            {"VariantName": "AllTraffic", "ModelName": "model-1"},
+            {"VariantName": "challenger", "ModelName": "model-2"},
+        ]}
+
+    def describe_model(self, ModelName):
+        version = ModelName.rsplit("-", 1)[-1]
+        return {"PrimaryContainer": {"ModelPackageName": f"arn:aws:sagemaker:r:a:model-package/grp/{version}"}}
+
+
+def test_refresh_tracks_each_variant_package():
+    monitor = DependencyMonitor(ShadowVariantSageMaker(), "ep")
+    monitor.refresh()
+    assert monitor.model_package_arn.endswith("/grp/1")
+    assert monitor.variant_package_arn("challenger").endswith("/grp/2")
+    assert monitor.variant_package_arn("missing") is None
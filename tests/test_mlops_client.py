@@ -0,0 +1,94 @@
+import io
+
+import numpy as np
+import pytest
+
+from mlops_client import EndpointClient, RetryPolicy, package_transform_uri, variant_model_package
+
+
+class FakeRuntime:
+    """invoke_endpoint 흉내: 각 행의 첫 컬럼 값을 점수로 반환"""
+
+    def __init__(self):
+        self.bodies = []
+
+    def invoke_endpoint(self, EndpointName, ContentType, Accept, Body, **kwargs):
+        self.bodies.append(Body)
+        rows = np.loadtxt(io.StringIO(Body), delimiter=",", ndmin=2)
+        return {"Body": io.BytesIO("\n".join(str(v) for v in rows[:, 0]).encode())}
+
+
+class DoubleAge:
+    """transform_columns 인터페이스만 가진 변환"""
+
+    def transform_columns(self, columns, n):
+        return np.column_stack([np.asarray(columns["age"], dtype=float) * 2, np.ones(n)])
+
+
+class FakeSageMaker:
+    """엔드포인트 → 설정 → 변형별 모델 → 패키지 메타데이터"""
+
+    def describe_endpoint(self, EndpointName):
+        return {"EndpointConfigName": f"{EndpointName}-config"}
+
+    def describe_endpoint_config(self, EndpointConfigName):
+        return {"ProductionVariants": [
+            {"VariantName": "primary", "ModelName": "model-a"},
+            {"VariantName": "challenger", "ModelName": "model-b"},
+        ]}
+
+    def describe_model(self, ModelName):
+        if ModelName == "model-a":
+            return {"PrimaryContainer": {"ModelPackageName": "pkg/1"}}
+        return {"Containers": [{"ModelPackageName": "pkg/2"}]}
+
+    def describe_model_package(self, ModelPackageName):
+        return {"CustomerMetadataProperties": {"FeatureTransformUri": f"s3://b/{ModelPackageName}/transform.json"}}
+
+
+def test_retry_policy_retries_only_retryable(no_sleep):
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise TimeoutError()
+        return "ok"
+
+    assert RetryPolicy(max_attempts=4).call(flaky, lambda e: isinstance(e, TimeoutError)) == "ok"
+    assert len(calls) == 3 and len(no_sleep) == 2
+    with pytest.raises(ValueError):
+        RetryPolicy().call(lambda: (_ for _ in ()).throw(ValueError()), lambda e: False)
+
+
+def test_retry_delay_is_bounded_and_honors_retry_after():
+    policy = RetryPolicy(base_delay=0.1, max_delay=1.0)
+    assert all(0 <= policy.delay(a) <= 1.0 for a in range(10))
+    assert policy.delay(0, retry_after=0.8) >= 0.8
+    assert policy.delay(0, retry_after=30) == 1.0
+
+
+def test_predict_splits_batches_in_order():
+    runtime = FakeRuntime()
+    with EndpointClient("ep", runtime_client=runtime, batch_size=3) as client:
+        scores = client.predict(np.arange(10, dtype=float).reshape(-1, 1))
+    assert scores.tolist() == list(range(10))
+    assert len(runtime.bodies) == 4
+
+
+def test_predict_applies_transform_to_raw_records():
+    runtime = FakeRuntime()
+    with EndpointClient("ep", runtime_client=runtime, transform=DoubleAge()) as client:
+        scores = client.predict([{"age": 20, "ad_position": "Top"}, {"age": 31}])
+        with pytest.raises(ValueError):
+            client.predict(np.zeros((2, 2)))
+    assert scores.tolist() == [40.0, 62.0]
+
+
+def test_transform_uri_resolves_from_variant_model_package():
+    sm = FakeSageMaker()
+    assert variant_model_package(sm, "ep") == "pkg/1"
+    assert variant_model_package(sm, "ep", "challenger") == "pkg/2"
+    assert package_transform_uri(sm, "pkg/2") == "s3://b/pkg/2/transform.json"
+    with pytest.raises(ValueError):
+        variant_model_package(sm, "ep", "missing")
@@ -0,0 +1,107 @@
+"""모델 레지스트리 로컬 인덱스: 워터마크 증분 동기화, 전체 재조회, ETag, 로컬 조회"""
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+from registry import ModelRegistryIndex, flatten_metrics
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeSageMaker:
+    def __init__(self):
+        self.packages = []
+        self.list_calls = []
+        self.describes = 0
+
+    def add(self, version, status="Approved", minutes=0):
+        self.packages.append({
+            "ModelPackageArn": f"arn:aws:sagemaker:r:a:model-package/grp/{version}",
+            "ModelPackageVersion": version,
+            "ModelApprovalStatus": status,
+            "CreationTime": T0 + timedelta(minutes=minutes),
+        })
+
+    def get_paginator(self, name):
+        fake = self
+
+        class Paginator:
+            def paginate(self, ModelPackageGroupName, SortBy, SortOrder, CreationTimeAfter=None):
+                fake.list_calls.append(CreationTimeAfter)
+                items = [dict(p) for p in fake.packages
+                         if CreationTimeAfter is None or p["CreationTime"] > CreationTimeAfter]
+                yield {"ModelPackageSummaryList": items}
+
+        return Paginator()
+
+    def describe_model_package(self, ModelPackageName):
+        self.describes += 1
+        version = ModelPackageName.rsplit("/", 1)[-1]
+        return {"ModelMetrics": {"ModelQuality": {"Statistics": {"S3Uri": f"s3://b/eval/{version}/evaluation.json"}}}}
+
+
+class FakeS3:
+    def get_object(self, Bucket, Key):
+        version = int(Key.split("/")[1])
+        report = {"metrics": {"auc": {"value": 0.6 + version / 100}, "slices": {"device=1": {"auc": 0.5}}}}
+        return {"Body": io.BytesIO(json.dumps(report).encode())}
+
+
+def test_incremental_sync_describes_only_new_packages():
+    sm = FakeSageMaker()
+    sm.add(1, minutes=0)
+    sm.add(2, minutes=5)
+    index = ModelRegistryIndex(sm, FakeS3(), "grp", full_resync_seconds=3600)
+    assert index.sync() == 2
+    etag = index.etag
+    sm.add(3, minutes=10)
+    index.sync()
+    # 워터마크(가장 최근 생성 시각) - 1초 이후만 조회, 기존 패키지는 다시 describe 하지 않음
+    assert sm.list_calls[-1] == T0 + timedelta(minutes=5) - timedelta(seconds=1)
+    assert sm.describes == 3
+    assert index.etag != etag
+    items, total = index.query()
+    assert total == 3 and [p["version"] for p in items] == [3, 2, 1]
+    assert items[0]["metrics"]["auc"] == 0.63
+
+
+def test_full_resync_applies_status_changes_and_removals():
+    sm = FakeSageMaker()
+    sm.add(1, status="PendingManualApproval")
+    sm.add(2, minutes=1)
+    index = ModelRegistryIndex(sm, FakeS3(), "grp")
+    index.sync()
+    etag = index.etag
+    index.sync(full=False)
+    assert index.etag == etag  # 변화 없음 → 같은 ETag (304 가능)
+    sm.packages[0]["ModelApprovalStatus"] = "Approved"
+    del sm.packages[1]
+    index.sync(full=True)
+    items, total = index.query()
+    assert total == 1 and items[0]["status"] == "Approved"
+    assert index.etag != etag
+
+
+def test_query_filters_sorts_by_metric_and_paginates(tmp_path):
+    sm = FakeSageMaker()
+    for version in range(1, 6):
+        sm.add(version, status="Approved" if version % 2 else "Rejected", minutes=version)
+    index = ModelRegistryIndex(sm, FakeS3(), "grp")
+    index.sync()
+    items, total = index.query(status="Approved", sort_by="auc", descending=False)
+    assert total == 3 and [p["version"] for p in items] == [1, 3, 5]
+    items, total = index.query(metric="auc", min_value=0.625, limit=2, offset=1)
+    assert total == 3 and [p["version"] for p in items] == [4, 3]
+
+    path = str(tmp_path / "index.json")
+    index.save(path)
+    restored = ModelRegistryIndex(FakeSageMaker(), FakeS3(), "grp")
+    restored.load(path)
+    assert restored.etag == index.etag and restored.query()[1] == 5
+
+
+def test_flatten_metrics_handles_nested_and_value_reports():
+    assert flatten_metrics({"dummy:auc": 0.75, "ok": True}) == {"dummy:auc": 0.75}
+    assert flatten_metrics({"metrics": {"auc": {"value": 0.81}, "slices": {"device=1": {"auc": 0.7, "rows": 10}}}}) == {
+        "auc": 0.81, "slices.device=1.auc": 0.7, "slices.device=1.rows": 10.0,
+    }
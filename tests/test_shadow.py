@@ -0,0 +1,43 @@
+"""섀도 스코어링: 원본 특성을 챌린저 변환으로 인코딩해 챌린저 변형 호출"""
+import io
+
+import numpy as np
+
+from shadow import ShadowScorer
+
+
+class FakeRuntime:
+    def __init__(self):
+        self.calls = []
+
+    def invoke_endpoint(self, **kwargs):
+        self.calls.append(kwargs)
+        return {"Body": io.BytesIO(b"0.5\n0.25")}
+
+
+def test_challenger_receives_rows_encoded_with_its_own_transform():
+    runtime = FakeRuntime()
+    seen = []
+
+    def encode(rows, data):
+        seen.append((np.asarray(rows).tolist(), data))
+        return np.asarray(rows, dtype=float) * 10
+
+    scorer = ShadowScorer(runtime, "ep", variant_name="challenger", fraction=1.0, encode=encode)
+    assert scorer.maybe_submit([[1, 2], [3, 4]], [0.1, 0.2], {"route": "rank"}, {"attributes": {"device": 1}})
+    scorer._executor.shutdown(wait=True)
+    assert seen == [([[1, 2], [3, 4]], {"attributes": {"device": 1}})]
+    call = runtime.calls[0]
+    assert call["TargetVariant"] == "challenger"
+    assert np.loadtxt(io.StringIO(call["Body"]), delimiter=",").tolist() == [[10, 20], [30, 40]]
+    assert scorer.stats()["failed"] == 0
+
+
+def test_encode_failure_counts_as_failed_shadow_call():
+    def encode(rows, data):
+        raise RuntimeError("challenger transform not loaded")
+
+    scorer = ShadowScorer(FakeRuntime(), "ep", variant_name="challenger", fraction=1.0, encode=encode)
+    scorer.maybe_submit([[1, 2]], [0.1])
+    scorer._executor.shutdown(wait=True)
+    assert scorer.stats()["failed"] == 1
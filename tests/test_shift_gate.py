@@ -0,0 +1,71 @@
+"""02_validate: 연속 학습 스냅샷 간 분포 변화(PSI/KS, 라벨 비율) 게이트"""
+import numpy as np
+import pytest
+
+from conftest import load_step
+
+validate = load_step("02_validate")
+
+
+def histogram(values):
+    h = validate.Histogram()
+    h.update(np.asarray(values, dtype=np.float64))
+    return h.to_dict()
+
+
+def snapshot(features, label_rate=0.1):
+    return {
+        "created_at": "2026-01-01T00:00:00+00:00",
+        "label_rate": label_rate,
+        "features": {name: {"histogram": histogram(values)} for name, values in features.items()},
+    }
+
+
+def test_identical_distributions_have_zero_psi_and_ks():
+    rng = np.random.default_rng(0)
+    h = histogram(rng.integers(18, 70, 5000))
+    assert validate.population_stability_index(h, h) == pytest.approx(0.0, abs=1e-12)
+    assert validate.ks_statistic(h, h) == 0.0
+
+
+def test_shifted_distribution_raises_psi_and_ks():
+    rng = np.random.default_rng(1)
+    before = histogram(rng.integers(18, 70, 5000))
+    same = histogram(rng.integers(18, 70, 5000))
+    shifted = histogram(rng.integers(40, 90, 5000))
+    assert validate.population_stability_index(before, same) < 0.05
+    assert validate.ks_statistic(before, same) < 0.05
+    assert validate.population_stability_index(before, shifted) > 1.0
+    assert validate.ks_statistic(before, shifted) > 0.4
+
+
+def test_histogram_coarsens_on_power_of_two_grid():
+    h = validate.Histogram(max_bins=16)
+    h.update(np.arange(1000, dtype=np.float64))
+    out = h.to_dict()
+    assert len(out["keys"]) <= 16
+    assert sum(out["counts"]) == 1000
+    assert np.log2(out["bin_width"]).is_integer()
+
+
+def test_compare_snapshots_gates_on_thresholds_and_label_rate():
+    rng = np.random.default_rng(2)
+    previous = snapshot({"age": rng.integers(18, 70, 5000), "hour": rng.integers(0, 24, 5000)}, label_rate=0.10)
+    current = snapshot({"age": rng.integers(40, 90, 5000), "hour": rng.integers(0, 24, 5000)}, label_rate=0.16)
+
+    report, violations = validate.compare_snapshots(previous, current, max_psi=0.25, max_ks=0.2, max_label_rate_delta=0.05)
+    assert set(report["features"]) == {"age", "hour"}
+    assert [v.split(":")[0] for v in violations] == ["shift.age", "shift.age", "shift.label"]
+    assert report["label_rate"]["delta"] == pytest.approx(0.06)
+
+    # 임계값 0 이하는 해당 검사 생략
+    _, violations = validate.compare_snapshots(previous, current, max_psi=0, max_ks=0, max_label_rate_delta=0)
+    assert violations == []
+
+
+def test_compare_snapshots_skips_features_missing_from_previous():
+    previous = snapshot({"age": np.arange(100)})
+    current = snapshot({"age": np.arange(100), "hour": np.arange(24)})
+    report, violations = validate.compare_snapshots(previous, current, max_psi=0.25, max_ks=0.2, max_label_rate_delta=0.05)
+    assert list(report["features"]) == ["age"]
+    assert violations == []
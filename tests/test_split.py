@@ -0,0 +1,48 @@
+"""01_extract: 분할 키 해시 기반 결정적 train/validation 분할과 스트리밍 분할기"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import ROOT, load_step
+
+extract = load_step("01_extract")
+
+
+def test_hash_split_is_deterministic_and_matches_fraction():
+    keys = np.array([f"user-{i}" for i in range(50_000)], dtype=object)
+    mask = extract.hash_split_mask(keys, 0.8)
+    np.testing.assert_array_equal(mask, extract.hash_split_mask(keys.copy(), 0.8))
+    assert mask.mean() == pytest.approx(0.8, abs=0.01)
+    # 순서와 무관하게 키별로 같은 쪽
+    order = np.random.default_rng(0).permutation(keys.size)
+    np.testing.assert_array_equal(extract.hash_split_mask(keys[order], 0.8), mask[order])
+
+
+def test_hash_split_is_monotonic_in_fraction_and_type_stable():
+    keys = np.arange(20_000)
+    small, large = extract.hash_split_mask(keys, 0.5), extract.hash_split_mask(keys, 0.9)
+    # 비율을 늘리면 기존 학습 키는 학습에 남음 (검증 → 학습 이동만 발생)
+    assert not (small & ~large).any()
+    # 숫자 키와 같은 문자열 키는 같은 쪽
+    np.testing.assert_array_equal(small, extract.hash_split_mask(keys.astype(str), 0.5))
+
+
+def test_split_writer_keeps_groups_together_regardless_of_chunking(tmp_path):
+    csv = os.path.join(ROOT, "ad_click_dataset.csv")
+    splits = []
+    for chunk_rows in (1000, 3333):
+        out = tmp_path / str(chunk_rows)
+        for name in ("train", "validation"):
+            (out / name).mkdir(parents=True)
+        writer = extract.SplitWriter(str(out), train_fraction=0.8)
+        rows = extract.stream_csv_file(csv, writer, chunk_rows=chunk_rows, split_key="id")
+        writer.close()
+        train = pd.read_parquet(out / "train" / "data.parquet")
+        val = pd.read_parquet(out / "validation" / "data.parquet")
+        assert len(train) + len(val) == rows
+        # 같은 id(반복 사용자)는 한 분할에만
+        assert not set(train["id"]) & set(val["id"])
+        splits.append(sorted(train["id"]))
+    assert splits[0] == splits[1]
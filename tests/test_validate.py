@@ -0,0 +1,103 @@
+"""02_validate: 단일 패스 프로파일(KMV 고유값 추정, 중복 검사)과 선언적 규칙 평가"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import load_step
+
+validate = load_step("02_validate")
+
+
+def write_split(directory, df):
+    directory.mkdir(parents=True, exist_ok=True)
+    df.to_parquet(directory / "data.parquet", index=False)
+    return str(directory)
+
+
+def sample_frame(n, seed=0, ids=None):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "id": ids if ids is not None else [f"r{i}" for i in range(n)],
+        "label": rng.integers(0, 2, n),
+        "gender": rng.integers(0, 2, n),
+        "age": rng.integers(18, 70, n).astype(float),
+        "device": rng.integers(0, 2, n),
+        "hour": rng.integers(0, 24, n),
+    })
+
+
+def test_kmv_distinct_estimate_exact_below_sketch_size_and_close_above():
+    small = validate.ColumnProfile("x", "int64")
+    small.update(np.arange(1000) % 250)
+    assert small.distinct_estimate() == 250
+
+    large = validate.ColumnProfile("x", "int64")
+    for start in range(0, 200_000, 50_000):
+        large.update(np.arange(start, start + 50_000))
+    # 상대 오차 약 1/sqrt(KMV_SIZE) ≈ 1.6% → 5% 여유
+    assert large.distinct_estimate() == pytest.approx(200_000, rel=0.05)
+
+
+def test_duplicate_tracking_counts_repeated_ids_across_batches():
+    column = validate.ColumnProfile("id", "string", track_duplicates=True)
+    column.update(np.array(["a", "b", "c"], dtype=object))
+    column.update(np.array(["b", "c", "d", None], dtype=object))
+    stats = column.to_dict()
+    assert stats["nulls"] == 1
+    assert stats["duplicates"] == 2
+    assert stats["duplicate_rate"] == pytest.approx(2 / 6)
+    assert "value_counts" not in stats and "histogram" not in stats
+
+
+def test_duplicate_sample_is_bounded_and_estimate_stays_close(monkeypatch):
+    monkeypatch.setattr(validate, "DUPLICATE_SAMPLE_SIZE", 1024)
+    column = validate.ColumnProfile("id", "string", track_duplicates=True)
+    ids = np.array([f"u{i % 20_000}" for i in range(60_000)], dtype=object)
+    for start in range(0, ids.size, 7_000):
+        column.update(ids[start:start + 7_000])
+    assert column._dup_keys.size <= 1024 and column.duplicate_sample_rate < 1.0
+    # 고유 id 20000개가 3번씩 → 중복 40000행
+    stats = column.to_dict()
+    assert stats["duplicates"] == pytest.approx(40_000, rel=0.1)
+    assert stats["duplicate_rate"] == pytest.approx(2 / 3, rel=0.1)
+
+
+def test_default_rules_pass_on_non_unique_ids(tmp_path):
+    # 원본 CSV 처럼 id 가 행 단위로 고유하지 않아도 기본 규칙은 통과
+    ids = [f"u{i % 400}" for i in range(1000)]
+    profiles = {
+        "train": validate.profile_dataset(write_split(tmp_path / "train", sample_frame(1000, ids=ids))),
+        "validation": validate.profile_dataset(write_split(tmp_path / "validation", sample_frame(200, seed=1))),
+    }
+    assert profiles["train"]["columns"]["id"]["duplicates"] == 600
+    assert validate.evaluate_rules(profiles, validate.DEFAULT_RULES) == []
+
+    # 중복률 규칙은 --rules 로 명시했을 때만 적용
+    opt_in = [{"column": "id", "max_duplicate_rate": 0.01}]
+    assert validate.evaluate_rules(profiles, opt_in) == ["train.id: duplicate_rate 0.6000 > 0.01"]
+
+
+def test_rules_report_range_null_and_missing_column_violations(tmp_path):
+    df = sample_frame(300)
+    df.loc[0, "age"] = 150.0
+    df.loc[1:3, "hour"] = np.nan
+    profiles = {
+        "train": validate.profile_dataset(write_split(tmp_path / "train", df.drop(columns=["device"]))),
+        "validation": validate.profile_dataset(write_split(tmp_path / "validation", sample_frame(50, seed=2))),
+    }
+    violations = validate.evaluate_rules(profiles, validate.DEFAULT_RULES)
+    assert "train: missing columns ['device']" in violations
+    assert "train.age: max 150.0 > 120" in violations
+    assert any(v.startswith("train.hour: null_rate") for v in violations)
+    assert not any(v.startswith("validation") for v in violations)
+
+
+def test_sampled_profile_only_flags_when_whole_interval_exceeds_threshold():
+    # 표본 n=100 에서 관측 2% 는 95% 구간 하한이 0.01 이하라 위반 아님, 전수 조사면 위반
+    profile = {"schema": {}, "sample_fraction": 0.1, "rows_profiled": 100,
+               "columns": {"age": {"null_rate": 0.02}}}
+    rule = [{"column": "age", "max_null_rate": 0.01}]
+    assert validate.evaluate_rules({"train": profile}, rule) == []
+    assert validate.evaluate_rules({"train": dict(profile, sample_fraction=1.0)}, rule) == [
+        "train.age: null_rate 0.0200 > 0.01"
+    ]